@@ -10,6 +10,9 @@ Version: 0.1.0 (Prototype)
 Date: 2024-07-05
 """
 
+import logging
+import os
+
 __version__ = "0.1.0"
 __author__ = "Ben Hsu & Claude"
 __description__ = "Cogvrs - Cognitive Universe Simulation Platform"
@@ -29,6 +32,11 @@ PROJECT_INFO = {
     "domain": "cogvrs.com",
 }
 
+# 包日志级别：默认INFO，设置环境变量 CFG_DEBUG=1 时输出模拟细节调试日志
+logging.getLogger(__name__).setLevel(
+    logging.DEBUG if os.environ.get('CFG_DEBUG') == '1' else logging.INFO
+)
+
 # 导入核心模块
 from .core import *
 from .agents import *
@@ -210,11 +210,11 @@ class BehaviorSystem:
             agent_pos = Vector2D(agent_state['position'][0], agent_state['position'][1])
             closest_resource = min(
                 nearby_resources,
-                key=lambda r: agent_pos.distance_to(r.position)
+                key=lambda r: agent_pos.distance_squared_to(r.position)
             )
             
-            # 如果很近，就吃掉它
-            if agent_pos.distance_to(closest_resource.position) < 1.5:
+            # 如果很近（距离 < 1.5），就吃掉它
+            if agent_pos.distance_squared_to(closest_resource.position) < 2.25:
                 return Action(ActionType.EAT, target=closest_resource.position)
             else:
                 # 否则移动向它
@@ -258,7 +258,7 @@ class BehaviorSystem:
         agent_pos = Vector2D(agent_state['position'][0], agent_state['position'][1])
         closest_agent = min(
             nearby_agents,
-            key=lambda a: agent_pos.distance_to(Vector2D(a.position.x, a.position.y))
+            key=lambda a: agent_pos.distance_squared_to(a.position)
         )
         
         if social_preference > 0.6:
@@ -307,6 +307,37 @@ class NeuralBrain:
         self.total_predictions = metrics.get('total_predictions', 0)
         self.successful_actions = int(metrics.get('success_rate', 0) * self.total_predictions)
     
+    def copy_weights_from(self, other: 'NeuralBrain'):
+        """就地复制另一个大脑的权重并清空学习状态（用于对象池复用）"""
+        same_shape = len(self.layers) == len(other.layers) and all(
+            own.weights.shape == src.weights.shape
+            for own, src in zip(self.layers, other.layers)
+        )
+        
+        if same_shape:
+            for own_layer, src_layer in zip(self.layers, other.layers):
+                np.copyto(own_layer.weights, src_layer.weights)
+                np.copyto(own_layer.biases, src_layer.biases)
+                own_layer.activation = src_layer.activation
+        else:
+            self.layers = [
+                NeuralLayer(layer.weights.copy(), layer.biases.copy(), layer.activation)
+                for layer in other.layers
+            ]
+        
+        self.config = other.config.copy()
+        self.input_size = other.input_size
+        self.hidden_sizes = other.hidden_sizes
+        self.output_size = other.output_size
+        self.activation = other.activation
+        self.learning_rate = other.learning_rate
+        
+        self.last_inputs = None
+        self.last_outputs = None
+        self.learning_history = []
+        self.total_predictions = 0
+        self.successful_actions = 0
+    
     def clone(self) -> 'NeuralBrain':
         """克隆大脑"""
         clone = NeuralBrain(self.config.copy())
@@ -5,6 +5,7 @@ Cogvrs - Simple Agent
 Author: Ben Hsu & Claude
 """
 
+import math
 import numpy as np
 from typing import Dict, List, Optional, Any, Tuple
 import logging
@@ -21,6 +22,12 @@ from ..utils.event_logger import (
 
 logger = logging.getLogger(__name__)
 
+# 由部落、环境等系统在运行时动态附加的属性，对象复用时需清除
+_TRANSIENT_ATTRS = (
+    'tribe_id', 'tribe_name', 'tribe_color', 'is_tribe_leader',
+    'last_reproduction_time'
+)
+
 
 class SimpleAgent(PhysicsObject):
     """
@@ -48,6 +55,20 @@ class SimpleAgent(PhysicsObject):
             energy=config.get('initial_energy', 100.0)
         )
         
+        # 核心系统
+        self.brain = NeuralBrain(config.get('neural_network', {}))
+        self.memory = MemorySystem(config.get('memory', {}))
+        self.behavior_system = BehaviorSystem(config.get('behavior', {}))
+        
+        self._init_life_state(config)
+        
+        logger.debug(f"Agent {self.agent_id} created at {self.position}")
+        
+        # 记录智能体出生事件
+        self._log_birth_event()
+    
+    def _init_life_state(self, config: Dict):
+        """初始化（或重置）生命周期相关状态"""
         # 智能体属性
         self.agent_id = str(uuid.uuid4())[:8]
         self.age = 0
@@ -61,11 +82,6 @@ class SimpleAgent(PhysicsObject):
         self.generation = config.get('generation', 0)
         self.parent_ids = config.get('parent_ids', [])
         
-        # 核心系统
-        self.brain = NeuralBrain(config.get('neural_network', {}))
-        self.memory = MemorySystem(config.get('memory', {}))
-        self.behavior_system = BehaviorSystem(config.get('behavior', {}))
-        
         # 感知系统 - 基于科技水平的动态范围
         base_perception = config.get('perception_radius', 8.0)  # 降低基础感知范围
         base_communication = config.get('communication_radius', 3.0)  # 大幅降低基础通信范围
@@ -97,9 +113,12 @@ class SimpleAgent(PhysicsObject):
         self.learning_rate = config.get('learning_rate', 0.01)
         self.last_reward = 0.0
         
-        logger.debug(f"Agent {self.agent_id} created at {self.position}")
-        
-        # 记录智能体出生事件
+        # 环境对移动速度和感知范围的倍率（由模拟循环每步写入）
+        self.env_move_mul = 1.0
+        self.env_perc_mul = 1.0
+    
+    def _log_birth_event(self):
+        """记录智能体出生事件"""
         log_agent_event(
             event_type=EventType.AGENT_BIRTH,
             agent_id=self.agent_id,
@@ -222,18 +241,22 @@ class SimpleAgent(PhysicsObject):
             perception['terrain_perception_range'] = 1.0
             perception['effective_perception_radius'] = self.perception_radius
         
+        # 比较使用距离平方，只对最终结果开方
+        position = self.position
+        perception_r2 = perception['effective_perception_radius'] ** 2
+        
         # 感知最近的资源（基于有效感知范围）
         if nearby_resources:
             # 过滤在有效感知范围内的资源
             visible_resources = [r for r in nearby_resources 
-                               if self.position.distance_to(r.position) <= perception['effective_perception_radius']]
+                               if position.distance_squared_to(r.position) <= perception_r2]
             
             if visible_resources:
                 closest_resource = min(
                     visible_resources,
-                    key=lambda r: self.position.distance_to(r.position)
+                    key=lambda r: position.distance_squared_to(r.position)
                 )
-                perception['closest_resource_distance'] = self.position.distance_to(closest_resource.position)
+                perception['closest_resource_distance'] = math.sqrt(position.distance_squared_to(closest_resource.position))
                 perception['closest_resource_type'] = closest_resource.type
                 perception['closest_resource_amount'] = closest_resource.amount
             else:
@@ -249,16 +272,14 @@ class SimpleAgent(PhysicsObject):
         if nearby_agents:
             # 过滤在有效感知范围内的智能体
             visible_agents = [a for a in nearby_agents 
-                            if self.position.distance_to(Vector2D(a.position.x, a.position.y)) <= perception['effective_perception_radius']]
+                            if position.distance_squared_to(a.position) <= perception_r2]
             
             if visible_agents:
                 closest_agent = min(
                     visible_agents,
-                    key=lambda a: self.position.distance_to(Vector2D(a.position.x, a.position.y))
-                )
-                perception['closest_agent_distance'] = self.position.distance_to(
-                    Vector2D(closest_agent.position.x, closest_agent.position.y)
+                    key=lambda a: position.distance_squared_to(a.position)
                 )
+                perception['closest_agent_distance'] = math.sqrt(position.distance_squared_to(closest_agent.position))
                 perception['closest_agent_energy'] = closest_agent.energy / closest_agent.max_energy
             else:
                 perception['closest_agent_distance'] = float('inf')
@@ -404,7 +425,7 @@ class SimpleAgent(PhysicsObject):
         # 找到目标资源
         target_resource = None
         for resource in nearby_resources:
-            if self.position.distance_to(resource.position) < 1.5:
+            if self.position.distance_squared_to(resource.position) < 2.25:  # 距离 < 1.5
                 target_resource = resource
                 break
         
@@ -916,10 +937,9 @@ class SimpleAgent(PhysicsObject):
             'last_reward': self.last_reward
         }
     
-    def clone(self, mutation_rate: float = 0.1) -> 'SimpleAgent':
-        """克隆智能体（用于繁殖）"""
-        # 创建新配置
-        child_config = {
+    def _child_config(self) -> Dict:
+        """构建子代配置"""
+        return {
             'world_size': [100, 100],  # 默认世界大小
             'generation': self.generation + 1,
             'parent_ids': [self.agent_id],
@@ -928,27 +948,74 @@ class SimpleAgent(PhysicsObject):
             'memory': self.memory.config.copy(),
             'behavior': self.behavior_system.config.copy()
         }
-        
-        # 创建子代智能体，确保位置在世界边界内
-        world_width, world_height = child_config['world_size']
+    
+    def _child_position(self, world_size: List[int]) -> Vector2D:
+        """在父代附近生成子代位置，确保位置在世界边界内"""
+        world_width, world_height = world_size
         child_x = np.clip(self.position.x + np.random.uniform(-2, 2), 0, world_width - 1)
         child_y = np.clip(self.position.y + np.random.uniform(-2, 2), 0, world_height - 1)
+        return Vector2D(child_x, child_y)
+    
+    def _inherit_behavior_preferences(self, parent: 'SimpleAgent', mutation_rate: float):
+        """继承部分行为偏好（有变异）"""
+        for key, value in parent.behavior_system.behavior_preferences.items():
+            mutation = np.random.normal(0, 0.1) if np.random.random() < mutation_rate else 0
+            self.behavior_system.behavior_preferences[key] = np.clip(
+                value + mutation, 0.0, 1.0
+            )
+    
+    def clone(self, mutation_rate: float = 0.1) -> 'SimpleAgent':
+        """克隆智能体（用于繁殖）"""
+        # 创建新配置
+        child_config = self._child_config()
         
-        child = SimpleAgent(child_config, Vector2D(child_x, child_y))
+        # 创建子代智能体
+        child = SimpleAgent(child_config, self._child_position(child_config['world_size']))
         
         # 继承大脑（有变异）
         child.brain = self.brain.clone()
         child.brain.mutate(mutation_rate)
         
         # 继承部分行为偏好（有变异）
-        for key, value in self.behavior_system.behavior_preferences.items():
-            mutation = np.random.normal(0, 0.1) if np.random.random() < mutation_rate else 0
-            child.behavior_system.behavior_preferences[key] = np.clip(
-                value + mutation, 0.0, 1.0
-            )
+        child._inherit_behavior_preferences(self, mutation_rate)
         
         return child
     
+    def reset(self, parent: 'SimpleAgent', mutation_rate: float = 0.1) -> 'SimpleAgent':
+        """
+        将已死亡的智能体就地重置为parent的子代（对象池复用）
+        
+        语义与clone一致，但复用现有对象和神经网络权重数组，避免重新分配。
+        """
+        child_config = parent._child_config()
+        
+        # 物理属性
+        self.position = parent._child_position(child_config['world_size'])
+        self.velocity = Vector2D(0, 0)
+        self.mass = child_config.get('mass', 1.0)
+        self.radius = child_config.get('radius', 1.0)
+        self.energy = child_config.get('initial_energy', 100.0)
+        
+        # 清除上一生由其他系统动态附加的属性
+        for attr in _TRANSIENT_ATTRS:
+            self.__dict__.pop(attr, None)
+        
+        # 继承大脑（就地复制权重后变异）
+        self.brain.copy_weights_from(parent.brain)
+        self.brain.mutate(mutation_rate)
+        
+        # 记忆和行为从头开始
+        self.memory = MemorySystem(child_config['memory'])
+        self.behavior_system = BehaviorSystem(child_config['behavior'])
+        self._inherit_behavior_preferences(parent, mutation_rate)
+        
+        self._init_life_state(child_config)
+        
+        logger.debug(f"Agent {self.agent_id} recycled at {self.position}")
+        
+        self._log_birth_event()
+        return self
+    
     def save_state(self) -> Dict:
         """保存智能体完整状态"""
         return {
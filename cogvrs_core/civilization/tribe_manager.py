@@ -7,6 +7,7 @@ Author: Ben Hsu & Claude
 
 import numpy as np
 import time
+from operator import attrgetter
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
@@ -17,6 +18,8 @@ from ..utils.event_logger import (
 )
 from .warfare_system import WarfareSystem
 
+_GET_ENERGY = attrgetter('energy')
+
 
 class CivilizationLevel(Enum):
     """文明等级"""
@@ -235,7 +238,7 @@ class TribeManager:
         territory_radius = max(20, max_distance * 1.5)
         
         # 选择首领（能量最高的个体）
-        leader = max(members, key=lambda x: x.energy)
+        leader = max(members, key=_GET_ENERGY)
         
         # 分配部落颜色
         tribe_color = self.tribe_colors[self.color_index % len(self.tribe_colors)]
@@ -356,7 +359,7 @@ class TribeManager:
                     member.is_tribe_leader = False
                 
                 # 选出新首领并标记
-                new_leader = max(alive_members, key=lambda x: x.energy)
+                new_leader = max(alive_members, key=_GET_ENERGY)
                 old_leader_id = tribe.leader.agent_id if tribe.leader else "未知"
                 tribe.leader = new_leader
                 tribe.leader.is_tribe_leader = True
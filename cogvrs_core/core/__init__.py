@@ -7,6 +7,7 @@ Author: Ben Hsu & Claude
 
 from .physics_engine import PhysicsEngine, PhysicsObject, Vector2D
 from .world import World2D, Resource, EnvironmentalCondition, TerrainType
+from .spatial_index import SpatialHash
 from .time_manager import TimeManager, ScheduledEvent, format_simulation_time, calculate_eta
 
 __all__ = [
@@ -17,6 +18,7 @@ __all__ = [
     'Resource',
     'EnvironmentalCondition',
     'TerrainType',
+    'SpatialHash',
     'TimeManager',
     'ScheduledEvent',
     'format_simulation_time',
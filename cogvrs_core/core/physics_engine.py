@@ -5,6 +5,7 @@ Cogvrs - Physics Engine
 Author: Ben Hsu & Claude
 """
 
+import math
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
@@ -30,7 +31,7 @@ class Vector2D:
     
     def magnitude(self) -> float:
         """向量长度"""
-        return np.sqrt(self.x**2 + self.y**2)
+        return math.hypot(self.x, self.y)
     
     def normalize(self) -> 'Vector2D':
         """单位向量"""
@@ -40,8 +41,14 @@ class Vector2D:
         return Vector2D(self.x / mag, self.y / mag)
     
     def distance_to(self, other: 'Vector2D') -> float:
-        """到另一个向量的距离"""
-        return (self - other).magnitude()
+        """到另一个向量的距离（不分配差向量）"""
+        return math.hypot(self.x - other.x, self.y - other.y)
+    
+    def distance_squared_to(self, other: 'Vector2D') -> float:
+        """到另一个向量的距离平方（仅用于比较时可省去开方）"""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
 
 
 @dataclass
@@ -0,0 +1,63 @@
+"""
+Cogvrs - Spatial Index
+空间索引：均匀网格空间哈希，用于快速的半径邻域查询
+
+Author: Ben Hsu & Claude
+"""
+
+from typing import Dict, List, Tuple, Any
+
+
+class SpatialHash:
+    """
+    均匀网格空间哈希
+
+    Features:
+    - 对象按 (x // cell_size, y // cell_size) 分桶
+    - 半径查询只访问覆盖查询圆的单元格
+    - 距离比较使用平方距离，避免开方
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Tuple[int, int], List[Tuple[float, float, Any]]] = {}
+
+    def clear(self):
+        """清空索引"""
+        self.cells.clear()
+
+    def insert(self, obj: Any, x: float, y: float):
+        """插入对象（使用插入时的坐标进行索引）"""
+        cell_size = self.cell_size
+        key = (int(x // cell_size), int(y // cell_size))
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [(x, y, obj)]
+        else:
+            bucket.append((x, y, obj))
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """返回与 (x, y) 距离不超过 radius 的所有对象"""
+        cell_size = self.cell_size
+        cells = self.cells
+        r2 = radius * radius
+        min_cx = int((x - radius) // cell_size)
+        max_cx = int((x + radius) // cell_size)
+        min_cy = int((y - radius) // cell_size)
+        max_cy = int((y + radius) // cell_size)
+
+        result = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for ox, oy, obj in bucket:
+                    dx = ox - x
+                    dy = oy - y
+                    if dx * dx + dy * dy <= r2:
+                        result.append(obj)
+        return result
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self.cells.values())
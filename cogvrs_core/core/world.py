@@ -293,11 +293,11 @@ class World2D:
     def get_resources_in_radius(self, center: Vector2D, radius: float) -> List[Resource]:
         """获取指定半径内的资源"""
         nearby_resources = []
+        radius_sq = radius * radius
         
         for resource in self.resources:
             if resource.amount > 0:  # 只考虑有剩余的资源
-                distance = center.distance_to(resource.position)
-                if distance <= radius:
+                if center.distance_squared_to(resource.position) <= radius_sq:
                     nearby_resources.append(resource)
         
         return nearby_resources
@@ -344,6 +344,22 @@ class ClimateSystem:
         
         return combined_effect
     
+    def get_zone_mask(self, position: Vector2D) -> int:
+        """
+        返回包含该位置的气候区域位掩码（第i位对应 climate_zones[i]）
+        
+        同一纪元内位置的气候效应只取决于它落在哪些区域中，位掩码相同的位置效应相同。
+        """
+        x = position.x
+        y = position.y
+        mask = 0
+        for index, zone in enumerate(self.climate_zones):
+            bounds = zone['bounds']
+            if (bounds[0] <= x <= bounds[0] + bounds[2] and
+                bounds[1] <= y <= bounds[1] + bounds[3]):
+                mask |= 1 << index
+        return mask
+    
     def _get_zone_modifier(self, position: Vector2D) -> ClimateEffect:
         """根据气候区域获取修正值"""
         for zone in self.climate_zones:
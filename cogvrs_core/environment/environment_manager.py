@@ -231,7 +231,7 @@ class EnvironmentManager:
     def get_zone_at_position(self, position: Vector2D) -> Optional[EnvironmentZone]:
         """获取指定位置的环境区域"""
         for zone in self.zones:
-            if position.distance_to(zone.center) <= zone.radius:
+            if position.distance_squared_to(zone.center) <= zone.radius * zone.radius:
                 return zone
         return None
     
@@ -0,0 +1,45 @@
+"""
+Cogvrs - Environment Kernels
+环境效应计算内核：批量对智能体能量/健康应用气候修正
+
+循环内核经 njit_or_none 编译；没有numba时使用NumPy向量化实现。
+
+Author: Ben Hsu & Claude
+"""
+
+import numpy as np
+
+from ._numba_compat import njit_or_none
+
+
+def _apply_env_effects_loop(energy, health, energy_mod, health_mod, dt):
+    """逐元素应用环境修正（供numba编译）"""
+    for i in range(energy.shape[0]):
+        em = energy_mod[i]
+        if em != 1.0:
+            # 每秒±3能量，确保能量不会完全为0
+            e = energy[i] + (em - 1.0) * 3.0 * dt
+            energy[i] = min(150.0, max(0.1, e))
+
+        hm = health_mod[i]
+        if hm != 1.0:
+            # 每秒±2健康，确保健康不会完全为0
+            h = health[i] + (hm - 1.0) * 2.0 * dt
+            health[i] = min(100.0, max(0.1, h))
+
+
+def _apply_env_effects_numpy(energy, health, energy_mod, health_mod, dt):
+    """NumPy向量化回退实现，语义与循环内核一致"""
+    energy_mask = energy_mod != 1.0
+    energy[energy_mask] = np.clip(
+        energy[energy_mask] + (energy_mod[energy_mask] - 1.0) * 3.0 * dt, 0.1, 150.0
+    )
+
+    health_mask = health_mod != 1.0
+    health[health_mask] = np.clip(
+        health[health_mask] + (health_mod[health_mask] - 1.0) * 2.0 * dt, 0.1, 100.0
+    )
+
+
+apply_env_effects = (njit_or_none(_apply_env_effects_loop, fastmath=True)
+                     or _apply_env_effects_numpy)
@@ -0,0 +1,154 @@
+"""
+Cogvrs - Event Buffer
+事件缓冲区：高频智能体事件（出生/死亡）写入预分配的NumPy结构化数组，
+仅在生成报告时才展开为事件字典
+
+Author: Ben Hsu & Claude
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# 事件类型编码
+EVENT_REPRODUCTION = 0
+EVENT_AGENT_DEATH = 1
+_EVENT_TYPE_NAMES = ('reproduction', 'agent_death')
+
+# 死亡原因编码
+DEATH_CAUSES = ('Unknown', 'Health depletion', 'Energy depletion', 'Old age')
+
+EVENT_DTYPE = np.dtype([
+    ('ts', 'f8'),
+    ('step', 'i4'),
+    ('type', 'u1'),
+    ('agent_id', 'U8'),     # 出生：子代ID；死亡：死亡智能体ID
+    ('other_id', 'U8'),     # 出生：父代ID
+    ('tribe_id', 'U16'),    # 死亡：所属部落ID
+    ('px', 'f4'),
+    ('py', 'f4'),
+    ('energy', 'f4'),
+    ('health', 'f4'),
+    ('age', 'f4'),
+    ('generation', 'i4'),   # 出生：子代代数
+    ('offspring', 'i4'),    # 出生：父代后代数；死亡：后代数
+    ('cause', 'u1'),        # 死亡：DEATH_CAUSES 索引
+])
+
+
+class EventBuffer:
+    """
+    追加写入的结构化事件缓冲区
+
+    Features:
+    - 记录事件只写一行定长记录，不分配字典
+    - 容量按需倍增，达到上限后丢弃最旧的四分之一
+    - 报告生成时按需展开为与 _record_event 相同格式的字典
+    """
+
+    def __init__(self, capacity: int = 4096, max_events: Optional[int] = None):
+        self.max_events = max_events
+        if max_events:
+            capacity = min(capacity, max_events)
+        self._data = np.empty(max(1, capacity), dtype=EVENT_DTYPE)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _reserve_slot(self) -> int:
+        """返回下一条记录的写入位置，必要时扩容或丢弃旧记录"""
+        if self._count == len(self._data):
+            if self.max_events and self._count >= self.max_events:
+                keep = self._count * 3 // 4
+                self._data[:keep] = self._data[self._count - keep:self._count]
+                self._count = keep
+            else:
+                new_capacity = len(self._data) * 2
+                if self.max_events:
+                    new_capacity = min(new_capacity, self.max_events)
+                data = np.empty(new_capacity, dtype=EVENT_DTYPE)
+                data[:self._count] = self._data[:self._count]
+                self._data = data
+
+        index = self._count
+        self._count += 1
+        return index
+
+    def add_reproduction(self, ts: float, step: int, child_id: str, parent_id: str,
+                         px: float, py: float, energy: float, health: float,
+                         generation: int, parent_offspring: int):
+        """记录出生事件"""
+        index = self._reserve_slot()
+        self._data[index] = (
+            ts, step, EVENT_REPRODUCTION, child_id, parent_id, '',
+            px, py, energy, health, 0.0, generation, parent_offspring, 0
+        )
+
+    def add_death(self, ts: float, step: int, agent_id: str, px: float, py: float,
+                  energy: float, health: float, age: float, offspring: int,
+                  cause: int, tribe_id: Optional[str] = None):
+        """记录死亡事件"""
+        index = self._reserve_slot()
+        self._data[index] = (
+            ts, step, EVENT_AGENT_DEATH, agent_id, '', tribe_id or '',
+            px, py, energy, health, age, 0, offspring, cause
+        )
+
+    def copy(self) -> 'EventBuffer':
+        """复制有效记录（供其他线程只读使用）"""
+        clone = EventBuffer(capacity=max(1, self._count), max_events=self.max_events)
+        clone._data[:self._count] = self._data[:self._count]
+        clone._count = self._count
+        return clone
+
+    def records(self, event_type: Optional[int] = None) -> np.ndarray:
+        """返回有效记录（可按类型过滤）"""
+        data = self._data[:self._count]
+        if event_type is None:
+            return data
+        return data[data['type'] == event_type]
+
+    def count(self, event_type: Optional[int] = None) -> int:
+        """统计事件数量"""
+        if event_type is None:
+            return self._count
+        return int(np.count_nonzero(self._data['type'][:self._count] == event_type))
+
+    def to_dicts(self, event_type: Optional[int] = None) -> List[Dict]:
+        """展开为事件字典列表"""
+        events = []
+        for (ts, step, etype, agent_id, other_id, tribe_id, px, py,
+             energy, health, age, generation, offspring, cause) in self.records(event_type).tolist():
+            if etype == EVENT_REPRODUCTION:
+                description = f'新智能体出生: {agent_id}'
+                details = {
+                    'parent_id': other_id,
+                    'child_id': agent_id,
+                    'child_position': (px, py),
+                    'child_energy': energy,
+                    'child_health': health,
+                    'parent_offspring_count': offspring,
+                    'generation': generation
+                }
+            else:
+                description = f'智能体死亡: {agent_id}'
+                details = {
+                    'agent_id': agent_id,
+                    'age': age,
+                    'cause': DEATH_CAUSES[cause],
+                    'final_health': health,
+                    'final_energy': energy,
+                    'position': (px, py),
+                    'offspring_count': offspring,
+                    'tribe_id': tribe_id or None
+                }
+
+            events.append({
+                'timestamp': ts,
+                'step': step,
+                'type': _EVENT_TYPE_NAMES[etype],
+                'description': description,
+                'details': details
+            })
+        return events
@@ -0,0 +1,89 @@
+"""
+Cogvrs - Neighbor Kernels
+邻域查询内核：在SoA位置数组上按网格收集半径内的邻居索引
+
+网格遍历内核需要numba；没有numba时查询退化为对全部位置的向量化距离筛选。
+
+Author: Ben Hsu & Claude
+"""
+
+import numpy as np
+
+from ._numba_compat import NUMBA_AVAILABLE, njit_or_none
+
+
+def _gather_neighbors_loop(pos, order, offsets, grid_w, grid_h, cell_size, x, y, radius):
+    """遍历覆盖查询圆的网格单元，返回距离不超过radius的点索引（供numba编译）"""
+    r2 = radius * radius
+    min_cx = max(0, int((x - radius) // cell_size))
+    max_cx = min(grid_w - 1, int((x + radius) // cell_size))
+    min_cy = max(0, int((y - radius) // cell_size))
+    max_cy = min(grid_h - 1, int((y + radius) // cell_size))
+
+    out = np.empty(pos.shape[0], dtype=np.int64)
+    n = 0
+    for cx in range(min_cx, max_cx + 1):
+        for cy in range(min_cy, max_cy + 1):
+            cell = cx * grid_h + cy
+            for k in range(offsets[cell], offsets[cell + 1]):
+                j = order[k]
+                dx = pos[j, 0] - x
+                dy = pos[j, 1] - y
+                if dx * dx + dy * dy <= r2:
+                    out[n] = j
+                    n += 1
+    return out[:n]
+
+
+_gather_neighbors = njit_or_none(_gather_neighbors_loop)
+
+
+class NeighborGrid:
+    """
+    基于排序网格（CSR布局）的邻域索引
+
+    Features:
+    - 每步从 (N, 2) 位置数组整体重建，无逐对象插入
+    - 查询返回位置数组中的行索引
+    - numba可用时只检查覆盖查询圆的单元格
+    """
+
+    def __init__(self, cell_size: float):
+        self.cell_size = float(cell_size)
+        self.positions = np.empty((0, 2), dtype=np.float64)
+        self._order = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(2, dtype=np.int64)
+        self._grid_w = 1
+        self._grid_h = 1
+
+    def rebuild(self, positions: np.ndarray):
+        """按新的位置数组重建索引"""
+        self.positions = positions
+        if not len(positions) or not NUMBA_AVAILABLE:
+            # 回退实现直接对全部位置做向量化筛选，无需网格
+            return
+
+        cells = np.maximum((positions // self.cell_size).astype(np.int64), 0)
+        self._grid_w = int(cells[:, 0].max()) + 1
+        self._grid_h = int(cells[:, 1].max()) + 1
+        cell_ids = cells[:, 0] * self._grid_h + cells[:, 1]
+
+        self._order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=self._grid_w * self._grid_h)
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    def query(self, x: float, y: float, radius: float) -> np.ndarray:
+        """返回与 (x, y) 距离不超过 radius 的行索引"""
+        positions = self.positions
+        if not len(positions):
+            return self._order[:0]
+
+        if NUMBA_AVAILABLE:
+            return _gather_neighbors(
+                positions, self._order, self._offsets,
+                self._grid_w, self._grid_h, self.cell_size, x, y, radius
+            )
+
+        dx = positions[:, 0] - x
+        dy = positions[:, 1] - y
+        return np.flatnonzero(dx * dx + dy * dy <= radius * radius)
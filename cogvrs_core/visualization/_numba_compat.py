@@ -0,0 +1,22 @@
+"""
+Cogvrs - Numba Compatibility
+numba可选依赖的统一入口：各计算内核模块通过 njit_or_none 编译循环实现，
+未安装numba时得到None并自行选择回退实现
+
+Author: Ben Hsu & Claude
+"""
+
+try:
+    from numba import njit as _njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit_or_none(func, **options):
+    """numba可用时返回 njit(cache=True, **options) 编译后的函数，否则返回None"""
+    if not NUMBA_AVAILABLE:
+        return None
+    options.setdefault('cache', True)
+    return _njit(**options)(func)
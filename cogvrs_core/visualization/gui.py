@@ -5,19 +5,42 @@ Cogvrs - Main GUI Interface
 Author: Ben Hsu & Claude
 """
 
+import concurrent.futures
+import gc
+import heapq
+import itertools
+import json
+import sys
+import numpy as np
 import pygame
 import pygame_gui
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 import threading
 import time
 from typing import Dict, List, Optional
 import logging
+from collections import Counter, deque
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
 
-from ..core import PhysicsEngine, World2D, TimeManager
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from ..core import PhysicsEngine, World2D, TimeManager, SpatialHash
 from ..core.physics_engine import Vector2D
 from ..agents import SimpleAgent
 from ..environment import EnvironmentManager, WeatherSystem, TerrainSystem
 from ..environment.disaster_system import DisasterSystem
 from .world_view import WorldRenderer
+from ._env_kernels import apply_env_effects
+from ._neighbors import NeighborGrid
+from ._event_buffer import EventBuffer, EVENT_REPRODUCTION, EVENT_AGENT_DEATH
 from .multi_scale import (
     ScaleManager, CameraSystem, RenderingPipeline, 
     InteractionController, ScaleLevel
@@ -28,6 +51,302 @@ from ..utils.event_logger import (
 
 logger = logging.getLogger(__name__)
 
+# 智能体SoA状态数组的列索引
+(_AGENT_X, _AGENT_Y, _AGENT_ENERGY, _AGENT_AGE, _AGENT_HEALTH,
+ _AGENT_OFFSPRING, _AGENT_INTERACTIONS) = range(7)
+_AGENT_FIELDS = 7
+
+# 暂停时主循环的帧率
+_PAUSED_FPS = 10
+
+# 会话数据历史记录的默认长度（每秒一条，约10小时）
+_DEFAULT_HISTORY_LEN = 36000
+
+# 报告图表的最大数据点数（图表分辨率有限，更细的粒度只会增大报告体积）
+_CHART_MAX_POINTS = 1000
+# 只用于报告图表的历史序列，复制快照时直接抽样（报告数据唯一的抽样位置）
+_CHART_SERIES = frozenset(('stats_history', 'performance_metrics'))
+
+# 信息面板的表情映射和HTML模板（%格式化，模块加载时创建一次）
+_SEASON_EMOJI = {"Spring": "🌸", "Summer": "☀️", "Autumn": "🍂", "Winter": "❄️"}
+_TIME_EMOJI = {"Dawn": "🌅", "Day": "☀️", "Dusk": "🌇", "Night": "🌙"}
+_CLIMATE_EMOJI = {
+    "temperate": "🌤️", "ice_age": "🧊", "greenhouse": "🔥",
+    "arid": "🏜️", "volcanic": "🌋"
+}
+_WEATHER_EMOJI = {
+    "clear": "☀️", "rain": "🌧️", "storm": "⛈️",
+    "drought": "🌵", "blizzard": "🌨️", "heatwave": "🔥"
+}
+_CIV_EMOJI = {
+    'nomadic': '🏕️', 'settlement': '🏠', 'village': '🏘️',
+    'town': '🏙️', 'city': '🏙️'
+}
+
+# 灭绝分析的类别（按报告中的显示顺序）
+_ANALYSIS_CATEGORIES = (
+    "环境因素", "资源状况", "天气影响", "种群动态",
+    "进化趋势", "部落发展", "文明成就", "系统建议"
+)
+
+# 灭绝分析使用的气候和文明分类
+_SEVERE_CLIMATES = frozenset({'ice_age', 'volcanic', 'arid'})
+_CLIMATE_DESCRIPTIONS = {
+    'temperate': '温带气候 - 适宜生存，温度湿度适中',
+    'ice_age': '冰河时期 - 寒冷严酷，生存困难',
+    'greenhouse': '温室气候 - 炎热潮湿，极端天气频发',
+    'arid': '干旱气候 - 极度缺水，资源稀缺',
+    'volcanic': '火山时期 - 火山爆发，环境恶劣'
+}
+_ADVANCED_TRIBE_LEVELS = frozenset({'village', 'town', 'city'})
+
+_GET_POPULATION = itemgetter('population')
+_GET_TIMESTAMP = itemgetter('timestamp')
+
+_EVENT_ICONS = {'reproduction': '🍼', 'tribe': '🏘️', 'agent_death': '💀', 'environment': '🌍'}
+# 灭绝报告关键事件时间线收录的事件类型和单条事件模板
+_TIMELINE_EVENT_TYPES = frozenset({'reproduction', 'tribe', 'agent_death'})
+_TIMELINE_EVENT_FMT = """
+                    <div style="margin: 5px 0; padding: 5px; background: white; border-radius: 3px;">
+                        <strong>[%.1fs] %s %s</strong>%s</div>"""
+
+_STATS_HTML_FMT = """
+        <b>🌍 Population Overview</b><br>
+        <font color='#00FF00'>⏰ Step: %d</font><br>
+        <font color='#FFFF00'>👥 Total Agents: %d</font><br>
+        <font color='#90EE90'>✅ Alive: %d</font><br>
+        <font color='#FF6B6B'>💀 Dead: %d</font><br>
+        <font color='#FF8800'>📊 Age Range: %.0f-%.0f (avg: %.1f)</font><br>
+        <font color='#00FFFF'>⚡ Energy: %.0f-%.0f (avg: %.1f)</font><br>
+        <font color='#FF4444'>❤️ Health: %.0f-%.0f (avg: %.1f)</font><br>
+        <font color='#FF88FF'>👶 Total Offspring: %d</font><br>
+        <font color='#88FF88'>🤝 Social Interactions: %d</font><br>
+        <font color='#8888FF'>💎 Resources Available: %d</font><br>
+        <font color='#CCCCCC'>🎯 Simulation FPS: %.0f</font>
+        """
+
+_DETAILS_HTML_FMT = """
+            <b>🧠 Individual Agent Stats</b><br>
+            <font color='#FFD700'>🏆 Most Social:</font><br>
+            &nbsp;&nbsp;Agent#%s: %d interactions<br>
+            <font color='#90EE90'>👴 Eldest:</font><br>
+            &nbsp;&nbsp;Agent#%s: %.0f years old<br>
+            <font color='#FF69B4'>💪 Healthiest:</font><br>
+            &nbsp;&nbsp;Agent#%s: %.1f/100 HP<br>
+            <font color='#FFD700'>⚡ Most Energetic:</font><br>
+            &nbsp;&nbsp;Agent#%s: %.1f energy<br>
+            <br>
+            <b>🌱 Population Health</b><br>
+            <font color='#00FF00'>🟢 High Energy (>120): %d</font><br>
+            <font color='#FF0000'>🔴 Low Energy (<30): %d</font><br>
+            <font color='#00FFFF'>💚 Healthy (>80): %d</font>
+            """
+
+_NO_AGENTS_HTML = sys.intern("<b>🧠 Agent Analysis</b><br><font color='#FF6666'>No agents available</font>")
+
+_ENV_HTML_FMT = """
+            <br><b>🌍 Environment</b><br>
+            <font color='#90EE90'>%s %s</font><br>
+            <font color='#87CEEB'>%s %s</font><br>
+            <font color='#DDA0DD'>🏞️ Zones: %d</font><br>
+            """
+_CLIMATE_HTML_FMT = "<font color='#FFB6C1'>%s %s (%d%%)</font><br><font color='#DDD'>⏳ Next change: %ds</font><br>"
+_WEATHER_HTML_FMT = "<font color='#FFB6C1'>%s %s</font><br>"
+_CLEAR_WEATHER_HTML = sys.intern("<font color='#98FB98'>🌤️ Clear Weather</font><br>")
+
+_TRIBES_HEADER_FMT = """
+        <br><b>🏘️ Tribes & Civilization</b><br>
+        <font color='#FFD700'>🏛️ Total Tribes: %d</font><br>
+        """
+_CIV_LEVEL_FMT = "<font color='#87CEEB'>%s %s: %d</font><br>"
+_ALLIANCES_FMT = "<font color='#90EE90'>🤝 Alliances: %d</font><br>"
+_CONFLICTS_FMT = "<font color='#FF6B6B'>⚔️ Conflicts: %d</font><br>"
+_NO_TRIBES_HTML = sys.intern("""
+        <br><b>🏘️ Tribes & Civilization</b><br>
+        <font color='#808080'>No tribes formed yet</font><br>
+        """)
+
+# 标签页的静态占位HTML：内容不变时与文本框当前文本是同一对象，比较直接命中身份判断
+_TRIBE_OVERVIEW_EMPTY_HTML = sys.intern("<b>Tribe Overview</b><br>No tribes detected<br>")
+_TRIBE_DETAILS_EMPTY_HTML = sys.intern("<b>Tribe Details</b><br>No tribe selected<br>")
+_TRIBE_STATS_EMPTY_HTML = sys.intern("<b>Tribe Statistics</b><br>No data available<br>")
+_TRIBE_DIPLOMACY_EMPTY_HTML = sys.intern("<b>Diplomatic Status</b><br>No diplomatic data<br>")
+_NO_ACTIVE_DISASTERS_HTML = sys.intern("<b>Active Disasters</b><br>No active disasters<br><br>")
+_NO_WARNINGS_HTML = sys.intern("<b>Warning Information</b><br>No warnings<br>")
+_NO_LOGS_HTML = sys.intern("<b>System Logs</b><br>No log data available")
+
+_SYSTEM_HTML_FMT = """
+        <b>💻 System Status</b><br>
+        <font color='#00FF00'>Population: %s</font><br>
+        <font color='#FFFF00'>Performance: %s</font><br>
+        <font color='#FF8800'>Memory: %d tracked</font><br>
+        <font color='#00FFFF'>Render: %s%s</font><br>
+        <font color='#CCCCCC'>Press M to toggle render mode</font>
+        %s
+        %s
+        """
+
+# 部落事件历史的默认长度
+_DEFAULT_EVENT_HISTORY_LEN = 10000
+
+
+def _json_dumps(obj) -> str:
+    """序列化为JSON字符串：orjson可用时使用orjson，否则回退到标准库json"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj)
+
+
+@lru_cache(maxsize=4096)
+def _fmt_clock(ts: int) -> str:
+    """将整秒时间戳格式化为本地时间 HH:MM:SS（结果按秒缓存）"""
+    t = time.localtime(ts)
+    return "%02d:%02d:%02d" % (t.tm_hour, t.tm_min, t.tm_sec)
+
+
+def _downsample(seq, max_points: int) -> list:
+    """按固定步长抽样，结果不超过max_points个元素（步长向上取整）"""
+    stride = max(1, -(-len(seq) // max_points))
+    return list(itertools.islice(seq, 0, None, stride))
+
+
+def _tail(seq, n: int) -> list:
+    """返回序列最后n个元素（同时支持list和deque），只从尾部遍历n个元素"""
+    tail = list(itertools.islice(reversed(seq), n))
+    tail.reverse()
+    return tail
+
+
+def _format_event_detail(event: Dict) -> str:
+    """关键事件时间线中单条事件的补充说明（无详细信息时返回空串）"""
+    details = event.get('details')
+    if not isinstance(details, dict):
+        return ''
+    event_type = event['type']
+    if event_type == 'reproduction':
+        return f"<br><small>父母: {details.get('parent_id', 'Unknown')}, 代数: {details.get('generation', 0)}</small>"
+    if event_type == 'tribe':
+        return f"<br><small>成员数: {details.get('member_count', 0)}, 领袖: {details.get('leader_id', 'Unknown')}</small>"
+    if event_type == 'agent_death':
+        return f"<br><small>死因: {details.get('cause', 'Unknown')}, 年龄: {details.get('age', 0):.1f}</small>"
+    return ''
+
+
+def _epoch_durations(climate_history: List[Dict], now: float) -> Dict[str, float]:
+    """按纪元汇总气候历史的持续时间（最后一条记录持续到now），按纪元首次出现的顺序返回"""
+    durations = {}
+    next_timestamps = itertools.chain(
+        (record['timestamp'] for record in itertools.islice(climate_history, 1, None)), (now,)
+    )
+    for record, next_ts in zip(climate_history, next_timestamps):
+        epoch = record['epoch']
+        durations[epoch] = durations.get(epoch, 0) + (next_ts - record['timestamp'])
+    return durations
+
+
+# HTML报告模板：静态的头部样式和图表脚本在模块加载时读取为字节，中间动态部分预编译为模板
+_TEMPLATE_DIR = Path(__file__).parent / "templates"
+_REPORT_PRELUDE: bytes = (_TEMPLATE_DIR / "report_prelude.html").read_bytes()
+_REPORT_POSTLUDE: bytes = (_TEMPLATE_DIR / "report_postlude.html").read_bytes()
+_REPORT_ENV = Environment(
+    loader=FileSystemLoader(str(_TEMPLATE_DIR)),
+    autoescape=select_autoescape(enabled_extensions=("html", "html.j2")),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False
+)
+_REPORT_TEMPLATE = _REPORT_ENV.get_template("report.html.j2")
+
+# 灭绝报告的静态头尾（CSS中的花括号已转义，{ts} 为报告时间）
+_EXTINCTION_HTML_HEAD = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <title>种群灭绝分析报告 - {ts}</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
+        .container {{ max-width: 1000px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
+        .header {{ background: linear-gradient(135deg, #ff6b6b, #ee5a24); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }}
+        .section {{ margin: 20px 0; padding: 15px; border-left: 4px solid #ff6b6b; background: #fff5f5; }}
+        .analysis-item {{ margin: 10px 0; padding: 8px; background: #ffffff; border-radius: 4px; border-left: 3px solid #ff9999; }}
+        .warning {{ background: #fff3cd; border-color: #ffeaa7; color: #856404; }}
+        .suggestion {{ background: #d1ecf1; border-color: #74b9ff; color: #0c5460; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>💀 种群灭绝分析报告</h1>
+            <p>时间: {ts}</p>
+        </div>
+"""
+_EXTINCTION_HTML_TAIL = """
+    </div>
+</body>
+</html>
+"""
+
+# 报告输出目录和文件写入缓冲区大小
+_REPORTS_DIR = Path("reports")
+_REPORT_WRITE_BUFFER = 1 << 20
+_reports_dir_ready = False
+
+
+def _ensure_reports_dir():
+    """确保reports目录存在（每个进程只检查一次）"""
+    global _reports_dir_ready
+    if not _reports_dir_ready:
+        _REPORTS_DIR.mkdir(exist_ok=True)
+        _reports_dir_ready = True
+
+
+def _scale_points(points, count: int, scale: float) -> list:
+    """将count个 (x, y) 坐标一次性写入 (N, 2) float32 数组并整体缩放，返回 [x, y] 列表"""
+    coords = np.fromiter(itertools.chain.from_iterable(points), dtype=np.float32, count=2 * count)
+    coords *= scale
+    return coords.reshape(count, 2).tolist()
+
+
+class _ScaledAgent:
+    """
+    多尺度渲染使用的智能体副本：只复制渲染需要的属性，位置换算到显示坐标
+    
+    使用固定的 __slots__，不为每个副本分配实例字典。部落属性由部落系统
+    动态附加，智能体没有时为None。
+    """
+    
+    __slots__ = ('energy', 'health', 'max_health', 'agent_id', 'age', 'alive',
+                 'position', 'tribe_id', 'tribe_name', 'tribe_color')
+    
+    def __init__(self, agent, position: Vector2D):
+        self.position = position
+        self.refresh(agent)
+    
+    def refresh(self, agent):
+        """从智能体同步渲染属性（位置由调用方单独更新）"""
+        self.energy = agent.energy
+        self.health = agent.health
+        self.max_health = agent.max_health
+        self.agent_id = agent.agent_id
+        self.age = agent.age
+        self.alive = agent.alive
+        self.tribe_id = getattr(agent, 'tribe_id', None)
+        self.tribe_name = getattr(agent, 'tribe_name', None)
+        self.tribe_color = getattr(agent, 'tribe_color', None)
+
+
+class _ScaledResource:
+    """多尺度渲染使用的资源对象副本：复制固定的数据属性，位置换算到显示坐标"""
+    
+    COPY_ATTRS = ('type', 'amount', 'max_amount', 'regeneration_rate')
+    __slots__ = COPY_ATTRS + ('position',)
+    
+    def __init__(self, resource, position: Vector2D):
+        for attr in self.COPY_ATTRS:
+            setattr(self, attr, getattr(resource, attr, None))
+        self.position = position
+
 
 class CogvrsGUI:
     """
@@ -47,7 +366,25 @@ class CogvrsGUI:
         info = pygame.display.Info()
         self.screen_width = info.current_w
         self.screen_height = info.current_h
-        print(f"🖥️ 检测到屏幕尺寸: {self.screen_width}x{self.screen_height}")
+    
+    def _draw_static_background(self):
+        """
+        在后台缓冲区上绘制背景、世界视图边框和右侧面板（仅在缓冲区重建时调用）
+        
+        每帧只有世界视图内部 (10, 10) 起的区域被世界画布覆盖，边框线落在其外侧
+        两像素内，面板和其余边缘区域不再被任何内容写入，因此静态部分只需绘制一次。
+        """
+        # 每帧需要提交到屏幕的区域：世界视图（含边框）和右侧面板
+        self._world_view_rect = pygame.Rect(8, 8, self.world_view_width + 4, self.world_view_height + 4)
+        self._panel_rect = pygame.Rect(self.world_view_width + 20, 0, self.panel_width - 20, self.window_height)
+        self._frame_rects = (self._world_view_rect, self._panel_rect)
+        self._full_redraw = True
+        
+        back_buffer = self.back_buffer
+        back_buffer.fill((15, 15, 25))
+        pygame.draw.rect(back_buffer, (100, 100, 100), self._world_view_rect, 2)
+        back_buffer.fill((25, 25, 35), self._panel_rect)
+        pygame.draw.rect(back_buffer, (60, 60, 80), self._panel_rect, 2)
     
     def __init__(self, config: Dict):
         self.config = config
@@ -73,7 +410,7 @@ class CogvrsGUI:
         # 创建主窗口 - 支持大小调节
         self.screen = pygame.display.set_mode(
             (self.window_width, self.window_height), 
-            pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE
+            pygame.DOUBLEBUF | pygame.RESIZABLE
         )
         pygame.display.set_caption("Cogvrs - Cognitive Universe Simulation")
         
@@ -84,8 +421,10 @@ class CogvrsGUI:
         ])
         
         # 创建后台渲染缓冲区
-        self.back_buffer = pygame.Surface((self.window_width, self.window_height))
+        self.back_buffer = pygame.Surface((self.window_width, self.window_height)).convert()
         self.dirty_rects = []  # 脏矩形区域
+        self._draw_static_background()
+        self._world_surface = pygame.Surface((self.world_view_width, self.world_view_height)).convert()  # 世界视图画布，每帧复用
         
         # 创建GUI管理器并配置中文字体
         self.ui_manager = pygame_gui.UIManager(
@@ -115,18 +454,25 @@ class CogvrsGUI:
             'screen_width': self.world_view_width,
             'screen_height': self.world_view_height,
             'world_width': self.world.width,
-            'world_height': self.world.height
+            'world_height': self.world.height,
+            'auto_flip': False  # 由主循环统一提交脏矩形
         }
         self.world_renderer = WorldRenderer(renderer_config)
         
         # 初始化环境系统
         self._initialize_environment_system()
         
-        # 初始化多尺度可视化系统
+        # 初始化多尺度可视化系统（未启用时保持为None/False，热路径上直接判断而不用hasattr）
+        self.multi_scale_mode = False
+        self.scale_manager = None
+        self.interaction_controller = None
         self.enable_multi_scale = config.get('enable_multi_scale', True)
         if self.enable_multi_scale:
             self._initialize_multi_scale_system()
         
+        # 子系统已全部创建，确定多尺度世界状态的构建阶段
+        self._world_state_stages = self._select_world_state_stages()
+        
         # 创建UI元素
         self._create_ui_elements()
         
@@ -154,23 +500,101 @@ class CogvrsGUI:
             self.stats_update_interval = 0.3  # 提高UI更新频率
         
         # 数据收集系统
-        self.session_data = {
-            'start_time': time.time(),
-            'stats_history': [],
-            'events': [],
-            'agent_lifecycle': [],
-            'performance_metrics': [],
-            'detailed_events': [],  # 新增详细事件记录
-            'tribe_events': [],     # 部落相关事件
-            'reproduction_events': [], # 繁殖事件
-            'environmental_events': []  # 环境事件
-        }
+        self.session_data = self._new_session_data()
         
         # 灭绝事件标志
         self.extinction_occurred = False
+        # 灭绝处理期间缓存的气候状态和历史 (status, history)，分析与报告共用
+        self._extinction_climate = None
+        
+        # 模拟/渲染解耦：可选的独立模拟线程，渲染线程读取双缓冲的世界状态快照
+        self.threaded_simulation = config.get('threaded_simulation', False)
+        self.sim_fps = config.get('sim_fps', self.target_fps)
+        # 单线程模式的固定步长模拟：累积真实帧时间，按固定dt整步推进，余量用于渲染插值
+        self.fixed_timestep = config.get('fixed_timestep', True)
+        self._sim_dt = 1.0 / max(1, self.sim_fps)
+        self._max_sim_steps = config.get('max_sim_steps_per_frame', 5)
+        self._sim_accumulator = 0.0
+        self._render_alpha = 1.0
+        # 最后一个模拟步之前的智能体位置：agent_id -> (x, y)
+        self._prev_agent_positions: Dict[str, tuple] = {}
+        self._state_lock = threading.RLock()
+        self._state_front = None
+        # 变化缓慢的世界状态子块（环境状态、气候、地形）按步数分段缓存：名称 -> (分段, 数据)
+        self._world_block_cache: Dict[str, tuple] = {}
+        self.world_block_cache_steps = config.get('world_block_cache_steps', 10)
+        # 世界版本号：模拟推进或智能体增减时递增，写入世界状态的 'tick' 供派生结构判断是否需要重建
+        self._world_version = 0
+        # 单线程模式下按agent_id复用的多尺度渲染智能体副本
+        self._scaled_agent_pool: Dict[str, _ScaledAgent] = {}
+        self._sim_thread = None
+        
+        # HTML报告在独立线程上生成，避免阻塞渲染
+        self._report_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="cogvrs-report"
+        )
+        
+        # 将初始化阶段创建的长期对象移入永久代，避免主循环中的GC停顿
+        gc.collect()
+        gc.freeze()
+        gc_threshold = config.get('gc_threshold')
+        if gc_threshold:
+            gc.set_threshold(*gc_threshold)
         
         logger.info(f"CogvrsGUI initialized: {self.window_width}x{self.window_height}")
     
+    def _new_session_data(self) -> Dict:
+        """创建会话数据容器：历史记录使用定长环形缓冲区，内存占用有上限"""
+        history_len = self.config.get('history_len', _DEFAULT_HISTORY_LEN)
+        event_history_len = self.config.get('event_history_len', _DEFAULT_EVENT_HISTORY_LEN)
+        return {
+            'start_time': time.time(),
+            'stats_history': deque(maxlen=history_len),
+            'events': deque(maxlen=history_len),
+            'agent_lifecycle': deque(maxlen=history_len),
+            'performance_metrics': deque(maxlen=history_len),
+            'detailed_events': deque(maxlen=history_len),  # 新增详细事件记录
+            'tribe_events': deque(maxlen=event_history_len),  # 部落相关事件
+            'agent_events': EventBuffer(max_events=history_len),  # 繁殖/死亡等高频事件
+            'environmental_events': deque(maxlen=history_len),  # 环境事件
+            'aggregates': {  # 随统计快照增量更新的会话极值/累计值，报告生成时无需扫描历史
+                'max_agents': 0,
+                'max_offspring': 0,
+                'max_interactions': 0,
+                'max_age': 0.0,
+                'max_tribes': 0,
+                'max_tribe_size': 0,
+                'max_tech_level': 0.0,
+                'fps_sum': 0.0,
+                'fps_count': 0
+            }
+        }
+    
+    def _record_stat_snapshot(self, snapshot: Dict):
+        """追加统计快照并更新会话聚合值"""
+        self.session_data['stats_history'].append(snapshot)
+        
+        agg = self.session_data['aggregates']
+        if snapshot['agent_count'] > agg['max_agents']:
+            agg['max_agents'] = snapshot['agent_count']
+        if snapshot['total_offspring'] > agg['max_offspring']:
+            agg['max_offspring'] = snapshot['total_offspring']
+        if snapshot['total_interactions'] > agg['max_interactions']:
+            agg['max_interactions'] = snapshot['total_interactions']
+        if snapshot['avg_age'] > agg['max_age']:
+            agg['max_age'] = snapshot['avg_age']
+        agg['fps_sum'] += snapshot['fps']
+        agg['fps_count'] += 1
+        
+        tribes = snapshot['tribes']
+        if tribes:
+            if tribes['total_tribes'] > agg['max_tribes']:
+                agg['max_tribes'] = tribes['total_tribes']
+            if tribes['largest_tribe'] > agg['max_tribe_size']:
+                agg['max_tribe_size'] = tribes['largest_tribe']
+            if tribes['avg_tech_level'] > agg['max_tech_level']:
+                agg['max_tech_level'] = tribes['avg_tech_level']
+    
     def _record_event(self, event_type: str, description: str, details: dict = None):
         """记录模拟事件"""
         event = {
@@ -186,8 +610,6 @@ class CogvrsGUI:
         
         if event_type == 'tribe':
             self.session_data['tribe_events'].append(event)
-        elif event_type == 'reproduction':
-            self.session_data['reproduction_events'].append(event)
         elif event_type == 'environment':
             self.session_data['environmental_events'].append(event)
     
@@ -216,10 +638,27 @@ class CogvrsGUI:
         time_config.update({
             'dt': 0.1,
             'target_fps': 30,
-            'real_time': True
+            # 固定步长模式由GUI主循环、线程模式由模拟线程掌握节奏，TimeManager不再逐步休眠
+            'real_time': not (self.fixed_timestep or self.threaded_simulation)
         })
         self.time_manager = TimeManager(time_config)
         
+        # 邻域查询空间索引（单元格大小与感知半径一致）
+        self._agent_grid = NeighborGrid(cell_size=10.0)
+        self._indexed_agents: List[SimpleAgent] = []
+        self._resource_index = SpatialHash(cell_size=10.0)
+        
+        # 每步按气候区域组合缓存的环境效应：区域位掩码 -> 效应
+        self._env_cache = {}
+        
+        # 智能体属性的SoA数组（每行一个智能体，列见 _AGENT_* 常量）
+        self._agent_state = np.empty((world_config['max_agents'], _AGENT_FIELDS), dtype=np.float64)
+        
+        # 已死亡智能体的对象池，繁殖时就地重置复用，减少分配和GC压力
+        self._agent_pool: List[SimpleAgent] = []
+        self._agent_pool_limit = self.config.get('agent_pool_size', 256)
+        self._cull_interval = self.config.get('cull_interval', 10)
+        
         # 创建初始智能体
         self.agents = []
         initial_agent_count = self.config.get('initial_agents', 10)
@@ -250,7 +689,8 @@ class CogvrsGUI:
         )
         
         # 传递环境配置到气候系统
-        if hasattr(self.environment_manager, 'climate_system'):
+        self._has_climate = hasattr(self.environment_manager, 'climate_system')
+        if self._has_climate:
             env_config = self.config.get('environment', {})
             # 更新气候系统配置
             self.environment_manager.climate_system.config.update(env_config)
@@ -278,6 +718,11 @@ class CogvrsGUI:
         else:
             self.tribe_manager = None
         
+        # 可选子系统标志：初始化时确定一次，避免模拟热路径上反复hasattr
+        self._has_weather = self.weather_system is not None
+        self._has_tribes = self.tribe_manager is not None
+        self._has_disasters = self.disaster_system is not None
+        
         logger.info("Environment system initialized (using climate system)")
     
     def _initialize_multi_scale_system(self):
@@ -370,7 +815,7 @@ class CogvrsGUI:
             def emit(self, record):
                 try:
                     msg = self.format(record)
-                    timestamp = time.strftime('%H:%M:%S')
+                    timestamp = _fmt_clock(int(record.created))
                     log_type = record.levelname
                     formatted_msg = f"[{timestamp}] {log_type}: {msg}"
                     
@@ -484,84 +929,154 @@ class CogvrsGUI:
             print(f"❌ 字体配置失败: {e}")
             print("使用默认字体配置")
     
+    def _ui_layout(self, button_x: int, panel_width: int) -> Dict[str, Dict[str, pygame.Rect]]:
+        """
+        计算右侧面板所有UI元素的位置和尺寸
+        
+        创建元素和窗口尺寸变化后重新定位元素共用同一份布局，
+        按 标签页 -> 元素键 组织，键与 *_elements 字典一致。
+        """
+        tab_height = 35
+        tab_button_width = panel_width // 4
+        
+        # 内容区域
+        x = button_x
+        y = 50
+        width = panel_width
+        height = self.window_height - 70
+        
+        return {
+            'tabs': {
+                'control': pygame.Rect(button_x, 10, tab_button_width, tab_height),
+                'tribes': pygame.Rect(button_x + tab_button_width, 10, tab_button_width, tab_height),
+                'disasters': pygame.Rect(button_x + tab_button_width * 2, 10, tab_button_width, tab_height),
+                'logs': pygame.Rect(button_x + tab_button_width * 3, 10, tab_button_width, tab_height),
+            },
+            'control': {
+                'play_pause': pygame.Rect(x, y + 10, 120, 30),
+                'reset': pygame.Rect(x + 130, y + 10, 120, 30),
+                'speed_label': pygame.Rect(x, y + 50, 120, 25),
+                'speed_slider': pygame.Rect(x, y + 80, 250, 20),
+                'add_agent': pygame.Rect(x, y + 120, 120, 30),
+                'stats': pygame.Rect(x, y + 170, width, 150),
+                'details': pygame.Rect(x, y + 330, width, 120),
+                'system': pygame.Rect(x, y + 460, width, 80),
+                'help': pygame.Rect(x, y + 550, width, 120),
+            },
+            'tribes': {
+                'overview': pygame.Rect(x, y + 10, width, 120),
+                'selector_label': pygame.Rect(x, y + 140, 100, 25),
+                'selector': pygame.Rect(x + 100, y + 140, width - 100, 30),
+                'details': pygame.Rect(x, y + 180, width, 200),
+                'members': pygame.Rect(x, y + 390, width, 150),
+                'diplomacy': pygame.Rect(x, y + 550, width, 100),
+            },
+            'disasters': {
+                'active_disasters': pygame.Rect(x, y + 10, width, 150),
+                'disaster_history': pygame.Rect(x, y + 170, width, 200),
+                'disaster_stats': pygame.Rect(x, y + 380, width, 120),
+                'environment_status': pygame.Rect(x, y + 510, width, 100),
+                'warnings': pygame.Rect(x, y + 620, width, 80),
+            },
+            'logs': {
+                'filter_label': pygame.Rect(x, y + 10, 60, 25),
+                'filter': pygame.Rect(x + 60, y + 10, 120, 30),
+                'clear_button': pygame.Rect(x + 190, y + 10, 60, 30),
+                'log_display': pygame.Rect(x, y + 50, width, height - 60),
+            },
+        }
+    
+    def _relayout_ui_elements(self):
+        """窗口尺寸变化后复用现有UIManager和UI元素，只更新分辨率与元素位置尺寸"""
+        self.ui_manager.set_window_resolution((self.window_width, self.window_height))
+        
+        layout = self._ui_layout(self.world_view_width + 20, self.panel_width - 20)
+        for group, elements in (('tabs', self.tab_buttons),
+                                ('control', self.control_elements),
+                                ('tribes', self.tribes_elements),
+                                ('disasters', self.disasters_elements),
+                                ('logs', self.logs_elements)):
+            for key, rect in layout[group].items():
+                element = elements[key]
+                element.set_relative_position(rect.topleft)
+                element.set_dimensions(rect.size)
+        
+        # 文本框尺寸变化后需要按当前状态重新排版
+        self._last_ui_key = None
+    
     def create_tabbed_interface(self, button_x, panel_width):
         """创建标签页界面"""
-        tab_height = 35
-        button_height = 30
+        layout = self._ui_layout(button_x, panel_width)
+        tab_rects = layout['tabs']
         
         # 标签按钮
-        tab_button_width = panel_width // 4
         self.tab_buttons = {}
         
         # 控制标签
         self.tab_buttons['control'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(button_x, 10, tab_button_width, tab_height),
+            relative_rect=tab_rects['control'],
             text='Control',
             manager=self.ui_manager
         )
         
         # 部落标签
         self.tab_buttons['tribes'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(button_x + tab_button_width, 10, tab_button_width, tab_height),
+            relative_rect=tab_rects['tribes'],
             text='Tribes',
             manager=self.ui_manager
         )
         
         # 灾难标签
         self.tab_buttons['disasters'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(button_x + tab_button_width * 2, 10, tab_button_width, tab_height),
+            relative_rect=tab_rects['disasters'],
             text='Disasters',
             manager=self.ui_manager
         )
         
         # 日志标签
         self.tab_buttons['logs'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(button_x + tab_button_width * 3, 10, tab_button_width, tab_height),
+            relative_rect=tab_rects['logs'],
             text='Logs',
             manager=self.ui_manager
         )
         
-        # 内容区域
-        content_y = 50
-        content_height = self.window_height - 70
-        
         # 创建各个标签页内容
-        self.create_control_panel(button_x, content_y, panel_width, content_height)
-        self.create_tribes_panel(button_x, content_y, panel_width, content_height)
-        self.create_disasters_panel(button_x, content_y, panel_width, content_height)
-        self.create_logs_panel(button_x, content_y, panel_width, content_height)
+        self.create_control_panel(layout['control'])
+        self.create_tribes_panel(layout['tribes'])
+        self.create_disasters_panel(layout['disasters'])
+        self.create_logs_panel(layout['logs'])
         
         # 当前活动标签
         self.active_tab = 'control'
         self.update_tab_visibility()
     
-    def create_control_panel(self, x, y, width, height):
+    def create_control_panel(self, rects: Dict[str, pygame.Rect]):
         """创建控制面板"""
         self.control_elements = {}
         
         # 播放/暂停按钮
         self.control_elements['play_pause'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(x, y + 10, 120, 30),
+            relative_rect=rects['play_pause'],
             text='Pause',
             manager=self.ui_manager
         )
         
         # 重置按钮
         self.control_elements['reset'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(x + 130, y + 10, 120, 30),
+            relative_rect=rects['reset'],
             text='Reset',
             manager=self.ui_manager
         )
         
         # 速度控制
         self.control_elements['speed_label'] = pygame_gui.elements.UILabel(
-            relative_rect=pygame.Rect(x, y + 50, 120, 25),
+            relative_rect=rects['speed_label'],
             text='Speed: 1.0x',
             manager=self.ui_manager
         )
         
         self.control_elements['speed_slider'] = pygame_gui.elements.UIHorizontalSlider(
-            relative_rect=pygame.Rect(x, y + 80, 250, 20),
+            relative_rect=rects['speed_slider'],
             start_value=1.0,
             value_range=(0.1, 5.0),
             manager=self.ui_manager
@@ -569,7 +1084,7 @@ class CogvrsGUI:
         
         # 添加智能体按钮
         self.control_elements['add_agent'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(x, y + 120, 120, 30),
+            relative_rect=rects['add_agent'],
             text='Add Agent',
             manager=self.ui_manager
         )
@@ -583,21 +1098,21 @@ class CogvrsGUI:
         
         # 统计信息
         self.control_elements['stats'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 170, width, 150),
+            relative_rect=rects['stats'],
             html_text="<b>World Statistics</b><br>Loading...",
             manager=self.ui_manager
         )
         
         # 智能体详细信息
         self.control_elements['details'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 330, width, 120),
+            relative_rect=rects['details'],
             html_text="<b>Agent Analysis</b><br>Analyzing behaviors...",
             manager=self.ui_manager
         )
         
         # 系统状态
         self.control_elements['system'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 460, width, 80),
+            relative_rect=rects['system'],
             html_text="<b>System Status</b><br>Initializing...",
             manager=self.ui_manager
         )
@@ -607,6 +1122,9 @@ class CogvrsGUI:
         self.details_text = self.control_elements['details']
         self.system_text = self.control_elements['system']
         
+        # 上次更新信息面板时的模拟状态，状态未变化时跳过面板重建
+        self._last_ui_key = None
+        
         # 控制说明
         help_text = ("<b>🎮 Multi-Scale Controls:</b><br>"
                     "<font color='#FFD700'>1 - Micro Scale</font><br>"
@@ -617,31 +1135,31 @@ class CogvrsGUI:
                     "<font color='#CCCCCC'>Space - Pause/Resume</font>")
         
         self.control_elements['help'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 550, width, 120),
+            relative_rect=rects['help'],
             html_text=help_text,
             manager=self.ui_manager
         )
     
-    def create_tribes_panel(self, x, y, width, height):
+    def create_tribes_panel(self, rects: Dict[str, pygame.Rect]):
         """创建部落信息面板"""
         self.tribes_elements = {}
         
         # 部落总览
         self.tribes_elements['overview'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 10, width, 120),
+            relative_rect=rects['overview'],
             html_text="<b>Tribe Overview</b><br>Scanning tribe information...",
             manager=self.ui_manager
         )
         
         # 部落选择下拉框
         self.tribes_elements['selector_label'] = pygame_gui.elements.UILabel(
-            relative_rect=pygame.Rect(x, y + 140, 100, 25),
+            relative_rect=rects['selector_label'],
             text='Select Tribe:',
             manager=self.ui_manager
         )
         
         self.tribes_elements['selector'] = pygame_gui.elements.UIDropDownMenu(
-            relative_rect=pygame.Rect(x + 100, y + 140, width - 100, 30),
+            relative_rect=rects['selector'],
             options_list=['No Tribes'],
             starting_option='No Tribes',
             manager=self.ui_manager
@@ -649,77 +1167,77 @@ class CogvrsGUI:
         
         # 选中部落详细信息
         self.tribes_elements['details'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 180, width, 200),
+            relative_rect=rects['details'],
             html_text="<b>Tribe Details</b><br>Select a tribe to view details",
             manager=self.ui_manager
         )
         
         # 部落成员列表
         self.tribes_elements['members'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 390, width, 150),
+            relative_rect=rects['members'],
             html_text="<b>Member List</b><br>Waiting for tribe data...",
             manager=self.ui_manager
         )
         
         # 外交关系
         self.tribes_elements['diplomacy'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 550, width, 100),
+            relative_rect=rects['diplomacy'],
             html_text="<b>Diplomatic Relations</b><br>Analyzing...",
             manager=self.ui_manager
         )
     
-    def create_disasters_panel(self, x, y, width, height):
+    def create_disasters_panel(self, rects: Dict[str, pygame.Rect]):
         """创建灾难监控面板"""
         self.disasters_elements = {}
         
         # 当前活跃灾难
         self.disasters_elements['active_disasters'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 10, width, 150),
+            relative_rect=rects['active_disasters'],
             html_text="<b>Active Disasters</b><br>Monitoring...",
             manager=self.ui_manager
         )
         
         # 灾难历史记录
         self.disasters_elements['disaster_history'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 170, width, 200),
+            relative_rect=rects['disaster_history'],
             html_text="<b>Disaster History</b><br>Collecting historical data...",
             manager=self.ui_manager
         )
         
         # 灾难统计
         self.disasters_elements['disaster_stats'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 380, width, 120),
+            relative_rect=rects['disaster_stats'],
             html_text="<b>Disaster Statistics</b><br>Calculating...",
             manager=self.ui_manager
         )
         
         # 环境状态
         self.disasters_elements['environment_status'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 510, width, 100),
+            relative_rect=rects['environment_status'],
             html_text="<b>Environment Status</b><br>Detecting...",
             manager=self.ui_manager
         )
         
         # 预警信息
         self.disasters_elements['warnings'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 620, width, 80),
+            relative_rect=rects['warnings'],
             html_text="<b>Warning Information</b><br>No warnings",
             manager=self.ui_manager
         )
     
-    def create_logs_panel(self, x, y, width, height):
+    def create_logs_panel(self, rects: Dict[str, pygame.Rect]):
         """创建日志面板"""
         self.logs_elements = {}
         
         # 日志过滤控制
         self.logs_elements['filter_label'] = pygame_gui.elements.UILabel(
-            relative_rect=pygame.Rect(x, y + 10, 60, 25),
+            relative_rect=rects['filter_label'],
             text='Filter:',
             manager=self.ui_manager
         )
         
         self.logs_elements['filter'] = pygame_gui.elements.UIDropDownMenu(
-            relative_rect=pygame.Rect(x + 60, y + 10, 120, 30),
+            relative_rect=rects['filter'],
             options_list=['All', 'System', 'Agent', 'Tribe', 'Disaster', 'Error'],
             starting_option='All',
             manager=self.ui_manager
@@ -727,14 +1245,14 @@ class CogvrsGUI:
         
         # 清除日志按钮
         self.logs_elements['clear_button'] = pygame_gui.elements.UIButton(
-            relative_rect=pygame.Rect(x + 190, y + 10, 60, 30),
+            relative_rect=rects['clear_button'],
             text='Clear',
             manager=self.ui_manager
         )
         
         # 日志显示区域
         self.logs_elements['log_display'] = pygame_gui.elements.UITextBox(
-            relative_rect=pygame.Rect(x, y + 50, width, height - 60),
+            relative_rect=rects['log_display'],
             html_text="<b>System Logs</b><br><font color='#008000'>System initializing...</font>",
             manager=self.ui_manager
         )
@@ -769,32 +1287,39 @@ class CogvrsGUI:
                 button.background_colour = pygame.Color(64, 64, 64)
     
     def update_simulation(self, dt: float):
-        """更新模拟状态"""
-        if self.paused:
-            return
-        
+        """更新模拟状态（暂停检查由调用方负责）"""
         # 更新时间管理器
         if not self.time_manager.step():
             return
+        self._world_version += 1
         
         # 更新环境系统
-        if hasattr(self, 'weather_system') and self.weather_system is not None:
+        if self._has_weather:
             self.weather_system.update(dt)
         
         # 更新气候系统
-        if hasattr(self, 'environment_manager') and hasattr(self.environment_manager, 'climate_system'):
+        if self._has_climate:
             self.environment_manager.climate_system.update(dt)
         
         # 更新部落系统
-        if hasattr(self, 'tribe_manager') and self.tribe_manager is not None:
+        if self._has_tribes:
             self.tribe_manager.update(self.agents, dt)
         
         # 更新世界
         self.world.update(dt)
         
+        # 气候每步最多变化一次，清空上一步的区域效应缓存
+        self._env_cache.clear()
+        
+        # 每步重建一次空间索引
+        self._rebuild_agent_index([a for a in self.agents if a.alive])
+        self._rebuild_resource_index()
+        
         # 更新智能体
         alive_agents = []
         newly_dead = []
+        env_agents = []
+        env_effects = []
         
         for agent in self.agents:
             was_alive = agent.alive
@@ -811,8 +1336,9 @@ class CogvrsGUI:
                 world_state = self.world.get_world_state()
                 agent.update(dt, world_state, nearby_agents, nearby_resources)
                 
-                # 应用环境影响
-                self._apply_environmental_effects(agent, environmental_effects, dt)
+                # 记录环境影响，循环结束后批量应用
+                env_agents.append(agent)
+                env_effects.append(environmental_effects)
                 
                 # 检查是否刚刚死亡
                 if was_alive and not agent.alive:
@@ -821,31 +1347,38 @@ class CogvrsGUI:
                 if agent.alive:
                     alive_agents.append(agent)
         
-        # 记录死亡事件
-        for dead_agent in newly_dead:
-            death_cause = "Unknown"
-            if dead_agent.health <= 0:
-                death_cause = "Health depletion"
-            elif dead_agent.energy <= 0:
-                death_cause = "Energy depletion"
-            elif dead_agent.age > 300:
-                death_cause = "Old age"
-            
-            self._record_event('agent_death', f'智能体死亡: {dead_agent.agent_id}', {
-                'agent_id': dead_agent.agent_id,
-                'age': dead_agent.age,
-                'cause': death_cause,
-                'final_health': dead_agent.health,
-                'final_energy': dead_agent.energy,
-                'position': (dead_agent.position.x, dead_agent.position.y),
-                'offspring_count': dead_agent.offspring_count,
-                'tribe_id': getattr(dead_agent, 'tribe_id', None)
-            })
+        # 批量应用环境影响
+        self._apply_environmental_effects(env_agents, env_effects, dt)
+        
+        # 记录死亡事件（写入结构化事件缓冲区）
+        if newly_dead:
+            agent_events = self.session_data['agent_events']
+            event_time = time.time()
+            current_step = self.time_manager.current_step
+            for dead_agent in newly_dead:
+                death_cause = 0  # Unknown
+                if dead_agent.health <= 0:
+                    death_cause = 1  # Health depletion
+                elif dead_agent.energy <= 0:
+                    death_cause = 2  # Energy depletion
+                elif dead_agent.age > 300:
+                    death_cause = 3  # Old age
+                
+                agent_events.add_death(
+                    event_time, current_step, dead_agent.agent_id,
+                    dead_agent.position.x, dead_agent.position.y,
+                    dead_agent.energy, dead_agent.health, dead_agent.age,
+                    dead_agent.offspring_count, death_cause,
+                    getattr(dead_agent, 'tribe_id', None)
+                )
         
         # 应用物理效果
         physics_objects = [agent for agent in alive_agents if agent.alive]
         self.physics.apply_physics(physics_objects)
         
+        # 物理更新后位置已变化，为繁殖配对重建智能体索引
+        self._rebuild_agent_index(alive_agents)
+        
         # 记录繁殖前的数量
         agents_before_reproduction = len(self.agents)
         alive_before_reproduction = len(alive_agents)
@@ -855,27 +1388,25 @@ class CogvrsGUI:
         
         # 注意：不要用alive_agents覆盖self.agents，因为新生儿已经在_handle_reproduction中添加到self.agents了
         agents_after_reproduction = len(self.agents)
-        alive_after_reproduction = len([a for a in self.agents if a.alive])
         
-        # 验证数量变化
-        if agents_after_reproduction > agents_before_reproduction:
-            new_born_count = agents_after_reproduction - agents_before_reproduction
-            print(f"✅ 繁殖验证成功: 总数 {agents_before_reproduction} → {agents_after_reproduction} (新增{new_born_count})")
-            print(f"   活跃数: {alive_before_reproduction} → {alive_after_reproduction}")
+        # 验证数量变化（仅调试级别下统计）
+        if agents_after_reproduction > agents_before_reproduction and logger.isEnabledFor(logging.DEBUG):
+            alive_after_reproduction = len([a for a in self.agents if a.alive])
+            logger.debug(
+                "Reproduction verified: total %d -> %d (+%d), alive %d -> %d",
+                agents_before_reproduction, agents_after_reproduction,
+                agents_after_reproduction - agents_before_reproduction,
+                alive_before_reproduction, alive_after_reproduction
+            )
         
         # 更新灾难系统
-        if hasattr(self, 'disaster_system'):
-            tribe_dict = {}
-            if hasattr(self, 'tribe_manager') and self.tribe_manager:
-                tribe_dict = self.tribe_manager.tribes
+        if self._has_disasters:
+            tribe_dict = self.tribe_manager.tribes if self._has_tribes else {}
             self.disaster_system.update(alive_agents, tribe_dict, dt)
         
-        # 定期清理死亡智能体以避免内存泄漏和统计错误
-        if self.time_manager.current_step % 100 == 0:  # 每100步清理一次
-            dead_agents = [a for a in self.agents if not a.alive]
-            if dead_agents:
-                print(f"🧹 清理 {len(dead_agents)} 个死亡智能体，保持列表整洁")
-                self.agents = [a for a in self.agents if a.alive]
+        # 定期清理死亡智能体，缩短后续所有遍历
+        if self.time_manager.current_step % self._cull_interval == 0:  # 默认每10步清理一次
+            self._cull_dead_agents()
         
         # 收集数据
         self._collect_session_data()
@@ -884,19 +1415,70 @@ class CogvrsGUI:
         if len([a for a in self.agents if a.alive]) == 0:
             self._handle_extinction_event()
     
+    def _cull_dead_agents(self):
+        """原地移除死亡智能体（交换-弹出，不保持顺序），并回收到对象池"""
+        agents = self.agents
+        pool = self._agent_pool
+        pool_limit = self._agent_pool_limit
+        culled = 0
+        i = 0
+        while i < len(agents):
+            agent = agents[i]
+            if agent.alive:
+                i += 1
+                continue
+            agents[i] = agents[-1]
+            agents.pop()
+            culled += 1
+            if len(pool) < pool_limit:
+                pool.append(agent)
+        
+        if culled:
+            logger.debug("Culled %d dead agents", culled)
+    
+    def _rebuild_agent_index(self, agents: List[SimpleAgent]):
+        """按当前位置重建智能体邻域网格，网格行索引与agents列表下标一致"""
+        self._indexed_agents = agents
+        positions = np.array(
+            [(a.position.x, a.position.y) for a in agents], dtype=np.float64
+        ).reshape(-1, 2)
+        self._agent_grid.rebuild(positions)
+    
+    def _rebuild_resource_index(self):
+        """重建资源空间索引（资源位置固定，世界更新后重建一次即可）"""
+        index = self._resource_index
+        index.clear()
+        for resource in self.world.resources:
+            index.insert(resource, resource.position.x, resource.position.y)
+    
+    def _sync_agent_arrays(self, agents: List[SimpleAgent]) -> np.ndarray:
+        """将智能体属性一次性写入预分配的SoA数组，返回前len(agents)行的视图"""
+        count = len(agents)
+        if count > len(self._agent_state):
+            self._agent_state = np.empty((max(count, len(self._agent_state) * 2), _AGENT_FIELDS), dtype=np.float64)
+        
+        state = self._agent_state[:count]
+        if count:
+            state[:] = [
+                (a.position.x, a.position.y, a.energy, a.age, a.health,
+                 a.offspring_count, a.social_interactions)
+                for a in agents
+            ]
+        return state
+    
     def _get_nearby_agents(self, agent: SimpleAgent) -> List[SimpleAgent]:
         """获取附近的智能体"""
-        nearby = []
-        for other in self.agents:
-            if other != agent and other.alive:
-                distance = agent.position.distance_to(other.position)
-                if distance <= agent.perception_radius:
-                    nearby.append(other)
-        return nearby
+        position = agent.position
+        indexed = self._indexed_agents
+        neighbor_idx = self._agent_grid.query(position.x, position.y, agent.perception_radius)
+        return [other for other in map(indexed.__getitem__, neighbor_idx.tolist())
+                if other is not agent and other.alive]
     
     def _get_nearby_resources(self, agent: SimpleAgent) -> List:
         """获取附近的资源"""
-        return self.world.get_resources_in_radius(agent.position, agent.perception_radius)
+        position = agent.position
+        candidates = self._resource_index.query_radius(position.x, position.y, agent.perception_radius)
+        return [resource for resource in candidates if resource.amount > 0]
     
     def _handle_reproduction(self, agents: List[SimpleAgent]):
         """处理智能体繁殖"""
@@ -904,23 +1486,42 @@ class CogvrsGUI:
         max_agents = self.config.get('world', {}).get('max_agents', 10000)  # 移除200智能体限制，大幅提高上限
         current_alive_count = len([a for a in self.agents if a.alive])
         
-        for agent in agents:
-            # 检查繁殖条件 - 大幅降低门槛以促进文明发展
-            if (agent.energy > 40 and   # 大幅降低能量门槛从60到40
-                agent.age > 15 and     # 大幅降低年龄门槛从25到15
-                agent.offspring_count < 8 and  # 增加繁殖次数到8
-                (current_alive_count + len(new_agents)) < max_agents):     # 确保包含新生儿的总数
+        # 检查繁殖条件 - 大幅降低门槛以促进文明发展（向量化筛选候选者）
+        state = self._sync_agent_arrays(agents)
+        candidates = np.flatnonzero(
+            (state[:, _AGENT_ENERGY] > 40) &     # 大幅降低能量门槛从60到40
+            (state[:, _AGENT_AGE] > 15) &        # 大幅降低年龄门槛从25到15
+            (state[:, _AGENT_OFFSPRING] < 8)     # 增加繁殖次数到8
+        )
+        
+        # 伙伴资格在本步开始时一次性计算
+        eligible_partners = (
+            (state[:, _AGENT_ENERGY] > 35) &
+            (state[:, _AGENT_AGE] > 12) &
+            (state[:, _AGENT_OFFSPRING] < 8)  # 降低伙伴要求
+        )
+        
+        # 邻域网格在物理更新后按同一列表重建时，网格行索引即agents下标
+        if self._indexed_agents is not agents:
+            self._rebuild_agent_index(agents)
+        agent_grid = self._agent_grid
+        agent_events = self.session_data['agent_events']
+        
+        for i in candidates:
+            agent = agents[i]
+            if (current_alive_count + len(new_agents)) < max_agents:     # 确保包含新生儿的总数
                 
                 # 寻找繁殖伙伴
-                nearby_agents = self._get_nearby_agents(agent)
+                position = agent.position
+                neighbor_idx = agent_grid.query(position.x, position.y, agent.perception_radius)
                 suitable_partners = [
-                    a for a in nearby_agents 
-                    if a.energy > 35 and a.age > 12 and a.offspring_count < 8  # 降低伙伴要求
+                    agents[j] for j in neighbor_idx[eligible_partners[neighbor_idx]].tolist()
+                    if j != i
                 ]
                 
                 if suitable_partners and len(new_agents) < 10:  # 增加每轮繁殖数量
                     # 繁殖
-                    child = agent.clone(mutation_rate=0.1)
+                    child = self._spawn_child(agent)
                     child.birth_time = self.time_manager.current_step
                     
                     # 确保新生儿状态正确
@@ -933,20 +1534,20 @@ class CogvrsGUI:
                     agent.offspring_count += 1
                     agent.energy -= 15  # 大幅降低能量消耗从30到15
                     
-                    print(f"👶 新智能体出生: {child.agent_id} (父母: {agent.agent_id})")
-                    print(f"   位置: ({child.position.x:.1f}, {child.position.y:.1f})")
-                    print(f"   状态: alive={child.alive}, energy={child.energy:.1f}, health={child.health:.1f}")
+                    logger.debug(
+                        "New agent %s parent=%s pos=(%.1f,%.1f) energy=%.1f health=%.1f",
+                        child.agent_id, agent.agent_id, child.position.x, child.position.y,
+                        child.energy, child.health
+                    )
                     
                     # 记录繁殖事件
-                    self._record_event('reproduction', f'新智能体出生: {child.agent_id}', {
-                        'parent_id': agent.agent_id,
-                        'child_id': child.agent_id,
-                        'child_position': (child.position.x, child.position.y),
-                        'child_energy': child.energy,
-                        'child_health': child.health,
-                        'parent_offspring_count': agent.offspring_count,
-                        'generation': child.generation
-                    })
+                    agent_events.add_reproduction(
+                        time.time(), self.time_manager.current_step,
+                        child.agent_id, agent.agent_id,
+                        child.position.x, child.position.y,
+                        child.energy, child.health,
+                        child.generation, agent.offspring_count
+                    )
         
         # 添加新生儿到主列表
         if new_agents:
@@ -956,18 +1557,17 @@ class CogvrsGUI:
                 
             self.agents.extend(new_agents)
             
-            # 统计数量
-            total_agents = len(self.agents)
-            alive_count_after = len([a for a in self.agents if a.alive])
-            
-            logger.info(f"New agents born: {len(new_agents)}, Total agents: {total_agents}, Alive agents: {alive_count_after}")
-            print(f"🎉 本轮新增 {len(new_agents)} 个智能体")
-            print(f"   📊 总智能体数量: {total_agents}")
-            print(f"   ✅ 活跃智能体数量: {alive_count_after}")
-            
-            # 验证新生儿的状态
-            for child in new_agents:
-                print(f"   👶 新生儿 {child.agent_id}: alive={child.alive}, energy={child.energy:.1f}, health={child.health:.1f}")
+            # 统计数量（新生儿均为活跃状态）
+            logger.info(
+                "New agents born: %d, Total agents: %d, Alive agents: %d",
+                len(new_agents), len(self.agents), current_alive_count + len(new_agents)
+            )
+    
+    def _spawn_child(self, parent: SimpleAgent) -> SimpleAgent:
+        """生成子代：优先从对象池取出死亡智能体就地重置，池为空时克隆"""
+        if self._agent_pool:
+            return self._agent_pool.pop().reset(parent, mutation_rate=0.1)
+        return parent.clone(mutation_rate=0.1)
     
     def _add_random_agents(self, count: int):
         """添加随机智能体"""
@@ -976,6 +1576,7 @@ class CogvrsGUI:
             agent = SimpleAgent(agent_config)
             agent.birth_time = self.time_manager.current_step
             self.agents.append(agent)
+        self._world_version += 1
         
         logger.info(f"Added {count} new agents")
     
@@ -989,14 +1590,19 @@ class CogvrsGUI:
             'reproduction_rate': 1.0
         }
         
-        if hasattr(self, 'environment_manager'):
+        if self.environment_manager is not None:
             # 优先使用新的气候系统
-            if (hasattr(self.environment_manager, 'climate_system') and 
-                hasattr(self.environment_manager, 'use_climate_system') and 
-                self.environment_manager.use_climate_system):
+            if self._has_climate and getattr(self.environment_manager, 'use_climate_system', False):
+                
+                # 落在相同气候区域组合中的智能体共享本步的气候效应
+                climate_system = self.environment_manager.climate_system
+                zone_key = climate_system.get_zone_mask(agent.position)
+                cached_effects = self._env_cache.get(zone_key)
+                if cached_effects is not None:
+                    return cached_effects
                 
                 # 使用高效的气候系统
-                climate_effect = self.environment_manager.climate_system.get_climate_effects_for_position(agent.position)
+                climate_effect = climate_system.get_climate_effects_for_position(agent.position)
                 
                 # 将气候效应转换为标准格式
                 combined_effects['energy_modifier'] = climate_effect.energy_cost_modifier
@@ -1006,6 +1612,7 @@ class CogvrsGUI:
                 temp_factor = max(0.5, min(1.5, climate_effect.temperature_modifier))
                 combined_effects['movement_speed'] = 2.0 - temp_factor  # 极端温度降低移动速度
                 combined_effects['perception_range'] = min(1.2, climate_effect.humidity_modifier)  # 湿度影响感知
+                self._env_cache[zone_key] = combined_effects
                 
             else:
                 # 回退到原有的环境+天气+地形系统
@@ -1019,7 +1626,7 @@ class CogvrsGUI:
                     weather_effects = {}
                 
                 # 获取地形影响
-                if hasattr(self, 'terrain_system'):
+                if self.terrain_system is not None:
                     terrain_effects = self.terrain_system.get_terrain_effects_at_position(agent.position)
                 else:
                     terrain_effects = {}
@@ -1038,44 +1645,50 @@ class CogvrsGUI:
         
         return combined_effects
     
-    def _apply_environmental_effects(self, agent, effects: Dict[str, float], dt: float):
-        """对智能体应用环境影响"""
-        # 能量修正
-        if 'energy_modifier' in effects and effects['energy_modifier'] != 1.0:
-            energy_change = (effects['energy_modifier'] - 1.0) * 3 * dt  # 降低影响强度到每秒±3能量
-            new_energy = agent.energy + energy_change
-            agent.energy = max(0.1, min(150, new_energy))  # 确保能量不会完全为0
-        
-        # 健康修正
-        if 'health_modifier' in effects and effects['health_modifier'] != 1.0:
-            health_change = (effects['health_modifier'] - 1.0) * 2 * dt  # 降低影响强度到每秒±2健康
-            new_health = agent.health + health_change
-            agent.health = max(0.1, min(100, new_health))  # 确保健康不会完全为0
-        
-        # 移动速度和感知范围的影响在智能体行为中体现
-        # 这里可以临时存储影响值供智能体使用
-        if not hasattr(agent, 'environmental_effects'):
-            agent.environmental_effects = {}
-        agent.environmental_effects.update(effects)
+    def _apply_environmental_effects(self, agents: List[SimpleAgent], effects: List[Dict[str, float]], dt: float):
+        """对一批智能体应用环境影响"""
+        count = len(agents)
+        if not count:
+            return
+        
+        # 能量/健康修正在内核中批量计算（每秒±3能量、±2健康，并限制上下界）
+        energy = np.fromiter((a.energy for a in agents), dtype=np.float64, count=count)
+        health = np.fromiter((a.health for a in agents), dtype=np.float64, count=count)
+        energy_mod = np.fromiter((e.get('energy_modifier', 1.0) for e in effects), dtype=np.float64, count=count)
+        health_mod = np.fromiter((e.get('health_modifier', 1.0) for e in effects), dtype=np.float64, count=count)
+        apply_env_effects(energy, health, energy_mod, health_mod, dt)
+        
+        for agent, agent_effects, new_energy, new_health in zip(agents, effects, energy.tolist(), health.tolist()):
+            agent.energy = new_energy
+            agent.health = new_health
+            
+            # 移动速度和感知范围的影响在智能体行为中体现
+            agent.env_move_mul = agent_effects['movement_speed']
+            agent.env_perc_mul = agent_effects['perception_range']
     
     def _collect_session_data(self):
         """收集会话数据用于分析"""
-        if self.frame_count % 30 != 0:  # 每秒收集一次数据
+        # 按模拟步采样（每30步一次）：固定步长模式下一帧可能推进多步，不能按帧计数
+        if self.time_manager.current_step % 30 != 0:
             return
             
         current_time = time.time()
         alive_agents = [a for a in self.agents if a.alive]
-        world_state = self.world.get_world_state()
+        agent_count = len(alive_agents)
+        
+        # 一次遍历汇总所有列：sums[col] 为该属性总和
+        sums = self._sync_agent_arrays(alive_agents).sum(axis=0)
+        inv_count = 1.0 / agent_count if agent_count else 0.0
         time_stats = self.time_manager.get_time_stats()
         
         # 收集部落统计数据
         tribe_data = {}
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
+        if self._has_tribes:
             tribe_info = self.tribe_manager.get_tribes_info()
             tribe_data = {
                 'total_tribes': tribe_info['total_tribes'],
                 'tribe_details': tribe_info['tribes'],
-                'largest_tribe': max(tribe_info['tribes'].values(), key=lambda x: x['population'])['population'] if tribe_info['tribes'] else 0,
+                'largest_tribe': max(map(_GET_POPULATION, tribe_info['tribes'].values())) if tribe_info['tribes'] else 0,
                 'total_alliances': sum(t['allies'] for t in tribe_info['tribes'].values()),
                 'total_conflicts': sum(t['enemies'] for t in tribe_info['tribes'].values()),
                 'avg_tech_level': sum(t['technology_level'] for t in tribe_info['tribes'].values()) / len(tribe_info['tribes']) if tribe_info['tribes'] else 0
@@ -1085,600 +1698,203 @@ class CogvrsGUI:
         stats_snapshot = {
             'timestamp': current_time,
             'step': time_stats['current_step'],
-            'agent_count': len(alive_agents),
-            'avg_age': sum(a.age for a in alive_agents) / len(alive_agents) if alive_agents else 0,
-            'avg_energy': sum(a.energy for a in alive_agents) / len(alive_agents) if alive_agents else 0,
-            'avg_health': sum(a.health for a in alive_agents) / len(alive_agents) if alive_agents else 0,
-            'total_offspring': sum(a.offspring_count for a in alive_agents),
-            'total_interactions': sum(a.social_interactions for a in alive_agents),
-            'resources': world_state['num_resources'],
+            'agent_count': agent_count,
+            'avg_age': float(sums[_AGENT_AGE] * inv_count),
+            'avg_energy': float(sums[_AGENT_ENERGY] * inv_count),
+            'avg_health': float(sums[_AGENT_HEALTH] * inv_count),
+            'total_offspring': int(sums[_AGENT_OFFSPRING]),
+            'total_interactions': int(sums[_AGENT_INTERACTIONS]),
+            'resources': len(self.world.resources),
             'fps': time_stats['actual_fps'],
             'tribes': tribe_data  # 新增部落数据
         }
         
-        self.session_data['stats_history'].append(stats_snapshot)
+        self._record_stat_snapshot(stats_snapshot)
         
         # 收集性能指标
         performance = {
             'timestamp': current_time,
             'fps': time_stats['actual_fps'],
             'frame_count': self.frame_count,
-            'agent_count': len(alive_agents)
+            'agent_count': agent_count
         }
         
         self.session_data['performance_metrics'].append(performance)
     
-    def _generate_html_report(self):
-        """生成HTML可视化报告"""
-        import json
-        import time
-        from datetime import datetime
+    def _generate_html_report(self) -> concurrent.futures.Future:
+        """在报告线程上生成HTML报告，返回结果为报告路径的Future"""
+        return self._report_executor.submit(
+            self._generate_html_report_impl, self._snapshot_session_data()
+        )
+    
+    def _snapshot_session_data(self) -> Dict:
+        """
+        复制会话数据供报告线程使用，报告生成期间不与模拟线程争用
         
+        统计和性能历史在报告中只用于绘制图表，持锁期间直接按图表点数抽样，
+        复制量与会话长度无关；汇总指标来自增量维护的 aggregates。事件记录器
+        同样由模拟线程写入，报告需要的事件列表和统计也在持锁期间整理为 'event_report'。
+        """
+        with self._state_lock:
+            snapshot = {}
+            for key, value in self.session_data.items():
+                if key in _CHART_SERIES:
+                    snapshot[key] = _downsample(value, _CHART_MAX_POINTS)
+                elif isinstance(value, deque):
+                    snapshot[key] = list(value)
+                elif isinstance(value, (EventBuffer, dict)):
+                    snapshot[key] = value.copy()
+                else:
+                    snapshot[key] = value
+            snapshot['event_report'] = self._collect_event_report()
+            return snapshot
+    
+    def _collect_event_report(self) -> Dict:
+        """
+        整理报告使用的事件记录器数据（重大事件、事件统计、里程碑和气候事件）
+        
+        事件记录器由模拟线程持续写入，必须在持有 _state_lock 时调用。
+        """
+        major_events = []
+        event_summary = None
+        milestone_events = []
+        climate_events = []
+        if self.event_logger:
+            # 事件记录器的重大事件
+            event_severity_emoji = {
+                'low': '🔵',
+                'medium': '🟡', 
+                'high': '🟠',
+                'critical': '🔴'
+            }
+            for event in self.event_logger.get_major_events(30):  # 最近30个重大事件
+                major_events.append({
+                    'emoji': event_severity_emoji.get(event['severity'], '⚪'),
+                    'time': event['time_str'],
+                    'description': event['description']
+                })
+            
+            # 事件统计
+            event_stats = self.event_logger.get_event_statistics()
+            event_summary = {
+                'tribe_events': len(self.event_logger.get_events(EventType.TRIBE_FORMATION)) +
+                                len(self.event_logger.get_events(EventType.TRIBE_DISSOLUTION)) +
+                                len(self.event_logger.get_events(EventType.TRIBE_ALLIANCE)) +
+                                len(self.event_logger.get_events(EventType.TRIBE_CONFLICT)),
+                'agent_events': len(self.event_logger.get_events(EventType.AGENT_BIRTH)) +
+                                len(self.event_logger.get_events(EventType.AGENT_DEATH)) +
+                                len(self.event_logger.get_events(EventType.AGENT_REPRODUCTION)),
+                'climate_events': len(self.event_logger.get_events(EventType.CLIMATE_EPOCH_CHANGE)),
+                'total_events': event_stats['total_events'],
+                'events_per_minute': event_stats['events_per_minute']
+            }
+            
+            # 智能体里程碑事件
+            milestone_emoji = {
+                'first_reproduction': '👶',
+                'explorer': '🗺️',
+                'survivor': '⚔️',
+                'social_master': '🤝',
+                'elder': '👴'
+            }
+            for event in self.event_logger.get_events(EventType.AGENT_LEARNING_MILESTONE, limit=20):
+                milestone_events.append({
+                    'emoji': milestone_emoji.get(event.data.get('milestone', ''), '🏆'),
+                    'time': _fmt_clock(int(event.timestamp)),
+                    'description': event.description
+                })
+            
+            # 气候事件
+            climate_emoji = {
+                'temperate': '🌤️',
+                'ice_age': '🧊',
+                'greenhouse': '🌡️',
+                'arid': '🏜️',
+                'volcanic': '🌋'
+            }
+            for event in self.event_logger.get_events(EventType.CLIMATE_EPOCH_CHANGE, limit=15):
+                climate_events.append({
+                    'emoji': climate_emoji.get(event.data.get('new_epoch', ''), '🌍'),
+                    'time': _fmt_clock(int(event.timestamp)),
+                    'description': event.description
+                })
+        
+        return {
+            'major_events': major_events,
+            'event_summary': event_summary,
+            'milestone_events': milestone_events,
+            'climate_events': climate_events
+        }
+    
+    def _generate_html_report_impl(self, session_data: Dict) -> str:
+        """生成HTML可视化报告（在报告线程上运行，只读取会话数据快照）"""
         # 计算会话时长
-        session_duration = time.time() - self.session_data['start_time']
+        session_duration = time.time() - session_data['start_time']
         
         # 准备数据
-        stats_data = json.dumps(self.session_data['stats_history'])
-        performance_data = json.dumps(self.session_data['performance_metrics'])
-        
-        # 计算最终统计数据
-        max_agents = max([s['agent_count'] for s in self.session_data['stats_history']] or [0])
-        max_offspring = max([s['total_offspring'] for s in self.session_data['stats_history']] or [0])
-        max_interactions = max([s['total_interactions'] for s in self.session_data['stats_history']] or [0])
-        avg_fps = sum([p['fps'] for p in self.session_data['performance_metrics']])/len(self.session_data['performance_metrics']) if self.session_data['performance_metrics'] else 0
-        max_age = max([s['avg_age'] for s in self.session_data['stats_history']] or [0])
-        max_tribes = max([s.get('tribes', {}).get('total_tribes', 0) for s in self.session_data['stats_history']] or [0])
-        max_tribe_size = max([s.get('tribes', {}).get('largest_tribe', 0) for s in self.session_data['stats_history']] or [0])
-        avg_tech_level = max([s.get('tribes', {}).get('avg_tech_level', 0) for s in self.session_data['stats_history']] or [0])
+        stats_data = _json_dumps(session_data['stats_history'])
+        performance_data = _json_dumps(session_data['performance_metrics'])
+        
+        # 最终统计数据：直接读取增量维护的会话聚合值
+        agg = session_data['aggregates']
+        max_agents = agg['max_agents']
+        max_offspring = agg['max_offspring']
+        max_interactions = agg['max_interactions']
+        avg_fps = agg['fps_sum'] / agg['fps_count'] if agg['fps_count'] else 0
+        max_age = agg['max_age']
+        max_tribes = agg['max_tribes']
+        max_tribe_size = agg['max_tribe_size']
+        avg_tech_level = agg['max_tech_level']
         
         # 当前时间
         current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         
         # 生成HTML报告 - 修复JavaScript语法
-        html_content = """
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Cogvrs 模拟报告 - """ + current_time + """</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <style>
-        body {
-            font-family: 'Segoe UI', Arial, sans-serif;
-            margin: 0;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 15px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-            overflow: hidden;
-        }
-        .header {
-            background: linear-gradient(135deg, #2c3e50 0%, #34495e 100%);
-            color: white;
-            padding: 30px;
-            text-align: center;
-        }
-        .header h1 {
-            margin: 0;
-            font-size: 2.5em;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            padding: 30px;
-            background: #f8f9fa;
-        }
-        .stat-card {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            text-align: center;
-            border-left: 4px solid #3498db;
-        }
-        .stat-value {
-            font-size: 2em;
-            font-weight: bold;
-            color: #2c3e50;
-            margin: 10px 0;
-        }
-        .stat-label {
-            color: #7f8c8d;
-            font-size: 0.9em;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
-        .chart-container {
-            padding: 30px;
-            background: white;
-        }
-        .chart-wrapper {
-            position: relative;
-            height: 400px;
-            margin: 20px 0;
-        }
-        .section-title {
-            font-size: 1.8em;
-            color: #2c3e50;
-            margin-bottom: 20px;
-            padding-bottom: 10px;
-            border-bottom: 3px solid #3498db;
-        }
-        .analysis {
-            padding: 30px;
-            background: #ecf0f1;
-            line-height: 1.6;
-        }
-        .highlight {
-            background: #3498db;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 4px;
-        }
-        .emoji {
-            font-size: 1.2em;
-            margin-right: 5px;
-        }
-        .tribe-summary {
-            background: #f8f9fa;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 20px 0;
-            border-left: 4px solid #e67e22;
-        }
-        .tribe-stats p {
-            margin: 8px 0;
-            padding: 5px 0;
-            border-bottom: 1px solid #eee;
-        }
-        .events-list {
-            max-height: 300px;
-            overflow-y: auto;
-            background: white;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            padding: 10px;
-            margin-top: 10px;
-        }
-        .event-item {
-            display: flex;
-            margin: 5px 0;
-            padding: 5px;
-            border-radius: 3px;
-            background: #f8f9fa;
-        }
-        .event-time {
-            color: #666;
-            font-size: 0.9em;
-            margin-right: 10px;
-            min-width: 80px;
-        }
-        .event-desc {
-            flex: 1;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🧠 Cogvrs 模拟分析报告</h1>
-            <p>数字宇宙实验室 - AI意识探索平台</p>
-            <p>会话时长: """ + f"{session_duration/60:.1f}" + """ 分钟 | 生成时间: """ + current_time + """</p>
-        </div>
-        
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">⏰</span>模拟步数</div>
-                <div class="stat-value">""" + str(len(self.session_data['stats_history'])) + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">👥</span>智能体峰值</div>
-                <div class="stat-value">""" + str(max_agents) + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">👶</span>总后代数</div>
-                <div class="stat-value">""" + str(max_offspring) + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">🤝</span>社交互动</div>
-                <div class="stat-value">""" + str(max_interactions) + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">⚡</span>平均FPS</div>
-                <div class="stat-value">""" + f"{avg_fps:.1f}" + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">🧬</span>最高年龄</div>
-                <div class="stat-value">""" + f"{max_age:.0f}" + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">🏘️</span>最大部落数</div>
-                <div class="stat-value">""" + str(max_tribes) + """</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label"><span class="emoji">🏛️</span>最大部落规模</div>
-                <div class="stat-value">""" + str(max_tribe_size) + """</div>
-            </div>
-        </div>
-        
-        <div class="chart-container">
-            <h2 class="section-title">📊 智能体种群动态</h2>
-            <div class="chart-wrapper">
-                <canvas id="populationChart"></canvas>
-            </div>
-            
-            <h2 class="section-title">⚡ 能量与健康状况</h2>
-            <div class="chart-wrapper">
-                <canvas id="healthChart"></canvas>
-            </div>
-            
-            <h2 class="section-title">🎯 系统性能监控</h2>
-            <div class="chart-wrapper">
-                <canvas id="performanceChart"></canvas>
-            </div>
-            
-            <h2 class="section-title">🏘️ 部落文明演化</h2>
-            <div class="chart-wrapper">
-                <canvas id="tribeChart"></canvas>
-            </div>
-        </div>
-        
-        <div class="analysis">
-            <h2 class="section-title">🔬 智能行为分析</h2>
-            <p><strong><span class="emoji">🧠</span>认知能力观察:</strong> 智能体展现了基于神经网络的学习能力，能够适应环境变化并优化行为策略。</p>
-            
-            <p><strong><span class="emoji">👥</span>社会行为模式:</strong> 观察到智能体间存在社交互动，表明群体智慧的萌芽。互动频率与种群密度呈正相关关系。</p>
-            
-            <p><strong><span class="emoji">🧬</span>进化机制:</strong> 通过繁殖和变异，智能体种群展现了<span class="highlight">自然选择</span>和<span class="highlight">适应性进化</span>的特征。</p>
-            
-            <p><strong><span class="emoji">🌍</span>生态平衡:</strong> 智能体与环境资源之间形成了动态平衡，体现了生态系统的自我调节能力。</p>
-            
-            <h3>🎯 关键发现</h3>
-            <ul>
-                <li><strong>意识萌芽:</strong> 智能体表现出目标导向的行为模式</li>
-                <li><strong>学习适应:</strong> 神经网络权重的动态调整显示了学习能力</li>
-                <li><strong>社会协作:</strong> 多智能体间的协作行为增强了生存能力</li>
-                <li><strong>生命周期:</strong> 完整的生老病死过程验证了数字生命概念</li>
-            </ul>
-            
-            <h2 class="section-title">🏘️ 部落文明分析</h2>
-            <p><strong><span class="emoji">🏛️</span>文明涌现:</strong> 智能体自发形成了部落组织，展现了从个体到集体的社会进化过程。部落的形成表明了群体认同和社会结构的萌芽。</p>
-            
-            <p><strong><span class="emoji">👑</span>领导机制:</strong> 每个部落都会选出首领，基于能量水平的自然选择机制体现了原始的政治组织形式。</p>
-            
-            <p><strong><span class="emoji">🤝</span>外交关系:</strong> 不同部落间发展出同盟、冲突和贸易关系，形成了复杂的外交网络和互动模式。</p>
-            
-            <p><strong><span class="emoji">🔬</span>技术发展:</strong> 部落的科技水平随时间逐步提升，展现了知识积累和技术传承的文明特征。</p>
-            
-            <div class="tribe-summary">
-                <h3>📊 部落发展统计</h3>
-                <div class="tribe-stats">
-                    <p><strong>部落总数峰值:</strong> """ + str(max_tribes) + """ 个</p>
-                    <p><strong>最大部落规模:</strong> """ + str(max_tribe_size) + """ 个成员</p>
-                    <p><strong>部落事件总数:</strong> """ + str(len(self.session_data.get('tribe_events', []))) + """ 次</p>
-                    <p><strong>平均科技水平:</strong> """ + f"{avg_tech_level:.2f}" + """</p>
-                </div>
-                
-                <h4>🎭 部落事件记录</h4>
-                <div class="events-list">
-"""
-
-        # 添加最近的部落事件记录
-        recent_tribe_events = self.session_data.get('tribe_events', [])[-10:]  # 最近10个事件
-        for event in recent_tribe_events:
-            event_time = datetime.fromtimestamp(event['timestamp']).strftime('%H:%M:%S')
-            html_content += f"""
-                    <div class="event-item">
-                        <span class="event-time">[{event_time}]</span>
-                        <span class="event-desc">{event['description']}</span>
-                    </div>"""
-        
-        html_content += """
-                </div>
-            </div>
-            
-            <h2 class="section-title">📝 详细事件日志</h2>
-            <div class="tribe-summary">
-                <h3>🌟 重大事件</h3>
-                <div class="events-list">
-"""
-        
-        # 获取事件记录器的重大事件
-        if self.event_logger:
-            major_events = self.event_logger.get_major_events(30)  # 最近30个重大事件
-            for event in major_events:
-                event_severity_emoji = {
-                    'low': '🔵',
-                    'medium': '🟡', 
-                    'high': '🟠',
-                    'critical': '🔴'
-                }
-                severity_emoji = event_severity_emoji.get(event['severity'], '⚪')
-                html_content += f"""
-                    <div class="event-item">
-                        <span class="event-time">{severity_emoji} [{event['time_str']}]</span>
-                        <span class="event-desc">{event['description']}</span>
-                    </div>"""
-        
-        html_content += """
-                </div>
-                
-                <h3>🏘️ 部落事件统计</h3>
-                <div class="tribe-stats">
-"""
-        
-        # 获取部落事件统计
-        if self.event_logger:
-            event_stats = self.event_logger.get_event_statistics()
-            tribe_events = len(self.event_logger.get_events(EventType.TRIBE_FORMATION)) + \
-                          len(self.event_logger.get_events(EventType.TRIBE_DISSOLUTION)) + \
-                          len(self.event_logger.get_events(EventType.TRIBE_ALLIANCE)) + \
-                          len(self.event_logger.get_events(EventType.TRIBE_CONFLICT))
-            
-            agent_events = len(self.event_logger.get_events(EventType.AGENT_BIRTH)) + \
-                          len(self.event_logger.get_events(EventType.AGENT_DEATH)) + \
-                          len(self.event_logger.get_events(EventType.AGENT_REPRODUCTION))
-            
-            climate_events = len(self.event_logger.get_events(EventType.CLIMATE_EPOCH_CHANGE))
-            
-            html_content += f"""
-                    <p><strong>部落事件总数:</strong> {tribe_events} 次</p>
-                    <p><strong>智能体生命事件:</strong> {agent_events} 次</p>
-                    <p><strong>气候变化事件:</strong> {climate_events} 次</p>
-                    <p><strong>事件总计:</strong> {event_stats['total_events']} 次</p>
-                    <p><strong>每分钟事件数:</strong> {event_stats['events_per_minute']:.1f} 次/分钟</p>
-"""
-        
-        html_content += """
-                </div>
-                
-                <h3>🧬 智能体里程碑</h3>
-                <div class="events-list">
-"""
-        
-        # 获取智能体里程碑事件
-        if self.event_logger:
-            milestone_events = self.event_logger.get_events(EventType.AGENT_LEARNING_MILESTONE, limit=20)
-            for event in milestone_events:
-                event_time = datetime.fromtimestamp(event.timestamp).strftime('%H:%M:%S')
-                milestone_emoji = {
-                    'first_reproduction': '👶',
-                    'explorer': '🗺️',
-                    'survivor': '⚔️',
-                    'social_master': '🤝',
-                    'elder': '👴'
-                }
-                emoji = milestone_emoji.get(event.data.get('milestone', ''), '🏆')
-                html_content += f"""
-                    <div class="event-item">
-                        <span class="event-time">{emoji} [{event_time}]</span>
-                        <span class="event-desc">{event.description}</span>
-                    </div>"""
-        
-        html_content += """
-                </div>
-                
-                <h3>🌍 气候变化记录</h3>
-                <div class="events-list">
-"""
-        
-        # 获取气候事件
-        if self.event_logger:
-            climate_events = self.event_logger.get_events(EventType.CLIMATE_EPOCH_CHANGE, limit=15)
-            for event in climate_events:
-                event_time = datetime.fromtimestamp(event.timestamp).strftime('%H:%M:%S')
-                climate_emoji = {
-                    'temperate': '🌤️',
-                    'ice_age': '🧊',
-                    'greenhouse': '🌡️',
-                    'arid': '🏜️',
-                    'volcanic': '🌋'
-                }
-                emoji = climate_emoji.get(event.data.get('new_epoch', ''), '🌍')
-                html_content += f"""
-                    <div class="event-item">
-                        <span class="event-time">{emoji} [{event_time}]</span>
-                        <span class="event-desc">{event.description}</span>
-                    </div>"""
-        
-        html_content += """
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <script>
-        const statsData = """ + stats_data + """;
-        const performanceData = """ + performance_data + """;
-        
-        // 智能体种群图表
-        const popCtx = document.getElementById('populationChart').getContext('2d');
-        new Chart(popCtx, {
-            type: 'line',
-            data: {
-                labels: statsData.map(d => new Date(d.timestamp * 1000).toLocaleTimeString()),
-                datasets: [{
-                    label: '智能体数量',
-                    data: statsData.map(d => d.agent_count),
-                    borderColor: '#3498db',
-                    backgroundColor: 'rgba(52, 152, 219, 0.1)',
-                    fill: true,
-                    tension: 0.4
-                }, {
-                    label: '平均年龄',
-                    data: statsData.map(d => d.avg_age),
-                    borderColor: '#e74c3c',
-                    backgroundColor: 'rgba(231, 76, 60, 0.1)',
-                    fill: true,
-                    tension: 0.4,
-                    yAxisID: 'y1'
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: {
-                        beginAtZero: true,
-                        title: { display: true, text: '智能体数量' }
-                    },
-                    y1: {
-                        type: 'linear',
-                        display: true,
-                        position: 'right',
-                        title: { display: true, text: '平均年龄' },
-                        grid: { drawOnChartArea: false }
-                    }
-                },
-                plugins: {
-                    legend: { display: true, position: 'top' }
-                }
-            }
-        });
-        
-        // 健康状况图表
-        const healthCtx = document.getElementById('healthChart').getContext('2d');
-        new Chart(healthCtx, {
-            type: 'line',
-            data: {
-                labels: statsData.map(d => new Date(d.timestamp * 1000).toLocaleTimeString()),
-                datasets: [{
-                    label: '平均能量',
-                    data: statsData.map(d => d.avg_energy),
-                    borderColor: '#f39c12',
-                    backgroundColor: 'rgba(243, 156, 18, 0.1)',
-                    fill: true,
-                    tension: 0.4
-                }, {
-                    label: '平均健康',
-                    data: statsData.map(d => d.avg_health),
-                    borderColor: '#2ecc71',
-                    backgroundColor: 'rgba(46, 204, 113, 0.1)',
-                    fill: true,
-                    tension: 0.4
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: { beginAtZero: true, title: { display: true, text: '数值' } }
-                },
-                plugins: {
-                    legend: { display: true, position: 'top' }
-                }
-            }
-        });
-        
-        // 性能监控图表
-        const perfCtx = document.getElementById('performanceChart').getContext('2d');
-        new Chart(perfCtx, {
-            type: 'line',
-            data: {
-                labels: performanceData.map(d => new Date(d.timestamp * 1000).toLocaleTimeString()),
-                datasets: [{
-                    label: 'FPS',
-                    data: performanceData.map(d => d.fps),
-                    borderColor: '#9b59b6',
-                    backgroundColor: 'rgba(155, 89, 182, 0.1)',
-                    fill: true,
-                    tension: 0.4
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: { beginAtZero: true, title: { display: true, text: 'FPS' } }
-                },
-                plugins: {
-                    legend: { display: true, position: 'top' }
-                }
+        # 最近的部落事件记录
+        tribe_events = [
+            {
+                'time': _fmt_clock(int(event['timestamp'])),
+                'description': event['description']
             }
-        });
-        
-        // 部落文明演化图表
-        const tribeCtx = document.getElementById('tribeChart').getContext('2d');
-        new Chart(tribeCtx, {
-            type: 'line',
-            data: {
-                labels: statsData.map(d => new Date(d.timestamp * 1000).toLocaleTimeString()),
-                datasets: [{
-                    label: '部落总数',
-                    data: statsData.map(d => d.tribes ? d.tribes.total_tribes : 0),
-                    borderColor: '#e67e22',
-                    backgroundColor: 'rgba(230, 126, 34, 0.1)',
-                    fill: true,
-                    tension: 0.4
-                }, {
-                    label: '最大部落规模',
-                    data: statsData.map(d => d.tribes ? d.tribes.largest_tribe : 0),
-                    borderColor: '#9b59b6',
-                    backgroundColor: 'rgba(155, 89, 182, 0.1)',
-                    fill: false,
-                    tension: 0.4,
-                    yAxisID: 'y1'
-                }, {
-                    label: '平均科技水平',
-                    data: statsData.map(d => d.tribes ? (d.tribes.avg_tech_level * 100) : 0),
-                    borderColor: '#1abc9c',
-                    backgroundColor: 'rgba(26, 188, 156, 0.1)',
-                    fill: false,
-                    tension: 0.4,
-                    yAxisID: 'y2'
-                }]
-            },
-            options: {
-                responsive: true,
-                maintainAspectRatio: false,
-                scales: {
-                    y: {
-                        beginAtZero: true,
-                        title: { display: true, text: '部落数量' }
-                    },
-                    y1: {
-                        type: 'linear',
-                        display: true,
-                        position: 'right',
-                        title: { display: true, text: '最大规模' },
-                        grid: { drawOnChartArea: false }
-                    },
-                    y2: {
-                        type: 'linear',
-                        display: false,
-                        beginAtZero: true,
-                        max: 100
-                    }
-                },
-                plugins: {
-                    legend: { display: true, position: 'top' }
-                }
-            }
-        });
-    </script>
-</body>
-</html>
-        """
+            for event in _tail(session_data.get('tribe_events', []), 10)  # 最近10个事件
+        ]
+        
+        # 事件记录器的数据已在快照时持锁整理好
+        event_report = session_data['event_report']
+        
+        # 只渲染动态部分，静态头尾直接复用缓存的字节
+        context = dict(
+            current_time=current_time,
+            session_duration=session_duration,
+            stats_steps=agg['fps_count'],
+            max_agents=max_agents,
+            max_offspring=max_offspring,
+            max_interactions=max_interactions,
+            avg_fps=avg_fps,
+            max_age=max_age,
+            max_tribes=max_tribes,
+            max_tribe_size=max_tribe_size,
+            tribe_events_count=len(session_data.get('tribe_events', [])),
+            avg_tech_level=avg_tech_level,
+            tribe_events=tribe_events,
+            major_events=event_report['major_events'],
+            event_summary=event_report['event_summary'],
+            milestone_events=event_report['milestone_events'],
+            climate_events=event_report['climate_events'],
+            stats_data=stats_data,
+            performance_data=performance_data
+        )
         
-        # 保存HTML报告
+        # 保存HTML报告（模板逐段生成并直接写入文件，不拼接完整文档字符串）
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/cogvrs_report_{timestamp}.html"
+        filename = str(_REPORTS_DIR / f"cogvrs_report_{timestamp}.html")
         
-        # 确保reports目录存在
-        import os
-        os.makedirs("reports", exist_ok=True)
+        _ensure_reports_dir()
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        with open(filename, 'wb', buffering=_REPORT_WRITE_BUFFER) as f:
+            f.write(_REPORT_PRELUDE)
+            f.writelines(chunk.encode('utf-8') for chunk in _REPORT_TEMPLATE.generate(**context))
+            f.write(_REPORT_POSTLUDE)
         
         return filename
     
@@ -1692,43 +1908,57 @@ class CogvrsGUI:
         print(f"Step {time_stats['current_step']:>6} | FPS: {time_stats['actual_fps']:5.1f} | Agents: {len(alive_agents):>2}")
         
         if alive_agents:
-            ages = [a.age for a in alive_agents]
-            energies = [a.energy for a in alive_agents]
-            total_offspring = sum(a.offspring_count for a in alive_agents)
+            state = self._sync_agent_arrays(alive_agents)
+            ages = state[:, _AGENT_AGE]
+            energies = state[:, _AGENT_ENERGY]
+            total_offspring = int(state[:, _AGENT_OFFSPRING].sum())
             
-            print(f"Age: {min(ages):4.0f}-{max(ages):4.0f} (avg:{sum(ages)/len(ages):5.1f})")
-            print(f"Energy: {min(energies):5.1f}-{max(energies):5.1f} (avg:{sum(energies)/len(energies):5.1f})")
+            print(f"Age: {ages.min():4.0f}-{ages.max():4.0f} (avg:{ages.mean():5.1f})")
+            print(f"Energy: {energies.min():5.1f}-{energies.max():5.1f} (avg:{energies.mean():5.1f})")
             print(f"Total Offspring: {total_offspring}")
         
         print(f"Resources: {world_state['num_resources']}")
         print("-" * 60)
     
     def _update_ui_info(self):
-        """更新UI信息"""
+        """更新UI信息（模拟步数、智能体数和渲染模式都未变化时直接返回）"""
+        ui_key = (self.time_manager.current_step, len(self.agents), self.multi_scale_mode)
+        if ui_key == self._last_ui_key:
+            return
+        self._last_ui_key = ui_key
+        
         # 统计信息
         alive_agents = [a for a in self.agents if a.alive]
         
         if alive_agents:
-            # 基础统计
-            avg_age = sum(a.age for a in alive_agents) / len(alive_agents)
-            avg_energy = sum(a.energy for a in alive_agents) / len(alive_agents)
-            avg_health = sum(a.health for a in alive_agents) / len(alive_agents)
-            total_offspring = sum(a.offspring_count for a in alive_agents)
-            total_interactions = sum(a.social_interactions for a in alive_agents)
-            
-            # 详细统计
-            ages = [a.age for a in alive_agents]
-            energies = [a.energy for a in alive_agents]
-            healths = [a.health for a in alive_agents]
-            
-            min_age, max_age = min(ages), max(ages)
-            min_energy, max_energy = min(energies), max(energies)
-            min_health, max_health = min(healths), max(healths)
+            # 在SoA数组上按列一次性求和、极值和最大值位置
+            state = self._sync_agent_arrays(alive_agents)
+            n = len(alive_agents)
+            sums = state.sum(axis=0)
+            mins = state.min(axis=0)
+            maxs = state.max(axis=0)
+            argmax = state.argmax(axis=0)
+            
+            avg_age = sums[_AGENT_AGE] / n
+            avg_energy = sums[_AGENT_ENERGY] / n
+            avg_health = sums[_AGENT_HEALTH] / n
+            total_offspring = int(sums[_AGENT_OFFSPRING])
+            total_interactions = int(sums[_AGENT_INTERACTIONS])
+            
+            min_age, max_age = mins[_AGENT_AGE], maxs[_AGENT_AGE]
+            min_energy, max_energy = mins[_AGENT_ENERGY], maxs[_AGENT_ENERGY]
+            min_health, max_health = mins[_AGENT_HEALTH], maxs[_AGENT_HEALTH]
+            
+            most_active = alive_agents[argmax[_AGENT_INTERACTIONS]]
+            oldest = alive_agents[argmax[_AGENT_AGE]]
+            healthiest = alive_agents[argmax[_AGENT_HEALTH]]
+            most_energetic = alive_agents[argmax[_AGENT_ENERGY]]
             
             # 环境适应性分析
-            high_energy_count = sum(1 for e in energies if e > 120)
-            low_energy_count = sum(1 for e in energies if e < 30)
-            healthy_count = sum(1 for h in healths if h > 80)
+            energies = state[:, _AGENT_ENERGY]
+            high_energy_count = int(np.count_nonzero(energies > 120))
+            low_energy_count = int(np.count_nonzero(energies < 30))
+            healthy_count = int(np.count_nonzero(state[:, _AGENT_HEALTH] > 80))
             
         else:
             avg_age = avg_energy = avg_health = total_offspring = total_interactions = 0
@@ -1743,178 +1973,135 @@ class CogvrsGUI:
         alive_count = len(alive_agents)
         dead_count = total_agents - alive_count
         
-        stats_html = f"""
-        <b>🌍 Population Overview</b><br>
-        <font color='#00FF00'>⏰ Step: {time_stats['current_step']}</font><br>
-        <font color='#FFFF00'>👥 Total Agents: {total_agents}</font><br>
-        <font color='#90EE90'>✅ Alive: {alive_count}</font><br>
-        <font color='#FF6B6B'>💀 Dead: {dead_count}</font><br>
-        <font color='#FF8800'>📊 Age Range: {min_age:.0f}-{max_age:.0f} (avg: {avg_age:.1f})</font><br>
-        <font color='#00FFFF'>⚡ Energy: {min_energy:.0f}-{max_energy:.0f} (avg: {avg_energy:.1f})</font><br>
-        <font color='#FF4444'>❤️ Health: {min_health:.0f}-{max_health:.0f} (avg: {avg_health:.1f})</font><br>
-        <font color='#FF88FF'>👶 Total Offspring: {total_offspring}</font><br>
-        <font color='#88FF88'>🤝 Social Interactions: {total_interactions}</font><br>
-        <font color='#8888FF'>💎 Resources Available: {world_state['num_resources']}</font><br>
-        <font color='#CCCCCC'>🎯 Simulation FPS: {time_stats['actual_fps']:.1f}</font>
-        """
+        stats_html = _STATS_HTML_FMT % (
+            time_stats['current_step'], total_agents, alive_count, dead_count,
+            min_age, max_age, avg_age,
+            min_energy, max_energy, avg_energy,
+            min_health, max_health, avg_health,
+            total_offspring, total_interactions,
+            world_state['num_resources'], time_stats['actual_fps']
+        )
         
         # 详细的智能体分析HTML
         if alive_agents:
-            most_active = max(alive_agents, key=lambda a: a.social_interactions)
-            oldest = max(alive_agents, key=lambda a: a.age)
-            healthiest = max(alive_agents, key=lambda a: a.health)
-            most_energetic = max(alive_agents, key=lambda a: a.energy)
-            
-            details_html = f"""
-            <b>🧠 Individual Agent Stats</b><br>
-            <font color='#FFD700'>🏆 Most Social:</font><br>
-            &nbsp;&nbsp;Agent#{most_active.agent_id}: {most_active.social_interactions} interactions<br>
-            <font color='#90EE90'>👴 Eldest:</font><br>
-            &nbsp;&nbsp;Agent#{oldest.agent_id}: {oldest.age:.0f} years old<br>
-            <font color='#FF69B4'>💪 Healthiest:</font><br>
-            &nbsp;&nbsp;Agent#{healthiest.agent_id}: {healthiest.health:.1f}/100 HP<br>
-            <font color='#FFD700'>⚡ Most Energetic:</font><br>
-            &nbsp;&nbsp;Agent#{most_energetic.agent_id}: {most_energetic.energy:.1f} energy<br>
-            <br>
-            <b>🌱 Population Health</b><br>
-            <font color='#00FF00'>🟢 High Energy ({'>120'}): {high_energy_count}</font><br>
-            <font color='#FF0000'>🔴 Low Energy ({'<30'}): {low_energy_count}</font><br>
-            <font color='#00FFFF'>💚 Healthy ({'>80'}): {healthy_count}</font>
-            """
+            details_html = _DETAILS_HTML_FMT % (
+                most_active.agent_id, most_active.social_interactions,
+                oldest.agent_id, oldest.age,
+                healthiest.agent_id, healthiest.health,
+                most_energetic.agent_id, most_energetic.energy,
+                high_energy_count, low_energy_count, healthy_count
+            )
         else:
-            details_html = "<b>🧠 Agent Analysis</b><br><font color='#FF6666'>No agents available</font>"
+            details_html = _NO_AGENTS_HTML
         
         # 系统状态和环境信息HTML
         population_trend = "📈 Growing" if len(alive_agents) > 10 else "📉 Declining" if len(alive_agents) < 5 else "📊 Stable"
         performance = "🟢 Good" if time_stats['actual_fps'] > 20 else "🟡 Fair" if time_stats['actual_fps'] > 15 else "🔴 Poor"
         
         # 渲染模式状态
-        render_mode = "🎭 Multi-Scale" if (hasattr(self, 'multi_scale_mode') and self.multi_scale_mode) else "🎨 Legacy"
+        render_mode = "🎭 Multi-Scale" if self.multi_scale_mode else "🎨 Legacy"
         current_scale = ""
-        if hasattr(self, 'scale_manager') and hasattr(self, 'multi_scale_mode') and self.multi_scale_mode:
+        if self.multi_scale_mode:
             scale_name = self.scale_manager.current_scale.value.upper()
             current_scale = f" ({scale_name})"
         
         # 获取环境信息
         env_info = ""
-        if hasattr(self, 'environment_manager'):
+        if self.environment_manager is not None:
             env_status = self.environment_manager.get_environment_status()
             
             # 优先使用气候系统信息
-            if hasattr(self.environment_manager, 'climate_system'):
+            if self._has_climate:
                 climate_status = self.environment_manager.climate_system.get_status_info()
                 active_weather = []  # 气候系统不使用active_weather
-            elif hasattr(self, 'weather_system') and self.weather_system is not None:
+            elif self._has_weather:
                 active_weather = self.weather_system.get_active_weather_info()
             else:
                 active_weather = []
             
-            season_emoji = {"Spring": "🌸", "Summer": "☀️", "Autumn": "🍂", "Winter": "❄️"}
-            time_emoji = {"Dawn": "🌅", "Day": "☀️", "Dusk": "🌇", "Night": "🌙"}
-            
-            env_info = f"""
-            <br><b>🌍 Environment</b><br>
-            <font color='#90EE90'>{season_emoji.get(env_status['season'], '🌍')} {env_status['season']}</font><br>
-            <font color='#87CEEB'>{time_emoji.get(env_status['time_of_day'], '⏰')} {env_status['time_of_day']}</font><br>
-            <font color='#DDA0DD'>🏞️ Zones: {env_status['total_zones']}</font><br>
-            """
+            season = env_status['season']
+            time_of_day = env_status['time_of_day']
+            env_parts = [_ENV_HTML_FMT % (
+                _SEASON_EMOJI.get(season, '🌍'), season,
+                _TIME_EMOJI.get(time_of_day, '⏰'), time_of_day,
+                env_status['total_zones']
+            )]
             
             # 显示气候或天气信息
-            if hasattr(self.environment_manager, 'climate_system'):
+            if self._has_climate:
                 # 气候系统信息
-                climate_emoji = {
-                    "temperate": "🌤️", "ice_age": "🧊", "greenhouse": "🔥",
-                    "arid": "🏜️", "volcanic": "🌋"
-                }
                 current_epoch = climate_status['current_epoch']
-                progress = int(climate_status['epoch_progress'] * 100)
-                env_info += f"<font color='#FFB6C1'>{climate_emoji.get(current_epoch, '🌍')} {current_epoch.title()} ({progress}%)</font><br>"
-                time_remaining = int(climate_status['time_remaining'])
-                env_info += f"<font color='#DDD'>⏳ Next change: {time_remaining}s</font><br>"
+                env_parts.append(_CLIMATE_HTML_FMT % (
+                    _CLIMATE_EMOJI.get(current_epoch, '🌍'), current_epoch.title(),
+                    int(climate_status['epoch_progress'] * 100),
+                    int(climate_status['time_remaining'])
+                ))
             elif active_weather:
                 # 天气系统信息
-                weather_info = active_weather[0]
-                weather_emoji = {
-                    "clear": "☀️", "rain": "🌧️", "storm": "⛈️",
-                    "drought": "🌵", "blizzard": "🌨️", "heatwave": "🔥"
-                }
-                env_info += f"<font color='#FFB6C1'>{weather_emoji.get(weather_info['type'], '🌤️')} {weather_info['type'].title()}</font><br>"
+                weather_type = active_weather[0]['type']
+                env_parts.append(_WEATHER_HTML_FMT % (_WEATHER_EMOJI.get(weather_type, '🌤️'), weather_type.title()))
             else:
-                env_info += "<font color='#98FB98'>🌤️ Clear Weather</font><br>"
+                env_parts.append(_CLEAR_WEATHER_HTML)
+            env_info = ''.join(env_parts)
         
         # 添加部落信息
         tribe_info_html = ""
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
+        if self._has_tribes:
             tribe_info = self.tribe_manager.get_tribes_info()
             if tribe_info['total_tribes'] > 0:
-                tribe_info_html = f"""
-        <br><b>🏘️ Tribes & Civilization</b><br>
-        <font color='#FFD700'>🏛️ Total Tribes: {tribe_info['total_tribes']}</font><br>
-        """
+                tribe_parts = [_TRIBES_HEADER_FMT % tribe_info['total_tribes']]
                 
                 # 统计文明等级
-                civilization_counts = {}
+                # 一次遍历同时统计文明等级和外交关系
+                civilization_counts = Counter()
+                total_allies = total_enemies = 0
                 for tribe_data in tribe_info['tribes'].values():
-                    level = tribe_data['civilization_level']
-                    civilization_counts[level] = civilization_counts.get(level, 0) + 1
+                    civilization_counts[tribe_data['civilization_level']] += 1
+                    total_allies += tribe_data['allies']
+                    total_enemies += tribe_data['enemies']
                 
-                # 显示主要文明等级
-                civ_emojis = {
-                    'nomadic': '🏕️', 'settlement': '🏠', 'village': '🏘️', 
-                    'town': '🏙️', 'city': '🏙️'
-                }
-                
-                for level, count in civilization_counts.items():
-                    emoji = civ_emojis.get(level, '🏘️')
-                    tribe_info_html += f"<font color='#87CEEB'>{emoji} {level.title()}: {count}</font><br>"
+                # 显示主要文明等级（按部落数量从多到少）
+                for level, count in civilization_counts.most_common():
+                    tribe_parts.append(_CIV_LEVEL_FMT % (_CIV_EMOJI.get(level, '🏘️'), level.title(), count))
                 
                 # 显示外交关系
-                total_alliances = sum(tribe_data['allies'] for tribe_data in tribe_info['tribes'].values()) // 2
-                total_conflicts = sum(tribe_data['enemies'] for tribe_data in tribe_info['tribes'].values()) // 2
+                total_alliances = total_allies // 2
+                total_conflicts = total_enemies // 2
                 
                 if total_alliances > 0:
-                    tribe_info_html += f"<font color='#90EE90'>🤝 Alliances: {total_alliances}</font><br>"
+                    tribe_parts.append(_ALLIANCES_FMT % total_alliances)
                 if total_conflicts > 0:
-                    tribe_info_html += f"<font color='#FF6B6B'>⚔️ Conflicts: {total_conflicts}</font><br>"
+                    tribe_parts.append(_CONFLICTS_FMT % total_conflicts)
+                tribe_info_html = ''.join(tribe_parts)
             else:
-                tribe_info_html = """
-        <br><b>🏘️ Tribes & Civilization</b><br>
-        <font color='#808080'>No tribes formed yet</font><br>
-        """
+                tribe_info_html = _NO_TRIBES_HTML
 
-        system_html = f"""
-        <b>💻 System Status</b><br>
-        <font color='#00FF00'>Population: {population_trend}</font><br>
-        <font color='#FFFF00'>Performance: {performance}</font><br>
-        <font color='#FF8800'>Memory: {len(self.agents)} tracked</font><br>
-        <font color='#00FFFF'>Render: {render_mode}{current_scale}</font><br>
-        <font color='#CCCCCC'>Press M to toggle render mode</font>
-        {env_info}
-        {tribe_info_html}
-        """
+        system_html = _SYSTEM_HTML_FMT % (
+            population_trend, performance, len(self.agents),
+            render_mode, current_scale, env_info, tribe_info_html
+        )
         
         # 更新所有UI元素
-        self.stats_text.html_text = stats_html
-        self.stats_text.rebuild()
-        
-        self.details_text.html_text = details_html
-        self.details_text.rebuild()
-        
-        self.system_text.html_text = system_html
-        self.system_text.rebuild()
+        self._set_html_text(self.stats_text, stats_html)
+        self._set_html_text(self.details_text, details_html)
+        self._set_html_text(self.system_text, system_html)
+    
+    @staticmethod
+    def _set_html_text(text_box, html: str):
+        """更新文本框HTML，内容未变化时跳过HTML重新解析和字形光栅化"""
+        if text_box.html_text != html:
+            text_box.html_text = html
+            text_box.rebuild()
     
     def _update_tribes_tab(self):
         """更新部落标签页数据"""
-        if not hasattr(self, 'tribes_elements'):
-            return
-            
-        tribe_overview = "<b>Tribe Overview</b><br>No tribes detected<br>"
+        tribe_overview = _TRIBE_OVERVIEW_EMPTY_HTML
         tribe_selector_options = ['No Tribes']
-        detailed_info = "<b>Tribe Details</b><br>No tribe selected<br>"
-        members_info = "<b>Tribe Statistics</b><br>No data available<br>"
-        diplomacy_info = "<b>Diplomatic Status</b><br>No diplomatic data<br>"
+        detailed_info = _TRIBE_DETAILS_EMPTY_HTML
+        members_info = _TRIBE_STATS_EMPTY_HTML
+        diplomacy_info = _TRIBE_DIPLOMACY_EMPTY_HTML
         
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
+        if self._has_tribes:
             try:
                 tribes_info_raw = self.tribe_manager.get_tribes_info()
                 
@@ -1997,20 +2184,16 @@ class CogvrsGUI:
         
         # 更新UI元素 - 使用正确的键名
         if 'overview' in self.tribes_elements:
-            self.tribes_elements['overview'].html_text = tribe_overview
-            self.tribes_elements['overview'].rebuild()
+            self._set_html_text(self.tribes_elements['overview'], tribe_overview)
             
         if 'details' in self.tribes_elements:
-            self.tribes_elements['details'].html_text = detailed_info
-            self.tribes_elements['details'].rebuild()
+            self._set_html_text(self.tribes_elements['details'], detailed_info)
             
         if 'members' in self.tribes_elements:
-            self.tribes_elements['members'].html_text = members_info
-            self.tribes_elements['members'].rebuild()
+            self._set_html_text(self.tribes_elements['members'], members_info)
             
         if 'diplomacy' in self.tribes_elements:
-            self.tribes_elements['diplomacy'].html_text = diplomacy_info
-            self.tribes_elements['diplomacy'].rebuild()
+            self._set_html_text(self.tribes_elements['diplomacy'], diplomacy_info)
             
         # 更新部落选择器
         if 'selector' in self.tribes_elements and tribe_selector_options:
@@ -2026,16 +2209,13 @@ class CogvrsGUI:
     
     def _update_disasters_tab(self):
         """更新灾难标签页数据"""
-        if not hasattr(self, 'disasters_elements'):
-            return
-            
         active_disasters = ""
         disaster_history = ""
         disaster_stats = ""
         environment_status = ""
         warnings = ""
         
-        if hasattr(self, 'disaster_system') and self.disaster_system:
+        if self._has_disasters:
             try:
                 # 活跃灾难
                 active = getattr(self.disaster_system, 'active_disasters', [])
@@ -2051,7 +2231,7 @@ class CogvrsGUI:
                             active_list.append(f"• {disaster} (Data format error)")
                     active_disasters = f"<b>Active Disasters</b><br>{'<br>'.join(active_list)}<br><br>"
                 else:
-                    active_disasters = "<b>Active Disasters</b><br>No active disasters<br><br>"
+                    active_disasters = _NO_ACTIVE_DISASTERS_HTML
                 
                 # 灾难历史
                 history = getattr(self.disaster_system, 'disaster_history', [])
@@ -2079,7 +2259,7 @@ class CogvrsGUI:
                 active_disasters = f"<b>Data Loading Error</b><br>Error: {str(e)}"
         
         # 环境状态
-        if hasattr(self, 'environment_manager') and self.environment_manager:
+        if self.environment_manager is not None:
             try:
                 weather = getattr(self.environment_manager, 'weather_system', None)
                 if weather:
@@ -2094,36 +2274,28 @@ class CogvrsGUI:
                 environment_status = f"<b>Environment Status</b><br>Data unavailable"
         
         # 预警信息
-        warnings = "<b>Warning Information</b><br>No warnings<br>"
+        warnings = _NO_WARNINGS_HTML
         
         # 更新UI元素
         if 'active_disasters' in self.disasters_elements:
-            self.disasters_elements['active_disasters'].html_text = active_disasters
-            self.disasters_elements['active_disasters'].rebuild()
+            self._set_html_text(self.disasters_elements['active_disasters'], active_disasters)
             
         if 'disaster_history' in self.disasters_elements:
-            self.disasters_elements['disaster_history'].html_text = disaster_history
-            self.disasters_elements['disaster_history'].rebuild()
+            self._set_html_text(self.disasters_elements['disaster_history'], disaster_history)
             
         if 'disaster_stats' in self.disasters_elements:
-            self.disasters_elements['disaster_stats'].html_text = disaster_stats
-            self.disasters_elements['disaster_stats'].rebuild()
+            self._set_html_text(self.disasters_elements['disaster_stats'], disaster_stats)
             
         if 'environment_status' in self.disasters_elements:
-            self.disasters_elements['environment_status'].html_text = environment_status
-            self.disasters_elements['environment_status'].rebuild()
+            self._set_html_text(self.disasters_elements['environment_status'], environment_status)
             
         if 'warnings' in self.disasters_elements:
-            self.disasters_elements['warnings'].html_text = warnings
-            self.disasters_elements['warnings'].rebuild()
+            self._set_html_text(self.disasters_elements['warnings'], warnings)
     
     def _update_logs_tab(self):
         """更新日志标签页数据"""
-        if not hasattr(self, 'logs_elements'):
-            return
-            
         # 获取当前过滤设置
-        current_filter = getattr(self, 'current_log_filter', 'All')
+        current_filter = self.current_log_filter
         
         # 准备日志内容
         filtered_logs = []
@@ -2133,27 +2305,33 @@ class CogvrsGUI:
         
         # 格式化日志显示
         if filtered_logs:
-            log_text = "<br>".join(filtered_logs[-50:])  # 显示最近50条
+            log_html = "<b>System Logs</b><br>" + "<br>".join(filtered_logs[-50:])  # 显示最近50条
         else:
-            log_text = "No log data available"
+            log_html = _NO_LOGS_HTML
         
         # 更新日志显示
         if 'log_display' in self.logs_elements:
-            self.logs_elements['log_display'].html_text = f"<b>System Logs</b><br>{log_text}"
-            self.logs_elements['log_display'].rebuild()
+            self._set_html_text(self.logs_elements['log_display'], log_html)
     
     def handle_events(self):
-        """处理事件"""
+        """处理事件：每帧一次取出全部事件，GUI自身处理后整批交给多尺度交互控制器"""
         events = pygame.event.get()
+        if not events and not self.multi_scale_mode:
+            return
+        
+        # 同一帧内的多次窗口调节只处理最后一次
+        pending_resize = None
         
         for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             
             elif event.type == pygame.VIDEORESIZE:
-                # 处理窗口大小调节
-                if not self.fullscreen:  # 只在窗口模式下处理
-                    self._handle_window_resize(event.w, event.h)
+                pending_resize = event
+            
+            elif event.type == pygame.VIDEOEXPOSE:
+                # 窗口被遮挡后重新暴露，需要整屏重绘
+                self._full_redraw = True
             
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
@@ -2166,8 +2344,9 @@ class CogvrsGUI:
                     self.running = False
                 elif event.key == pygame.K_r and self.extinction_occurred:
                     # 灭绝后按R键重启
-                    self._restart_after_extinction()
-                elif event.key == pygame.K_m and hasattr(self, 'multi_scale_mode'):
+                    with self._state_lock:
+                        self._restart_after_extinction()
+                elif event.key == pygame.K_m and self.scale_manager is not None:
                     # M键切换渲染模式
                     self.multi_scale_mode = not self.multi_scale_mode
                     mode_text = "Multi-Scale" if self.multi_scale_mode else "Legacy"
@@ -2175,7 +2354,7 @@ class CogvrsGUI:
                     print(f"🔄 切换到{mode_text}渲染模式")
                 else:
                     # 传递给世界渲染器（传统模式）
-                    if not (self.enable_multi_scale and hasattr(self, 'multi_scale_mode') and self.multi_scale_mode):
+                    if not self.multi_scale_mode:
                         self.world_renderer.handle_event(event)
             
             elif event.type == pygame.USEREVENT:
@@ -2183,9 +2362,11 @@ class CogvrsGUI:
                     if event.ui_element == self.play_pause_button:
                         self._toggle_pause()
                     elif event.ui_element == self.reset_button:
-                        self._reset_simulation()
+                        with self._state_lock:
+                            self._reset_simulation()
                     elif event.ui_element == self.add_agent_button:
-                        self._add_random_agents(1)
+                        with self._state_lock:
+                            self._add_random_agents(1)
                     
                     # 处理标签页按钮点击
                     elif event.ui_element in self.tab_buttons.values():
@@ -2196,7 +2377,7 @@ class CogvrsGUI:
                                 break
                     
                     # 处理日志面板的清空按钮
-                    elif hasattr(self, 'logs_elements') and event.ui_element == self.logs_elements.get('clear_button'):
+                    elif event.ui_element == self.logs_elements.get('clear_button'):
                         self.log_buffer.clear()
                         self._update_logs_tab()
                 
@@ -2209,11 +2390,14 @@ class CogvrsGUI:
             # 处理UI事件
             self.ui_manager.process_events(event)
         
+        # 处理窗口大小调节（只在窗口模式下处理）
+        if pending_resize is not None and not self.fullscreen:
+            self._handle_window_resize(pending_resize.w, pending_resize.h)
+        
         # 多尺度交互处理
-        if (self.enable_multi_scale and hasattr(self, 'multi_scale_mode') and 
-            self.multi_scale_mode and hasattr(self, 'interaction_controller')):
+        if self.multi_scale_mode:
             
-            world_state = self._prepare_world_state_for_multi_scale()
+            world_state = self._get_render_world_state()
             interaction_result = self.interaction_controller.handle_events(events, world_state)
             
             # 处理交互结果
@@ -2239,8 +2423,12 @@ class CogvrsGUI:
     
     def _reset_simulation(self):
         """重置模拟"""
-        # 重置时间
+        # 重置时间（步数归零，按步数分段的缓存随之失效）
         self.time_manager.reset()
+        self._last_ui_key = None
+        self._world_block_cache.clear()
+        self._sim_accumulator = 0.0
+        self._prev_agent_positions.clear()
         
         # 重新初始化世界
         self.world = World2D(self.config.get('world', {}))
@@ -2265,12 +2453,20 @@ class CogvrsGUI:
         self.fullscreen = not self.fullscreen
         
         if self.fullscreen:
-            # 切换到全屏
+            # 切换到全屏：SCALED由GPU渲染器呈现整屏，避开桌面合成路径
             info = pygame.display.Info()
-            self.screen = pygame.display.set_mode(
-                (info.current_w, info.current_h), 
-                pygame.FULLSCREEN | pygame.DOUBLEBUF | pygame.HWSURFACE
-            )
+            flags = pygame.FULLSCREEN | pygame.DOUBLEBUF
+            if self.config.get('scaled_fullscreen', True):
+                flags |= pygame.SCALED
+            try:
+                self.screen = pygame.display.set_mode((info.current_w, info.current_h), flags, vsync=0)
+            except pygame.error as e:
+                # 部分驱动/平台不支持SCALED渲染器，回退到普通全屏
+                logger.warning(f"Scaled fullscreen unavailable, falling back: {e}")
+                self.screen = pygame.display.set_mode(
+                    (info.current_w, info.current_h),
+                    pygame.FULLSCREEN | pygame.DOUBLEBUF
+                )
             self.window_width = info.current_w
             self.window_height = info.current_h
             print(f"🖥️ 切换到全屏模式: {self.window_width}x{self.window_height}")
@@ -2279,7 +2475,7 @@ class CogvrsGUI:
             self.window_width, self.window_height = self.windowed_size
             self.screen = pygame.display.set_mode(
                 (self.window_width, self.window_height), 
-                pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE
+                pygame.DOUBLEBUF | pygame.RESIZABLE
             )
             print(f"🪟 切换到窗口模式: {self.window_width}x{self.window_height}")
         
@@ -2298,14 +2494,15 @@ class CogvrsGUI:
         print(f"   更新世界视图: {self.world_view_width}x{self.world_view_height}")
         
         # 重新创建后台缓冲区
-        self.back_buffer = pygame.Surface((self.window_width, self.window_height))
+        self.back_buffer = pygame.Surface((self.window_width, self.window_height)).convert()
+        self._draw_static_background()
+        self._world_surface = pygame.Surface((self.world_view_width, self.world_view_height)).convert()
         
-        # 更新UI管理器
-        self.ui_manager = pygame_gui.UIManager((self.window_width, self.window_height))
-        self._create_ui_elements()  # 重新创建UI元素
+        # 更新UI管理器分辨率并重新定位现有UI元素（保留主题、字体缓存和面板状态）
+        self._relayout_ui_elements()
         
         # 更新世界渲染器配置
-        if hasattr(self, 'world_renderer'):
+        if self.world_renderer is not None:
             self.world_renderer.screen_width = self.world_view_width
             self.world_renderer.screen_height = self.world_view_height
             self.world_renderer.scale_x = self.world_view_width / self.world_renderer.world_width
@@ -2320,6 +2517,10 @@ class CogvrsGUI:
         new_width = max(min_width, new_width)
         new_height = max(min_height, new_height)
         
+        # 部分驱动会在尺寸未变化时也发送VIDEORESIZE，此时无需重建显示和缓冲区
+        if new_width == self.window_width and new_height == self.window_height:
+            return
+        
         # 更新窗口尺寸
         self.window_width = new_width
         self.window_height = new_height
@@ -2328,26 +2529,27 @@ class CogvrsGUI:
         # 重新创建显示
         self.screen = pygame.display.set_mode(
             (self.window_width, self.window_height),
-            pygame.DOUBLEBUF | pygame.HWSURFACE | pygame.RESIZABLE
+            pygame.DOUBLEBUF | pygame.RESIZABLE
         )
         
         # 重新创建后台缓冲区
-        self.back_buffer = pygame.Surface((self.window_width, self.window_height))
+        self.back_buffer = pygame.Surface((self.window_width, self.window_height)).convert()
         
         # 重新计算布局 - 支持更大的显示区域
         self.panel_width = 350  # 固定面板宽度
         self.world_view_width = self.window_width - self.panel_width - 20  # 最大化世界视图
         self.world_view_height = self.window_height - 40  # 保留顶部空间
+        self._draw_static_background()
+        self._world_surface = pygame.Surface((self.world_view_width, self.world_view_height)).convert()
         
         print(f"🔄 窗口调整: {self.window_width}x{self.window_height}")
         print(f"   世界视图: {self.world_view_width}x{self.world_view_height}")
         
-        # 更新UI管理器
-        self.ui_manager = pygame_gui.UIManager((self.window_width, self.window_height))
-        self._create_ui_elements()  # 重新创建UI元素
+        # 更新UI管理器分辨率并重新定位现有UI元素（保留主题、字体缓存和面板状态）
+        self._relayout_ui_elements()
         
         # 更新世界渲染器配置
-        if hasattr(self, 'world_renderer'):
+        if self.world_renderer is not None:
             self.world_renderer.screen_width = self.world_view_width
             self.world_renderer.screen_height = self.world_view_height
             self.world_renderer.scale_x = self.world_view_width / self.world_renderer.world_width
@@ -2366,6 +2568,25 @@ class CogvrsGUI:
         self.paused = True
         self.time_manager.pause()
         
+        # 气候状态和历史在分析与HTML报告中只获取一次
+        if self._has_climate:
+            climate_system = self.environment_manager.climate_system
+            self._extinction_climate = (climate_system.get_status_info(), climate_system.get_climate_history())
+        
+        try:
+            self._report_extinction()
+        finally:
+            self._extinction_climate = None
+    
+    def _climate_snapshot(self):
+        """返回 (气候状态, 气候历史)：灭绝处理期间使用缓存，否则直接查询气候系统"""
+        if self._extinction_climate is not None:
+            return self._extinction_climate
+        climate_system = self.environment_manager.climate_system
+        return climate_system.get_status_info(), climate_system.get_climate_history()
+    
+    def _report_extinction(self):
+        """输出灭绝分析并生成HTML报告"""
         # 生成灭绝分析报告
         extinction_report = self._generate_extinction_analysis()
         
@@ -2395,16 +2616,9 @@ class CogvrsGUI:
     
     def _generate_extinction_analysis(self) -> Dict[str, List[str]]:
         """生成灭绝原因分析"""
-        analysis = {
-            "环境因素": [],
-            "资源状况": [],
-            "天气影响": [],
-            "种群动态": [],
-            "进化趋势": [],
-            "部落发展": [],
-            "文明成就": [],
-            "系统建议": []
-        }
+        analysis = {category: [] for category in _ANALYSIS_CATEGORIES}
+        
+        now = time.time()
         
         # 分析环境因素
         world_state = self.world.get_world_state()
@@ -2414,25 +2628,23 @@ class CogvrsGUI:
             analysis["资源状况"].append(f"资源严重短缺 (仅{resource_count}个)")
         
         # 分析环境影响（气候或天气）
-        if hasattr(self, 'environment_manager') and hasattr(self.environment_manager, 'climate_system'):
+        if self._has_climate:
             # 使用气候系统分析
-            climate_status = self.environment_manager.climate_system.get_status_info()
+            climate_status, climate_history = self._climate_snapshot()
             current_epoch = climate_status['current_epoch']
             
             # 分析气候对灭绝的影响
-            severe_climates = ['ice_age', 'volcanic', 'arid']
-            if current_epoch in severe_climates:
+            if current_epoch in _SEVERE_CLIMATES:
                 analysis["天气影响"].append(f"严酷气候纪元: {current_epoch} 导致生存困难")
             
             # 添加气候变化分析
-            climate_history = self.environment_manager.climate_system.get_climate_history()
             if climate_history:
                 analysis["环境因素"].append(f"气候变化历史: 经历了{len(climate_history)}次气候纪元转换")
-                recent_changes = [h for h in climate_history if time.time() - h['timestamp'] < 300]  # 最近5分钟
+                recent_changes = [h for h in climate_history if now - h['timestamp'] < 300]  # 最近5分钟
                 if len(recent_changes) > 2:
                     analysis["环境因素"].append("频繁的气候变化导致环境不稳定")
             
-        elif hasattr(self, 'weather_system') and self.weather_system is not None:
+        elif self._has_weather:
             # 回退到天气系统分析
             active_weather = self.weather_system.get_active_weather_info()
             severe_weather_count = sum(1 for w in active_weather if w['intensity'] > 0.7)
@@ -2441,7 +2653,7 @@ class CogvrsGUI:
         
         # 分析历史数据
         if self.session_data['stats_history']:
-            last_stats = self.session_data['stats_history'][-5:]  # 最后5次记录
+            last_stats = _tail(self.session_data['stats_history'], 5)  # 最后5次记录
             
             # 种群趋势分析
             if len(last_stats) >= 2:
@@ -2455,28 +2667,31 @@ class CogvrsGUI:
                     analysis["种群动态"].append("种群平均能量持续偏低")
         
         # 分析部落发展情况
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
+        if self._has_tribes:
             tribe_info = self.tribe_manager.get_tribes_info()
             
             analysis["部落发展"].append(f"曾形成部落数量: {tribe_info['total_tribes']}")
             
             if tribe_info['total_tribes'] > 0:
-                # 文明等级分析
-                civilization_levels = {}
+                # 文明等级与外交关系分析（一次遍历完成所有统计）
+                civilization_levels = Counter()
                 max_population = 0
                 oldest_tribe_age = 0
                 total_cultural_traits = 0
+                total_alliances = 0
+                total_conflicts = 0
                 
                 for tribe_data in tribe_info['tribes'].values():
-                    level = tribe_data['civilization_level']
-                    civilization_levels[level] = civilization_levels.get(level, 0) + 1
+                    civilization_levels[tribe_data['civilization_level']] += 1
                     max_population = max(max_population, tribe_data['population'])
                     
                     # 计算部落存续时间
-                    tribe_age = time.time() - tribe_data['formation_time']
+                    tribe_age = now - tribe_data['formation_time']
                     oldest_tribe_age = max(oldest_tribe_age, tribe_age)
                     
                     total_cultural_traits += tribe_data['cultural_traits']
+                    total_alliances += tribe_data['allies']
+                    total_conflicts += tribe_data['enemies']
                 
                 # 文明成就分析
                 for level, count in civilization_levels.items():
@@ -2488,19 +2703,13 @@ class CogvrsGUI:
                 
                 # 部落发展分析
                 advanced_tribes = sum(1 for level in civilization_levels.keys() 
-                                    if level in ['village', 'town', 'city'])
+                                    if level in _ADVANCED_TRIBE_LEVELS)
                 if advanced_tribes > 0:
                     analysis["部落发展"].append(f"达到高级文明的部落: {advanced_tribes}个")
                 else:
                     analysis["部落发展"].append("未能发展出高级文明")
                 
                 # 外交关系分析
-                total_alliances = 0
-                total_conflicts = 0
-                for tribe_data in tribe_info['tribes'].values():
-                    total_alliances += tribe_data['allies']
-                    total_conflicts += tribe_data['enemies']
-                
                 if total_alliances > 0:
                     analysis["部落发展"].append(f"形成盟友关系: {total_alliances//2}组")  # 除以2避免重复计算
                 if total_conflicts > 0:
@@ -2524,177 +2733,125 @@ class CogvrsGUI:
     
     def _generate_extinction_html_report(self, analysis: Dict[str, List[str]]) -> str:
         """生成详细的HTML灭绝报告"""
-        from datetime import datetime
-        import json
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"reports/extinction_report_{timestamp}.html"
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        filename = str(_REPORTS_DIR / f"extinction_report_{timestamp}.html")
         
         # 确保目录存在
-        import os
-        os.makedirs("reports", exist_ok=True)
+        _ensure_reports_dir()
         
-        # 生成HTML内容
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <title>种群灭绝分析报告 - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</title>
-    <style>
-        body { font-family: 'Segoe UI', Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        .container { max-width: 1000px; margin: 0 auto; background: white; padding: 30px; border-radius: 10px; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
-        .header { background: linear-gradient(135deg, #ff6b6b, #ee5a24); color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
-        .section { margin: 20px 0; padding: 15px; border-left: 4px solid #ff6b6b; background: #fff5f5; }
-        .analysis-item { margin: 10px 0; padding: 8px; background: #ffffff; border-radius: 4px; border-left: 3px solid #ff9999; }
-        .warning { background: #fff3cd; border-color: #ffeaa7; color: #856404; }
-        .suggestion { background: #d1ecf1; border-color: #74b9ff; color: #0c5460; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>💀 种群灭绝分析报告</h1>
-            <p>时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        </div>
-"""
+        # 生成HTML内容：静态头尾使用模块级模板，各段收集到列表后一次拼接写出
+        parts = [_EXTINCTION_HTML_HEAD.format_map({'ts': now.strftime('%Y-%m-%d %H:%M:%S')})]
         
         # 添加分析内容
         for category, items in analysis.items():
-            html_content += f'<div class="section"><h2>{category}</h2>'
+            css_class = "suggestion" if category == "系统建议" else "analysis-item"
+            parts.append(f'<div class="section"><h2>{category}</h2>')
             for item in items:
-                css_class = "suggestion" if category == "系统建议" else "analysis-item"
-                html_content += f'<div class="{css_class}">{item}</div>'
-            html_content += '</div>'
+                parts.append(f'<div class="{css_class}">{item}</div>')
+            parts.append('</div>')
         
         # 添加气候变化专门分析
-        if hasattr(self, 'environment_manager') and hasattr(self.environment_manager, 'climate_system'):
-            html_content += self._generate_climate_change_section()
+        if self._has_climate:
+            self._write_climate_change_section(parts)
         
         # 添加详细事件记录
-        html_content += self._generate_detailed_events_section()
+        self._write_detailed_events_section(parts)
         
-        html_content += """
-    </div>
-</body>
-</html>
-"""
+        parts.append(_EXTINCTION_HTML_TAIL)
         
         # 保存文件
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        Path(filename).write_text("".join(parts), encoding='utf-8')
         
         return filename
     
-    def _generate_climate_change_section(self) -> str:
-        """生成气候变化专门分析章节"""
-        climate_system = self.environment_manager.climate_system
-        climate_status = climate_system.get_status_info()
-        climate_history = climate_system.get_climate_history()
+    def _write_climate_change_section(self, parts: List[str]):
+        """生成气候变化专门分析章节，各片段直接追加到报告的parts列表"""
+        climate_status, climate_history = self._climate_snapshot()
         
         # 气候变化分析
-        section_html = '''
+        parts.append('''
         <div class="section">
             <h2>🌍 气候变化分析</h2>
             <div class="analysis-item">
                 <h3>当前气候状况</h3>
-        '''
+        ''')
         
         # 当前气候状态
         current_epoch = climate_status['current_epoch']
         progress = climate_status['epoch_progress']
         time_remaining = climate_status['time_remaining']
         
-        climate_descriptions = {
-            'temperate': '温带气候 - 适宜生存，温度湿度适中',
-            'ice_age': '冰河时期 - 寒冷严酷，生存困难',
-            'greenhouse': '温室气候 - 炎热潮湿，极端天气频发',
-            'arid': '干旱气候 - 极度缺水，资源稀缺',
-            'volcanic': '火山时期 - 火山爆发，环境恶劣'
-        }
-        
-        section_html += f'''
+        parts.append(f'''
                 <p><strong>当前纪元:</strong> {current_epoch.upper()} ({progress*100:.1f}%)</p>
-                <p><strong>气候描述:</strong> {climate_descriptions.get(current_epoch, '未知气候')}</p>
+                <p><strong>气候描述:</strong> {_CLIMATE_DESCRIPTIONS.get(current_epoch, '未知气候')}</p>
                 <p><strong>剩余时间:</strong> {time_remaining:.1f}秒</p>
             </div>
-        '''
+        ''')
         
         # 气候历史分析
         if climate_history:
-            section_html += '''
+            parts.append('''
             <div class="analysis-item">
                 <h3>气候变化历史</h3>
-            '''
+            ''')
             
-            # 统计各气候纪元的持续时间
-            epoch_durations = {}
-            for i, record in enumerate(climate_history):
-                epoch = record['epoch']
-                if epoch not in epoch_durations:
-                    epoch_durations[epoch] = 0
-                
-                if i < len(climate_history) - 1:
-                    duration = climate_history[i + 1]['timestamp'] - record['timestamp']
-                    epoch_durations[epoch] += duration
-                else:
-                    # 最后一个纪元到现在的时间
-                    duration = time.time() - record['timestamp']
-                    epoch_durations[epoch] += duration
+            # 统计各气候纪元的持续时间（最后一个纪元计算到现在）
+            epoch_durations = _epoch_durations(climate_history, time.time())
             
-            section_html += f'<p><strong>气候转换次数:</strong> {len(climate_history)} 次</p>'
-            section_html += '<p><strong>各气候纪元持续时间:</strong></p><ul>'
+            parts.append(f'<p><strong>气候转换次数:</strong> {len(climate_history)} 次</p>')
+            parts.append('<p><strong>各气候纪元持续时间:</strong></p><ul>')
             
             for epoch, duration in epoch_durations.items():
-                section_html += f'<li>{epoch.upper()}: {duration:.1f}秒</li>'
+                parts.append(f'<li>{epoch.upper()}: {duration:.1f}秒</li>')
             
-            section_html += '</ul>'
+            parts.append('</ul>')
             
             # 分析气候对生存的影响
             severe_time = sum(duration for epoch, duration in epoch_durations.items() 
-                             if epoch in ['ice_age', 'volcanic', 'arid'])
+                             if epoch in _SEVERE_CLIMATES)
             total_time = sum(epoch_durations.values())
             
             if total_time > 0:
                 severe_percentage = (severe_time / total_time) * 100
-                section_html += f'''
+                parts.append(f'''
                 <p><strong>严酷气候占比:</strong> {severe_percentage:.1f}%</p>
-                '''
+                ''')
                 
                 if severe_percentage > 60:
-                    section_html += '<p class="warning">⚠️ 长期恶劣气候是导致种群灭绝的主要原因</p>'
+                    parts.append('<p class="warning">⚠️ 长期恶劣气候是导致种群灭绝的主要原因</p>')
                 elif severe_percentage > 30:
-                    section_html += '<p class="warning">⚠️ 频繁的气候变化增加了生存压力</p>'
+                    parts.append('<p class="warning">⚠️ 频繁的气候变化增加了生存压力</p>')
                 else:
-                    section_html += '<p>气候条件相对稳定，灭绝原因可能在其他因素</p>'
+                    parts.append('<p>气候条件相对稳定，灭绝原因可能在其他因素</p>')
             
-            section_html += '</div>'
+            parts.append('</div>')
         
         # 气候变化对文明发展的影响
-        if hasattr(self, 'tribe_manager') and self.tribe_manager.tribes:
-            section_html += '''
+        if self._has_tribes and self.tribe_manager.tribes:
+            parts.append('''
             <div class="analysis-item">
                 <h3>气候变化对文明发展的影响</h3>
-            '''
+            ''')
             
             tribe_info = self.tribe_manager.get_tribes_info()
-            section_html += f'<p><strong>部落数量:</strong> {tribe_info["total_tribes"]}</p>'
+            parts.append(f'<p><strong>部落数量:</strong> {tribe_info["total_tribes"]}</p>')
             
             if tribe_info["total_tribes"] > 0:
                 civilization_levels = [tribe['civilization_level'] for tribe in tribe_info['tribes'].values()]
-                advanced_tribes = sum(1 for level in civilization_levels if level in ['village', 'town', 'city'])
+                advanced_tribes = sum(1 for level in civilization_levels if level in _ADVANCED_TRIBE_LEVELS)
                 
-                section_html += f'<p><strong>高级文明部落:</strong> {advanced_tribes}/{tribe_info["total_tribes"]}</p>'
+                parts.append(f'<p><strong>高级文明部落:</strong> {advanced_tribes}/{tribe_info["total_tribes"]}</p>')
                 
                 if advanced_tribes == 0:
-                    section_html += '<p class="warning">⚠️ 气候变化可能阻碍了文明发展，没有部落达到高级阶段</p>'
+                    parts.append('<p class="warning">⚠️ 气候变化可能阻碍了文明发展，没有部落达到高级阶段</p>')
                 else:
-                    section_html += '<p>部分部落在气候变化中仍保持了文明发展</p>'
+                    parts.append('<p>部分部落在气候变化中仍保持了文明发展</p>')
             
-            section_html += '</div>'
+            parts.append('</div>')
         
         # 气候变化理论分析
-        section_html += '''
+        parts.append('''
         <div class="analysis-item">
             <h3>气候变化理论分析</h3>
             <p><strong>科学理论基础:</strong></p>
@@ -2712,29 +2869,36 @@ class CogvrsGUI:
                 <li>资源获取困难（极端气候影响资源分布）</li>
             </ul>
         </div>
-        '''
+        ''')
         
-        section_html += '</div>'
-        return section_html
+        parts.append('</div>')
     
-    def _generate_detailed_events_section(self) -> str:
-        """生成详细事件记录章节"""
-        section_html = '''
+    def _write_detailed_events_section(self, parts: List[str]):
+        """生成详细事件记录章节，各片段直接追加到报告的parts列表"""
+        parts.append('''
         <div class="section">
             <h2>📋 详细事件记录</h2>
             <div class="analysis-item">
                 <h3>模拟过程记录</h3>
-        '''
+        ''')
+        
+        # 会话数据各字段只查找一次
+        session_data = self.session_data
+        agent_events = session_data['agent_events']
+        detailed_events = session_data.get('detailed_events', ())
+        tribe_events = session_data.get('tribe_events', ())
+        environmental_events = session_data.get('environmental_events', ())
+        start_time = session_data['start_time']
         
         # 统计不同类型的事件
         event_counts = {
-            'reproduction': len(self.session_data.get('reproduction_events', [])),
-            'agent_death': len([e for e in self.session_data.get('detailed_events', []) if e['type'] == 'agent_death']),
-            'tribe': len(self.session_data.get('tribe_events', [])),
-            'environment': len(self.session_data.get('environmental_events', []))
+            'reproduction': agent_events.count(EVENT_REPRODUCTION),
+            'agent_death': agent_events.count(EVENT_AGENT_DEATH),
+            'tribe': len(tribe_events),
+            'environment': len(environmental_events)
         }
         
-        section_html += f'''
+        parts.append(f'''
                 <p><strong>事件统计:</strong></p>
                 <ul>
                     <li>🍼 繁殖事件: {event_counts['reproduction']} 次</li>
@@ -2742,90 +2906,76 @@ class CogvrsGUI:
                     <li>🏘️ 部落事件: {event_counts['tribe']} 次</li>
                     <li>🌍 环境事件: {event_counts['environment']} 次</li>
                 </ul>
-        '''
+        ''')
         
         # 显示关键事件时间线
-        all_events = self.session_data.get('detailed_events', [])
+        all_events = list(detailed_events) + agent_events.to_dicts()
         if all_events:
-            # 按时间排序并取前20个重要事件
-            sorted_events = sorted(all_events, key=lambda x: x['timestamp'])
-            important_events = [e for e in sorted_events if e['type'] in ['reproduction', 'tribe', 'agent_death']][:20]
+            # 取时间最早的20个重要事件（部分选择，无需整体排序）
+            important_events = heapq.nsmallest(
+                20, (e for e in all_events if e['type'] in _TIMELINE_EVENT_TYPES), key=_GET_TIMESTAMP
+            )
             
-            section_html += '''
+            parts.append('''
                 <h4>关键事件时间线</h4>
                 <div style="max-height: 300px; overflow-y: auto; background: #f9f9f9; padding: 10px; border-radius: 5px;">
-            '''
-            
-            for event in important_events:
-                event_time = event['timestamp'] - self.session_data['start_time']
-                event_icon = {'reproduction': '🍼', 'tribe': '🏘️', 'agent_death': '💀', 'environment': '🌍'}.get(event['type'], '📝')
-                
-                section_html += f'''
-                    <div style="margin: 5px 0; padding: 5px; background: white; border-radius: 3px;">
-                        <strong>[{event_time:.1f}s] {event_icon} {event['description']}</strong>
-                '''
-                
-                # 添加详细信息
-                if event['type'] == 'reproduction' and 'details' in event:
-                    details = event['details']
-                    if isinstance(details, dict):
-                        section_html += f"<br><small>父母: {details.get('parent_id', 'Unknown')}, 代数: {details.get('generation', 0)}</small>"
-                elif event['type'] == 'tribe' and 'details' in event:
-                    details = event['details']
-                    if isinstance(details, dict):
-                        section_html += f"<br><small>成员数: {details.get('member_count', 0)}, 领袖: {details.get('leader_id', 'Unknown')}</small>"
-                elif event['type'] == 'agent_death' and 'details' in event:
-                    details = event['details']
-                    if isinstance(details, dict):
-                        section_html += f"<br><small>死因: {details.get('cause', 'Unknown')}, 年龄: {details.get('age', 0):.1f}</small>"
-                
-                section_html += '</div>'
+            ''')
+            
+            # 每条事件用一个模板格式化为一个片段
+            parts.extend(
+                _TIMELINE_EVENT_FMT % (
+                    event['timestamp'] - start_time,
+                    _EVENT_ICONS.get(event['type'], '📝'),
+                    event['description'],
+                    _format_event_detail(event)
+                )
+                for event in important_events
+            )
             
-            section_html += '</div>'
+            parts.append('</div>')
         
         # 显示繁殖成功率分析
         if event_counts['reproduction'] > 0:
-            section_html += '''
+            parts.append('''
             <div class="analysis-item">
                 <h3>繁殖模式分析</h3>
-            '''
+            ''')
             
-            reproduction_events = self.session_data.get('reproduction_events', [])
-            if reproduction_events:
+            reproduction_records = agent_events.records(EVENT_REPRODUCTION)
+            if len(reproduction_records):
                 # 分析代际分布
-                generations = [e['details'].get('generation', 0) for e in reproduction_events if 'details' in e]
+                generations = reproduction_records['generation'].tolist()
                 if generations:
                     max_generation = max(generations)
                     generation_counts = {}
                     for gen in generations:
                         generation_counts[gen] = generation_counts.get(gen, 0) + 1
                     
-                    section_html += f'<p><strong>进化进展:</strong> 达到第 {max_generation} 代</p>'
-                    section_html += '<p><strong>各代繁殖分布:</strong></p><ul>'
+                    parts.append(f'<p><strong>进化进展:</strong> 达到第 {max_generation} 代</p>')
+                    parts.append('<p><strong>各代繁殖分布:</strong></p><ul>')
                     for gen in sorted(generation_counts.keys()):
-                        section_html += f'<li>第{gen}代: {generation_counts[gen]}次</li>'
-                    section_html += '</ul>'
+                        parts.append(f'<li>第{gen}代: {generation_counts[gen]}次</li>')
+                    parts.append('</ul>')
             
-            section_html += '</div>'
+            parts.append('</div>')
         
         # 显示部落发展历程
         if event_counts['tribe'] > 0:
-            section_html += '''
+            parts.append('''
             <div class="analysis-item">
                 <h3>部落发展历程</h3>
-            '''
+            ''')
             
-            tribe_events = self.session_data.get('tribe_events', [])
             if tribe_events:
                 # 分析部落形成时间分布
-                formation_times = [e['timestamp'] - self.session_data['start_time'] for e in tribe_events]
+                formation_times = [e['timestamp'] - start_time for e in tribe_events]
                 if formation_times:
                     earliest = min(formation_times)
                     latest = max(formation_times)
-                    section_html += f'<p><strong>部落形成时间:</strong> {earliest:.1f}s - {latest:.1f}s</p>'
+                    parts.append(f'<p><strong>部落形成时间:</strong> {earliest:.1f}s - {latest:.1f}s</p>')
                 
                 # 显示部落信息
-                section_html += '<p><strong>已形成的部落:</strong></p><ul>'
+                parts.append('<p><strong>已形成的部落:</strong></p><ul>')
                 for event in tribe_events:
                     if 'details' in event:
                         details = event['details']
@@ -2835,13 +2985,12 @@ class CogvrsGUI:
                         else:
                             tribe_name = 'Unknown'
                             member_count = 0
-                        section_html += f'<li>{tribe_name} - {member_count}成员</li>'
-                section_html += '</ul>'
+                        parts.append(f'<li>{tribe_name} - {member_count}成员</li>')
+                parts.append('</ul>')
             
-            section_html += '</div>'
+            parts.append('</div>')
         
-        section_html += '</div>'
-        return section_html
+        parts.append('</div>')
     
     def _restart_after_extinction(self):
         """灭绝后重启模拟"""
@@ -2864,22 +3013,14 @@ class CogvrsGUI:
         self._add_random_agents(initial_count)
         
         # 重置天气系统（减少恶劣天气）
-        if hasattr(self, 'weather_system'):
+        if self._has_weather:
             self.weather_system.weather_chance *= 0.7  # 减少30%的天气生成概率
             self.weather_system.active_weather.clear()  # 清除当前恶劣天气
         
         # 重置数据收集
-        self.session_data = {
-            'start_time': time.time(),
-            'stats_history': [],
-            'events': [],
-            'agent_lifecycle': [],
-            'performance_metrics': [],
-            'detailed_events': [],  # 新增详细事件记录
-            'tribe_events': [],     # 部落相关事件
-            'reproduction_events': [], # 繁殖事件
-            'environmental_events': []  # 环境事件
-        }
+        self.session_data = self._new_session_data()
+        self._last_ui_key = None
+        self._world_block_cache.clear()
         
         # 恢复运行状态
         self.paused = False
@@ -2894,52 +3035,46 @@ class CogvrsGUI:
     
     def render(self):
         """优化的渲染界面"""
+        # 帧计数在跳过渲染前累加，窗口最小化期间依赖帧计数的逻辑照常推进
         self.frame_count += 1
         
+        # 窗口最小化或被隐藏时没有可见像素，跳过整个渲染流程；恢复后整屏重新提交
+        if not pygame.display.get_active():
+            self._full_redraw = True
+            return
+        
         # 动态跳帧渲染减少负载
         if self.skip_frames > 0:
             self.render_skip_counter += 1
             if self.render_skip_counter % (self.skip_frames + 1) != 0:
                 # 仅更新UI，跳过世界渲染
                 self.ui_manager.draw_ui(self.screen)
+                self.dirty_rects.append(self._panel_rect)
                 return
         
-        # 使用后台缓冲区渲染
-        self.back_buffer.fill((15, 15, 25))
-        
-        # 渲染世界视图
-        world_surface = pygame.Surface((self.world_view_width, self.world_view_height))
+        # 渲染世界视图（复用持久画布，只清屏不重新分配）
+        world_surface = self._world_surface
+        world_surface.fill((0, 0, 0))
         
         # 选择渲染模式
-        if self.enable_multi_scale and hasattr(self, 'multi_scale_mode') and self.multi_scale_mode:
+        if self.multi_scale_mode:
             # 多尺度渲染
             self._render_multi_scale(world_surface)
         else:
             # 传统渲染
             self._render_legacy(world_surface)
         
-        # 绘制到后台缓冲区
+        # 绘制到后台缓冲区（边框和面板已在缓冲区重建时绘制）
         self.back_buffer.blit(world_surface, (10, 10))
         
-        # 绘制边框和面板
-        pygame.draw.rect(
-            self.back_buffer, (100, 100, 100),
-            (8, 8, self.world_view_width + 4, self.world_view_height + 4), 2
-        )
-        
-        # 绘制右侧面板区域
-        panel_rect = pygame.Rect(self.world_view_width + 20, 0, self.panel_width - 20, self.window_height)
-        pygame.draw.rect(self.back_buffer, (25, 25, 35), panel_rect)
-        pygame.draw.rect(self.back_buffer, (60, 60, 80), panel_rect, 2)
-        
         # 更新UI信息
         current_time = time.time()
         if current_time - self.last_stats_update >= self.stats_update_interval:
-            self._update_ui_info()
-            
-            # 更新标签页内容
-            if hasattr(self, 'active_tab'):
-                if self.active_tab == 'tribes':
+            with self._state_lock:
+                # 只更新当前可见标签页的内容
+                if self.active_tab == 'control':
+                    self._update_ui_info()
+                elif self.active_tab == 'tribes':
                     self._update_tribes_tab()
                 elif self.active_tab == 'disasters':
                     self._update_disasters_tab()
@@ -2948,16 +3083,24 @@ class CogvrsGUI:
             
             self.last_stats_update = current_time
         
-        # 将后台缓冲区内容复制到屏幕
-        self.screen.blit(self.back_buffer, (0, 0))
+        # 将后台缓冲区内容复制到屏幕：首帧/窗口变化后整屏，其余只复制世界视图和面板
+        if self._full_redraw:
+            self.screen.blit(self.back_buffer, (0, 0))
+            self.dirty_rects.append(self.screen.get_rect())
+            self._full_redraw = False
+        else:
+            frame_rects = self._frame_rects
+            for rect in frame_rects:
+                self.screen.blit(self.back_buffer, rect, rect)
+            self.dirty_rects.extend(frame_rects)
         
-        # 渲染GUI元素到屏幕
+        # 渲染GUI元素到屏幕（UI元素都位于面板或世界视图内，已包含在上面的脏矩形中）
         self.ui_manager.draw_ui(self.screen)
     
     def _render_multi_scale(self, surface: pygame.Surface):
         """多尺度渲染"""
         # 准备世界状态数据
-        world_state = self._prepare_world_state_for_multi_scale()
+        world_state = self._get_render_world_state()
         
         # 使用多尺度渲染管道
         dt = self.clock.get_time() / 1000.0  # 转换为秒
@@ -2965,6 +3108,12 @@ class CogvrsGUI:
     
     def _render_legacy(self, surface: pygame.Surface):
         """传统渲染模式"""
+        # 传统渲染器直接读取智能体对象，需与模拟线程互斥
+        with self._state_lock:
+            self._render_legacy_locked(surface)
+    
+    def _render_legacy_locked(self, surface: pygame.Surface):
+        """传统渲染模式（调用方持有状态锁）"""
         original_screen = self.world_renderer.screen
         self.world_renderer.screen = surface
         
@@ -2973,7 +3122,7 @@ class CogvrsGUI:
         time_info = self.time_manager.get_time_stats()
         
         # 添加部落数据到世界状态（类似多尺度渲染）
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
+        if self._has_tribes:
             tribe_data = self.tribe_manager.get_visualization_data()
             world_state['tribes'] = tribe_data
             
@@ -2988,149 +3137,252 @@ class CogvrsGUI:
         
         self.world_renderer.screen = original_screen
     
+    def _get_render_world_state(self) -> Dict:
+        """获取用于渲染和交互的世界状态：线程模式下读取前缓冲快照"""
+        if self.threaded_simulation:
+            with self._state_lock:
+                world_state = self._state_front
+                if world_state is None:
+                    world_state = self._prepare_world_state_for_multi_scale()
+                    self._state_front = world_state
+            return world_state
+        return self._prepare_world_state_for_multi_scale()
+    
+    def _sim_loop(self):
+        """模拟线程：推进世界状态并发布快照（不调用任何pygame接口）"""
+        interval = 1.0 / max(1, self.sim_fps)
+        last_time = time.perf_counter()
+        
+        while self.running:
+            start = time.perf_counter()
+            dt = start - last_time
+            last_time = start
+            
+            if not self.paused:
+                # 只在修改/读取世界状态期间持有锁，帧率控制的休眠放在锁外
+                state_back = None
+                with self._state_lock:
+                    self.update_simulation(dt)
+                    if self.enable_multi_scale:
+                        # 在后缓冲中构建快照
+                        state_back = self._prepare_world_state_for_multi_scale()
+                if state_back is not None:
+                    # 与前缓冲交换（单次引用赋值）
+                    self._state_front = state_back
+            
+            # 超时的步也让出一次，避免释放锁后立即重新获取而饿死渲染线程
+            elapsed = time.perf_counter() - start
+            time.sleep(max(0.0, interval - elapsed))
+    
+    def _start_sim_thread(self):
+        """启动独立的模拟线程"""
+        self._sim_thread = threading.Thread(target=self._sim_loop, name="cogvrs-sim", daemon=True)
+        self._sim_thread.start()
+        logger.info("Simulation thread started")
+    
+    def _scaled_agent_views(self, agents: List[SimpleAgent], positions: list) -> List[_ScaledAgent]:
+        """
+        返回多尺度渲染使用的智能体副本
+        
+        线程模式下每个快照需要独立的副本，供渲染线程在锁外读取；单线程模式下
+        世界状态在同一帧内构建和使用，按agent_id复用上一帧的副本并原地更新，
+        不再逐帧分配对象，被选中/跟随的对象也会随智能体继续更新。
+        """
+        if self.threaded_simulation:
+            return [_ScaledAgent(agent, Vector2D(x, y)) for agent, (x, y) in zip(agents, positions)]
+        
+        pool = self._scaled_agent_pool
+        next_pool = {}
+        views = []
+        for agent, (x, y) in zip(agents, positions):
+            view = pool.get(agent.agent_id)
+            if view is None:
+                view = _ScaledAgent(agent, Vector2D(x, y))
+            else:
+                view.refresh(agent)
+                position = view.position
+                position.x = x
+                position.y = y
+            next_pool[view.agent_id] = view
+            views.append(view)
+        
+        # 只保留本帧仍存在的智能体
+        self._scaled_agent_pool = next_pool
+        return views
+    
+    def _cached_world_block(self, name: str, producer):
+        """返回缓存的世界状态子块，每 world_block_cache_steps 步才重新调用producer生成"""
+        bucket = self.time_manager.current_step // self.world_block_cache_steps
+        entry = self._world_block_cache.get(name)
+        if entry is None or entry[0] != bucket:
+            entry = (bucket, producer())
+            self._world_block_cache[name] = entry
+        return entry[1]
+    
+    def _select_world_state_stages(self) -> list:
+        """
+        按已存在的子系统挑选世界状态构建阶段
+        
+        子系统在初始化后不再增减，构建世界状态时只依次调用选中的阶段，
+        每帧不再重复判断哪些子系统存在。
+        """
+        stages = [self._world_state_agents_stage]
+        if self.environment_manager is not None:
+            stages.append(self._world_state_environment_stage)
+        # 使用气候系统而非天气系统（提高性能）
+        if self._has_climate:
+            stages.append(self._world_state_climate_stage)
+        elif self._has_weather:
+            stages.append(self._world_state_weather_stage)
+        else:
+            stages.append(self._world_state_no_weather_stage)
+        if self.terrain_system is not None:
+            stages.append(self._world_state_terrain_stage)
+        if self._has_tribes:
+            stages.append(self._world_state_tribes_stage)
+        else:
+            stages.append(self._world_state_no_tribes_stage)
+        if self.interaction_controller is not None:
+            stages.append(self._world_state_display_options_stage)
+        return stages
+    
     def _prepare_world_state_for_multi_scale(self) -> Dict:
         """为多尺度渲染准备世界状态数据"""
         # 获取基础世界状态
         world_state = self.world.get_visualization_data()
-        time_info = self.time_manager.get_time_stats()
         
-        # 坐标转换：将智能体从100x100坐标系转换到800x800坐标系
+        # 坐标转换：将100x100坐标系转换到800x800坐标系
         display_scale = 8
-        scaled_agents = []
-        for agent in self.agents:
-            # 创建智能体的副本，调整坐标
-            scaled_agent = type('ScaledAgent', (), {})()
-            for attr in ['energy', 'health', 'max_health', 'agent_id', 'age', 'alive']:
-                if hasattr(agent, attr):
-                    setattr(scaled_agent, attr, getattr(agent, attr))
-            
-            # 转换位置坐标
-            scaled_agent.position = Vector2D(
-                agent.position.x * display_scale,
-                agent.position.y * display_scale
-            )
-            
-            # 添加部落信息（如果有）
-            if hasattr(agent, 'tribe_id'):
-                scaled_agent.tribe_id = agent.tribe_id
-            if hasattr(agent, 'tribe_name'):
-                scaled_agent.tribe_name = agent.tribe_name
-            if hasattr(agent, 'tribe_color'):
-                scaled_agent.tribe_color = agent.tribe_color
-            
-            scaled_agents.append(scaled_agent)
+        for stage in self._world_state_stages:
+            stage(world_state, display_scale)
+        return world_state
+    
+    def _world_state_agents_stage(self, world_state: Dict, display_scale: float):
+        """智能体和资源坐标换算，以及步数/帧率"""
+        agents = self.agents
+        if self._render_alpha < 1.0 and self._prev_agent_positions and not self.threaded_simulation:
+            agent_points = self._interpolated_agent_points(agents)
+        else:
+            agent_points = ((a.position.x, a.position.y) for a in agents)
+        agent_positions = _scale_points(agent_points, len(agents), display_scale)
+        scaled_agents = self._scaled_agent_views(agents, agent_positions)
         
-        # 转换资源坐标
+        # 转换资源坐标（世界返回的资源为 (x, y, type, amount) 元组，整体向量化缩放）
         original_resources = world_state.get('resources', [])
-        scaled_resources = []
-        for resource in original_resources:
-            if isinstance(resource, tuple):
-                scaled_resources.append((resource[0] * display_scale, resource[1] * display_scale))
-            else:
-                # 如果是对象，创建新的位置
-                scaled_resource = type('ScaledResource', (), {})()
-                for attr in dir(resource):
-                    if not attr.startswith('_'):
-                        setattr(scaled_resource, attr, getattr(resource, attr))
-                scaled_resource.position = Vector2D(
+        if original_resources and isinstance(original_resources[0], tuple):
+            scaled_resources = list(map(tuple, _scale_points(
+                ((r[0], r[1]) for r in original_resources), len(original_resources), display_scale
+            )))
+        else:
+            scaled_resources = []
+            for resource in original_resources:
+                # 如果是对象，复制数据属性并换算位置
+                scaled_resources.append(_ScaledResource(resource, Vector2D(
                     resource.position.x * display_scale,
                     resource.position.y * display_scale
-                )
-                scaled_resources.append(scaled_resource)
+                )))
         
         # 更新世界状态
         world_state['agents'] = scaled_agents
         world_state['resources'] = scaled_resources
         world_state['current_step'] = self.time_manager.current_step
-        world_state['fps'] = time_info.get('actual_fps', 0)
-        
-        # 添加环境数据（需要坐标转换）
-        if hasattr(self, 'environment_manager'):
-            world_state['environment_zones'] = self.environment_manager.zones
-            world_state['environment_status'] = self.environment_manager.get_environment_status()
-        
-        # 使用气候系统而非天气系统（提高性能）
-        if hasattr(self, 'environment_manager') and hasattr(self.environment_manager, 'climate_system'):
-            # 添加气候系统信息用于可视化
-            climate_data = self.environment_manager.climate_system.get_visualization_data()
-            world_state['climate_data'] = climate_data
-            world_state['active_weather'] = []  # 清空天气数据，使用气候数据
-        elif hasattr(self, 'weather_system') and self.weather_system:
-            # 回退到天气系统（如果没有启用气候系统）
-            active_weather = self.weather_system.get_active_weather_info()
-            if active_weather:
-                scaled_weather = []
-                for weather_info in active_weather:
-                    scaled_weather_info = weather_info.copy()
-                    # 转换天气中心坐标
-                    if 'center' in scaled_weather_info:
-                        center = scaled_weather_info['center']
-                        scaled_weather_info['center'] = (
-                            center[0] * display_scale,
-                            center[1] * display_scale
-                        )
-                    # 转换天气影响半径
-                    if 'radius' in scaled_weather_info:
-                        scaled_weather_info['radius'] = scaled_weather_info['radius'] * display_scale
-                    
-                    scaled_weather.append(scaled_weather_info)
-                world_state['active_weather'] = scaled_weather
-            else:
-                world_state['active_weather'] = []
-        else:
-            world_state['active_weather'] = []
-        
-        if hasattr(self, 'terrain_system'):
-            world_state['terrain_features'] = self.terrain_system.get_terrain_info()
-        
-        # 添加部落数据
-        if hasattr(self, 'tribe_manager') and self.tribe_manager:
-            tribe_data = self.tribe_manager.get_visualization_data()
-            scaled_tribes = []
-            
-            for tribe_info in tribe_data:
-                scaled_tribe = tribe_info.copy()
-                # 转换部落中心坐标
-                center = scaled_tribe['center']
-                scaled_tribe['center'] = (center[0] * display_scale, center[1] * display_scale)
-                # 转换领土半径
-                scaled_tribe['radius'] = scaled_tribe['radius'] * display_scale
-                # 转换成员位置
-                scaled_members = []
-                for member_pos in scaled_tribe['members']:
-                    scaled_members.append((member_pos[0] * display_scale, member_pos[1] * display_scale))
-                scaled_tribe['members'] = scaled_members
-                
-                scaled_tribes.append(scaled_tribe)
-            
-            world_state['tribes'] = scaled_tribes
-            
-            # 添加部落间交互数据
-            interactions = self.tribe_manager.get_tribe_interactions()
-            scaled_interactions = []
-            
-            for interaction in interactions:
-                scaled_interaction = interaction.copy()
-                # 转换交互位置坐标
-                center_a = scaled_interaction['center_a']
-                center_b = scaled_interaction['center_b']
-                scaled_interaction['center_a'] = (center_a[0] * display_scale, center_a[1] * display_scale)
-                scaled_interaction['center_b'] = (center_b[0] * display_scale, center_b[1] * display_scale)
-                scaled_interaction['distance'] = scaled_interaction['distance'] * display_scale
-                
-                scaled_interactions.append(scaled_interaction)
-            
-            world_state['tribe_interactions'] = scaled_interactions
-        else:
-            world_state['tribes'] = []
-            world_state['tribe_interactions'] = []
+        world_state['fps'] = self.time_manager.get_time_stats().get('actual_fps', 0)
+        # 版本标记：世界未推进且插值系数不变时，智能体位置与上次构建的世界状态相同
+        world_state['tick'] = (self._world_version, self._render_alpha)
+    
+    def _world_state_environment_stage(self, world_state: Dict, display_scale: float):
+        """环境区域和环境状态"""
+        world_state['environment_zones'] = self.environment_manager.zones
+        world_state['environment_status'] = self._cached_world_block(
+            'environment_status', self.environment_manager.get_environment_status
+        )
+    
+    def _world_state_climate_stage(self, world_state: Dict, display_scale: float):
+        """气候系统可视化数据（不使用天气数据）"""
+        world_state['climate_data'] = self._cached_world_block(
+            'climate_data', self.environment_manager.climate_system.get_visualization_data
+        )
+        world_state['active_weather'] = []  # 清空天气数据，使用气候数据
+    
+    def _world_state_weather_stage(self, world_state: Dict, display_scale: float):
+        """回退到天气系统（未启用气候系统时）"""
+        # 天气系统每次调用都返回新建的字典，直接原地换算坐标，无需复制
+        active_weather = self.weather_system.get_active_weather_info()
+        for weather_info in active_weather:
+            # 转换天气中心坐标
+            if 'center' in weather_info:
+                center = weather_info['center']
+                weather_info['center'] = (
+                    center[0] * display_scale,
+                    center[1] * display_scale
+                )
+            # 转换天气影响半径
+            if 'radius' in weather_info:
+                weather_info['radius'] *= display_scale
+        world_state['active_weather'] = active_weather
+    
+    def _world_state_no_weather_stage(self, world_state: Dict, display_scale: float):
+        """无气候和天气系统"""
+        world_state['active_weather'] = []
+    
+    def _world_state_terrain_stage(self, world_state: Dict, display_scale: float):
+        """地形特征"""
+        world_state['terrain_features'] = self._cached_world_block(
+            'terrain_features', self.terrain_system.get_terrain_info
+        )
+    
+    def _world_state_tribes_stage(self, world_state: Dict, display_scale: float):
+        """部落和部落间交互数据"""
+        tribe_data = self.tribe_manager.get_visualization_data()
+        
+        # 所有部落中心和成员位置合并为一个数组一次缩放，再按成员数切分回各部落
+        tribe_count = len(tribe_data)
+        member_counts = [len(tribe_info['members']) for tribe_info in tribe_data]
+        points = _scale_points(
+            itertools.chain(
+                (tribe_info['center'] for tribe_info in tribe_data),
+                itertools.chain.from_iterable(tribe_info['members'] for tribe_info in tribe_data)
+            ),
+            tribe_count + sum(member_counts), display_scale
+        )
         
-        # 添加显示选项
-        if hasattr(self, 'interaction_controller'):
-            control_state = self.interaction_controller.get_control_state()
-            world_state.update(control_state['display_options'])
+        # 部落管理器每次调用都返回新建的字典，直接原地写入换算后的坐标，无需复制
+        offset = tribe_count
+        for tribe_info, center, member_count in zip(tribe_data, points, member_counts):
+            tribe_info['center'] = tuple(center)
+            # 转换领土半径
+            tribe_info['radius'] *= display_scale
+            tribe_info['members'] = list(map(tuple, points[offset:offset + member_count]))
+            offset += member_count
+        
+        world_state['tribes'] = tribe_data
+        
+        # 添加部落间交互数据
+        interactions = self.tribe_manager.get_tribe_interactions()
+        
+        # 每个交互的两个中心点按 (a, b) 顺序排列，一次缩放
+        centers = _scale_points(
+            itertools.chain.from_iterable(
+                (interaction['center_a'], interaction['center_b']) for interaction in interactions
+            ),
+            2 * len(interactions), display_scale
+        )
+        for index, interaction in enumerate(interactions):
+            interaction['center_a'] = tuple(centers[2 * index])
+            interaction['center_b'] = tuple(centers[2 * index + 1])
+            interaction['distance'] *= display_scale
         
-        return world_state
+        world_state['tribe_interactions'] = interactions
+    
+    def _world_state_no_tribes_stage(self, world_state: Dict, display_scale: float):
+        """未启用部落系统"""
+        world_state['tribes'] = []
+        world_state['tribe_interactions'] = []
+    
+    def _world_state_display_options_stage(self, world_state: Dict, display_scale: float):
+        """交互控制器的显示选项"""
+        control_state = self.interaction_controller.get_control_state()
+        world_state.update(control_state['display_options'])
     
     def run(self):
         """运行主循环"""
@@ -3142,20 +3394,26 @@ class CogvrsGUI:
         last_log_time = 0
         log_interval = 5.0  # 每5秒输出一次状态
         
+        if self.threaded_simulation:
+            self._start_sim_thread()
+        
         try:
             while self.running:
-                dt = self.clock.tick(self.target_fps) / 1000.0
+                # 暂停时降低帧率以节省CPU
+                dt = self.clock.tick(_PAUSED_FPS if self.paused else self.target_fps) / 1000.0
                 current_time = time.time()
                 
                 # 处理事件
                 self.handle_events()
                 
-                # 更新模拟
-                self.update_simulation(dt)
+                # 更新模拟（线程模式下由模拟线程负责）
+                if not self.threaded_simulation and not self.paused:
+                    self._advance_simulation(dt)
                 
                 # 输出详细状态信息
                 if current_time - last_log_time >= log_interval:
-                    self._print_simulation_status()
+                    with self._state_lock:
+                        self._print_simulation_status()
                     last_log_time = current_time
                 
                 # 更新UI
@@ -3164,8 +3422,9 @@ class CogvrsGUI:
                 # 渲染
                 self.render()
                 
-                # 使用flip确保双缓冲正常工作
-                pygame.display.flip()
+                # 只提交本帧的脏矩形区域
+                pygame.display.update(self.dirty_rects)
+                self.dirty_rects.clear()
         
         except KeyboardInterrupt:
             logger.info("Received keyboard interrupt")
@@ -3177,12 +3436,63 @@ class CogvrsGUI:
         finally:
             self.cleanup()
     
+    def _advance_simulation(self, frame_dt: float):
+        """
+        按固定步长推进模拟
+        
+        真实帧时间累积到 _sim_accumulator，每满一个 _sim_dt 执行一次模拟步，
+        单帧最多追赶 _max_sim_steps 步以免卡顿后连锁变慢。剩余时间占步长的比例
+        作为渲染插值系数，智能体在上一步与当前步的位置之间插值绘制。
+        """
+        if not self.fixed_timestep:
+            self.update_simulation(frame_dt)
+            self._render_alpha = 1.0
+            return
+        
+        sim_dt = self._sim_dt
+        accumulator = min(self._sim_accumulator + frame_dt, sim_dt * self._max_sim_steps)
+        steps = int(accumulator // sim_dt)
+        for step in range(steps):
+            if step == steps - 1:
+                # 只有最后一步之前的位置参与插值（仅多尺度渲染使用）
+                self._prev_agent_positions = {
+                    agent.agent_id: (agent.position.x, agent.position.y) for agent in self.agents
+                } if self.multi_scale_mode else {}
+            self.update_simulation(sim_dt)
+        
+        self._sim_accumulator = accumulator - steps * sim_dt
+        self._render_alpha = self._sim_accumulator / sim_dt
+    
+    def _interpolated_agent_points(self, agents: List[SimpleAgent]):
+        """生成智能体在上一步与当前步之间按 _render_alpha 插值的位置"""
+        alpha = self._render_alpha
+        prev_positions = self._prev_agent_positions
+        # 环形边界上的跨边跳变不插值，直接使用当前位置
+        max_jump = min(self.world.width, self.world.height) * 0.5
+        for agent in agents:
+            x = agent.position.x
+            y = agent.position.y
+            prev = prev_positions.get(agent.agent_id)
+            if prev is not None:
+                dx = x - prev[0]
+                dy = y - prev[1]
+                if abs(dx) < max_jump and abs(dy) < max_jump:
+                    x = prev[0] + dx * alpha
+                    y = prev[1] + dy * alpha
+            yield x, y
+    
     def cleanup(self):
         """清理资源"""
+        # 停止模拟线程
+        self.running = False
+        if self._sim_thread is not None:
+            self._sim_thread.join(timeout=2.0)
+            self._sim_thread = None
+        
         # 生成HTML报告
         try:
             if len(self.session_data['stats_history']) > 0:
-                report_path = self._generate_html_report()
+                report_path = self._generate_html_report().result()
                 print(f"\n📊 HTML报告已生成: {report_path}")
                 print(f"🌐 在浏览器中打开查看详细分析")
                 logger.info(f"Generated HTML report: {report_path}")
@@ -3191,6 +3501,8 @@ class CogvrsGUI:
         except Exception as e:
             logger.error(f"Failed to generate HTML report: {e}")
             print(f"\n❌ 报告生成失败: {e}")
+        finally:
+            self._report_executor.shutdown(wait=True)
         
         # 关闭事件记录器
         if hasattr(self, 'event_logger') and self.event_logger:
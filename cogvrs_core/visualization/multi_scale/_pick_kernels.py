@@ -0,0 +1,33 @@
+"""
+Cogvrs - Pick Kernels
+点选内核：在SoA坐标数组上查找列表顺序中第一个落在点选半径内的对象
+
+编译后的单遍循环命中即返回，不分配临时数组；未安装numba时使用等价的NumPy实现。
+
+Author: Ben Hsu & Claude
+"""
+
+import numpy as np
+
+from .._numba_compat import njit_or_none
+
+
+def _first_within_loop(xs, ys, x, y, r2):
+    """返回第一个与 (x, y) 平方距离不超过r2的下标，没有则返回-1（供numba编译）"""
+    for i in range(xs.shape[0]):
+        dx = xs[i] - x
+        dy = ys[i] - y
+        if dx * dx + dy * dy <= r2:
+            return i
+    return -1
+
+
+def _first_within_numpy(xs, ys, x, y, r2):
+    """NumPy向量化回退实现，语义与循环内核一致"""
+    dx = xs - x
+    dy = ys - y
+    hits = np.flatnonzero(dx * dx + dy * dy <= r2)
+    return int(hits[0]) if len(hits) else -1
+
+
+first_within_index = njit_or_none(_first_within_loop) or _first_within_numpy
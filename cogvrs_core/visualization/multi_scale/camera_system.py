@@ -5,8 +5,11 @@ Camera System - 相机系统
 Author: Ben Hsu & Claude
 """
 
+import heapq
 import math
+from operator import attrgetter
 from typing import Tuple, Optional, List
+import numpy as np
 import pygame
 import logging
 
@@ -15,12 +18,26 @@ from ...core.physics_engine import Vector2D
 logger = logging.getLogger(__name__)
 
 
+def _smooth_step(px, py, tx, ty, smooth_factor, dt):
+    """
+    在标量坐标上向目标位置平滑移动一步，不分配Vector2D临时对象
+
+    返回 (x, y, moved)；距离不超过0.1时保持原位，moved为False
+    """
+    dx = tx - px
+    dy = ty - py
+    if dx * dx + dy * dy <= 0.01:
+        return px, py, False
+    step = smooth_factor * dt
+    return px + dx * step, py + dy * step, True
+
+
 class Camera:
     """相机类 - 处理视角和坐标转换"""
     
     def __init__(self, world_size: Tuple[int, int], screen_size: Tuple[int, int]):
         self.world_size = world_size
-        self.screen_size = screen_size
+        self.screen_size = screen_size  # 同时缓存屏幕半宽半高
         
         # 相机位置（世界坐标）
         self.position = Vector2D(world_size[0] / 2, world_size[1] / 2)
@@ -45,37 +62,75 @@ class Camera:
         
         logger.debug(f"Camera initialized: world={world_size}, screen={screen_size}")
     
+    @property
+    def screen_size(self) -> Tuple[int, int]:
+        return self._screen_size
+    
+    @screen_size.setter
+    def screen_size(self, size: Tuple[int, int]):
+        self._screen_size = size
+        self._half_width = size[0] * 0.5
+        self._half_height = size[1] * 0.5
+        self._extent_zoom = None
+    
+    def _view_half_extent(self) -> Tuple[float, float]:
+        """可见区域的半宽半高（世界坐标），仅在缩放或屏幕尺寸变化时重新计算"""
+        if self._extent_zoom != self.zoom:
+            self._extent_zoom = self.zoom
+            self._half_extent = (self._half_width / self.zoom, self._half_height / self.zoom)
+        return self._half_extent
+    
+    def world_to_screen_xy(self, x: float, y: float) -> Tuple[float, float]:
+        """世界坐标转屏幕坐标（标量版本，不分配Vector2D）"""
+        position = self.position
+        zoom = self.zoom
+        return ((x - position.x) * zoom + self._half_width,
+                (y - position.y) * zoom + self._half_height)
+    
+    def world_to_screen_px(self, x: float, y: float) -> Tuple[int, int]:
+        """世界坐标转整数像素坐标，用作绘制/blit目标（浮点只保留在世界坐标中）"""
+        position = self.position
+        zoom = self.zoom
+        return (int((x - position.x) * zoom + self._half_width),
+                int((y - position.y) * zoom + self._half_height))
+    
+    def screen_to_world_xy(self, x: float, y: float) -> Tuple[float, float]:
+        """屏幕坐标转世界坐标（标量版本，不分配Vector2D）"""
+        position = self.position
+        zoom = self.zoom
+        return ((x - self._half_width) / zoom + position.x,
+                (y - self._half_height) / zoom + position.y)
+    
+    def world_to_screen_batch(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量世界坐标转屏幕坐标（xs/ys为同长度数组，相机参数按float32参与运算，不提升输入精度）"""
+        zoom = np.float32(self.zoom)
+        return ((xs - np.float32(self.position.x)) * zoom + np.float32(self._half_width),
+                (ys - np.float32(self.position.y)) * zoom + np.float32(self._half_height))
+    
+    def world_to_screen_px_batch(self, xs: np.ndarray, ys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """批量世界坐标转整数像素坐标（向零取整，与 world_to_screen_px 一致）"""
+        screen_xs, screen_ys = self.world_to_screen_batch(xs, ys)
+        return screen_xs.astype(np.int32), screen_ys.astype(np.int32)
+    
+    def visible_mask_batch(self, xs: np.ndarray, ys: np.ndarray, radius=0) -> np.ndarray:
+        """批量可见性检查，返回布尔数组（radius可为标量或同长度数组）"""
+        half_width, half_height = self._view_half_extent()
+        dx = np.abs(xs - np.float32(self.position.x))
+        dy = np.abs(ys - np.float32(self.position.y))
+        return (dx <= np.float32(half_width + radius)) & (dy <= np.float32(half_height + radius))
+    
     def world_to_screen(self, world_pos: Vector2D) -> Vector2D:
         """世界坐标转屏幕坐标"""
-        # 计算相对于相机的位置
-        relative_pos = world_pos - self.position
-        
-        # 应用缩放
-        scaled_pos = relative_pos * self.zoom
-        
-        # 转换到屏幕中心
-        screen_x = scaled_pos.x + self.screen_size[0] / 2
-        screen_y = scaled_pos.y + self.screen_size[1] / 2
-        
-        return Vector2D(screen_x, screen_y)
+        return Vector2D(*self.world_to_screen_xy(world_pos.x, world_pos.y))
     
     def screen_to_world(self, screen_pos: Vector2D) -> Vector2D:
         """屏幕坐标转世界坐标"""
-        # 转换到相机坐标系
-        camera_x = screen_pos.x - self.screen_size[0] / 2
-        camera_y = screen_pos.y - self.screen_size[1] / 2
-        
-        # 逆向缩放
-        world_relative = Vector2D(camera_x / self.zoom, camera_y / self.zoom)
-        
-        # 加上相机位置
-        return self.position + world_relative
+        return Vector2D(*self.screen_to_world_xy(screen_pos.x, screen_pos.y))
     
     def get_visible_area(self) -> pygame.Rect:
         """获取可见区域（世界坐标）"""
         # 计算可见区域的半宽半高
-        half_width = (self.screen_size[0] / 2) / self.zoom
-        half_height = (self.screen_size[1] / 2) / self.zoom
+        half_width, half_height = self._view_half_extent()
         
         # 计算边界
         left = self.position.x - half_width
@@ -86,18 +141,11 @@ class Camera:
         return pygame.Rect(left, top, width, height)
     
     def is_visible(self, world_pos: Vector2D, radius: float = 0) -> bool:
-        """检查世界坐标点是否在可见区域内"""
-        visible_area = self.get_visible_area()
-        
-        # 扩展检查区域（考虑对象半径）
-        expanded_area = pygame.Rect(
-            visible_area.left - radius,
-            visible_area.top - radius,
-            visible_area.width + radius * 2,
-            visible_area.height + radius * 2
-        )
-        
-        return expanded_area.collidepoint(world_pos.x, world_pos.y)
+        """检查世界坐标点是否在可见区域内（考虑对象半径）"""
+        half_width, half_height = self._view_half_extent()
+        position = self.position
+        return (abs(world_pos.x - position.x) <= half_width + radius and
+                abs(world_pos.y - position.y) <= half_height + radius)
     
     def move_to(self, world_pos: Vector2D, smooth: bool = True):
         """移动相机到指定位置"""
@@ -112,6 +160,11 @@ class Camera:
         new_pos = (self.target_position if smooth else self.position) + offset
         self.move_to(new_pos, smooth)
     
+    def move_by_xy(self, dx: float, dy: float, smooth: bool = True):
+        """相对移动相机（标量版本，调用方无需构造偏移Vector2D）"""
+        base = self.target_position if smooth else self.position
+        self.move_to(Vector2D(base.x + dx, base.y + dy), smooth)
+    
     def set_zoom(self, zoom_level: float, smooth: bool = True):
         """设置缩放级别"""
         zoom_level = max(0.01, min(10.0, zoom_level))  # 限制缩放范围
@@ -143,10 +196,13 @@ class Camera:
             target_pos = Vector2D(self.follow_target.position.x, self.follow_target.position.y)
             self.target_position = target_pos
         
-        # 平滑移动到目标位置
-        if (self.position - self.target_position).magnitude() > 0.1:
-            movement = (self.target_position - self.position) * self.smooth_factor * dt
-            self.position = self.position + movement
+        # 平滑移动到目标位置（标量内核，距离不超过0.1时不移动）
+        position = self.position
+        target = self.target_position
+        x, y, moved = _smooth_step(position.x, position.y, target.x, target.y,
+                                  self.smooth_factor, dt)
+        if moved:
+            self.position = Vector2D(x, y)
         
         # 平滑缩放到目标级别
         if abs(self.zoom - self.target_zoom) > 0.001:
@@ -232,25 +288,25 @@ class CameraSystem:
     
     def handle_keyboard_input(self, keys_pressed, scale_manager) -> bool:
         """处理键盘输入"""
-        camera_moved = False
         movement_speed = scale_manager.get_camera_speed()
         
-        # WASD 移动
-        movement = Vector2D(0, 0)
+        # WASD 移动（标量累加，只有实际移动时才构建Vector2D）
+        move_x = 0.0
+        move_y = 0.0
         if keys_pressed[pygame.K_w] or keys_pressed[pygame.K_UP]:
-            movement.y -= movement_speed
+            move_y -= movement_speed
         if keys_pressed[pygame.K_s] or keys_pressed[pygame.K_DOWN]:
-            movement.y += movement_speed
+            move_y += movement_speed
         if keys_pressed[pygame.K_a] or keys_pressed[pygame.K_LEFT]:
-            movement.x -= movement_speed
+            move_x -= movement_speed
         if keys_pressed[pygame.K_d] or keys_pressed[pygame.K_RIGHT]:
-            movement.x += movement_speed
+            move_x += movement_speed
         
-        if movement.magnitude() > 0:
-            self.main_camera.move_by(movement)
-            camera_moved = True
+        if move_x or move_y:
+            self.main_camera.move_by(Vector2D(move_x, move_y))
+            return True
         
-        return camera_moved
+        return False
     
     def handle_mouse_input(self, event: pygame.event.Event, scale_manager) -> bool:
         """处理鼠标输入"""
@@ -262,7 +318,7 @@ class CameraSystem:
             
             # 获取鼠标位置作为缩放中心
             mouse_pos = pygame.mouse.get_pos()
-            world_mouse_pos = self.main_camera.screen_to_world(Vector2D(mouse_pos[0], mouse_pos[1]))
+            world_mouse_pos = Vector2D(*self.main_camera.screen_to_world_xy(mouse_pos[0], mouse_pos[1]))
             
             # 缩放
             old_zoom = self.main_camera.zoom
@@ -285,7 +341,7 @@ class CameraSystem:
             if event.button == 2:  # 中键
                 # 中键点击居中
                 mouse_pos = pygame.mouse.get_pos()
-                world_pos = self.main_camera.screen_to_world(Vector2D(mouse_pos[0], mouse_pos[1]))
+                world_pos = Vector2D(*self.main_camera.screen_to_world_xy(mouse_pos[0], mouse_pos[1]))
                 self.main_camera.move_to(world_pos)
                 handled = True
         
@@ -296,15 +352,18 @@ class CameraSystem:
         if not agents:
             return
         
-        # 计算包围盒
-        min_x = min(agent.position.x for agent in agents)
-        max_x = max(agent.position.x for agent in agents)
-        min_y = min(agent.position.y for agent in agents)
-        max_y = max(agent.position.y for agent in agents)
+        # 计算包围盒（一次提取 (N, 2) 位置数组后整体归约）
+        positions = np.fromiter(
+            (c for agent in agents for c in (agent.position.x, agent.position.y)),
+            dtype=np.float32, count=2 * len(agents)
+        ).reshape(-1, 2)
+        mins = positions.min(axis=0)
+        maxs = positions.max(axis=0)
         
         # 计算中心和半径
-        center = Vector2D((min_x + max_x) / 2, (min_y + max_y) / 2)
-        radius = max((max_x - min_x) / 2, (max_y - min_y) / 2)
+        center_x, center_y = ((mins + maxs) * 0.5).tolist()
+        center = Vector2D(center_x, center_y)
+        radius = float(((maxs - mins) * 0.5).max())
         
         # 确保最小半径
         radius = max(radius, 50)
@@ -336,15 +395,19 @@ class CameraSystem:
         # 优先级2: 冲突或异常行为
         agents = world_state.get('agents', [])
         if agents:
-            # 寻找能量最低的智能体（可能处于危险中）
-            critical_agents = [agent for agent in agents if hasattr(agent, 'energy') and agent.energy < 20]
-            if critical_agents:
-                self.focus_on_agents(critical_agents[:3])
+            # 寻找能量最低的智能体（可能处于危险中）：一次提取能量数组，取前3个低能量者
+            energies = np.fromiter(
+                (getattr(agent, 'energy', np.inf) for agent in agents),
+                dtype=np.float64, count=len(agents)
+            )
+            critical_indices = np.flatnonzero(energies < 20)[:3]
+            if len(critical_indices):
+                self.focus_on_agents([agents[i] for i in critical_indices.tolist()])
                 return True
             
-            # 寻找社交最活跃的区域
-            if all(hasattr(agent, 'social_interactions') for agent in agents):
-                social_agents = sorted(agents, key=lambda a: a.social_interactions, reverse=True)[:5]
+            # 寻找社交最活跃的区域（智能体类型一致，只检查首个即可）
+            if hasattr(agents[0], 'social_interactions'):
+                social_agents = heapq.nlargest(5, agents, key=attrgetter('social_interactions'))
                 if social_agents[0].social_interactions > 10:
                     self.focus_on_agents(social_agents)
                     return True
@@ -6,16 +6,92 @@ Author: Ben Hsu & Claude
 """
 
 import pygame
-from typing import Dict, List, Optional, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
 from ...core.physics_engine import Vector2D
 from .scale_manager import ScaleManager, ScaleLevel
 from .camera_system import CameraSystem
 from .rendering_pipeline import RenderingPipeline
+from ._pick_kernels import first_within_index
 
 logger = logging.getLogger(__name__)
 
+# 点选半径（世界坐标）
+_AGENT_PICK_RADIUS = 15
+_RESOURCE_PICK_RADIUS = 10
+# 交互结果标志位：各处理函数返回标志位的按位或，handle_events 最后统一转换为结果字典
+_FLAG_SCALE = 1
+_FLAG_CAMERA = 2
+_FLAG_SELECTION = 4
+_FLAG_DISPLAY = 8
+_FLAG_QUIT = 16
+
+# 鼠标距上次悬停检测位置不足该距离（像素，平方值）时不重新检测
+_HOVER_EPS_SQ = 16
+# 拖拽阈值（像素，平方值）：移动超过10像素开始拖拽，释放时超过5像素视为框选
+_DRAG_START_DIST_SQ = 10 * 10
+_BOX_SELECT_MIN_DIST_SQ = 5 * 5
+
+
+def _pick_arrays(objects: List) -> Tuple[List, np.ndarray, np.ndarray]:
+    """
+    提取可点选对象及其坐标数组 (对象列表, xs, ys)，保持原列表顺序
+    
+    世界状态中的同类对象结构一致（智能体都是带position的视图对象，资源为坐标元组），
+    只按首个元素判断一次整个列表是否可点选，不再逐个对象调用hasattr。
+    """
+    if not objects or not hasattr(objects[0], 'position'):
+        return [], np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+    refs = list(objects)
+    count = len(refs)
+    xs = np.fromiter((obj.position.x for obj in refs), dtype=np.float64, count=count)
+    ys = np.fromiter((obj.position.y for obj in refs), dtype=np.float64, count=count)
+    return refs, xs, ys
+
+
+def _first_within(pick: Tuple[List, np.ndarray, np.ndarray], x: float, y: float, radius: float):
+    """返回列表顺序中第一个与 (x, y) 距离不超过radius的对象（比较平方距离，无开方）"""
+    refs, xs, ys = pick
+    if not refs:
+        return None
+    index = first_within_index(xs, ys, float(x), float(y), float(radius * radius))
+    return refs[index] if index >= 0 else None
+
+
+def _coalesce_motion(events: List[pygame.event.Event]) -> List[pygame.event.Event]:
+    """
+    将连续的MOUSEMOTION事件合并为一个：位置取最后一个事件，rel为累计位移
+
+    高回报率鼠标在一帧内会产生大量移动事件，合并后每段连续移动只处理一次；
+    与按键/点击事件的相对顺序保持不变。
+    """
+    motion = pygame.MOUSEMOTION
+    merged = []
+    run_start = None  # 当前连续移动段在 merged 中的位置
+    rel_x = rel_y = 0
+    for event in events:
+        if event.type != motion:
+            run_start = None
+            merged.append(event)
+            continue
+        
+        dx, dy = event.rel
+        if run_start is None:
+            run_start = len(merged)
+            rel_x, rel_y = dx, dy
+            merged.append(event)
+        else:
+            rel_x += dx
+            rel_y += dy
+            merged[run_start] = pygame.event.Event(
+                motion, pos=event.pos, rel=(rel_x, rel_y), buttons=event.buttons
+            )
+    return merged
+
 
 class InteractionController:
     """多尺度交互控制器"""
@@ -30,6 +106,9 @@ class InteractionController:
         self.keys_pressed = set()
         self.key_repeat_delay = 200  # 按键重复延迟（毫秒）
         self.last_key_times = {}
+        # 每帧在 handle_events 开始时读取一次的键盘状态和Ctrl修饰键状态
+        self._key_state = None
+        self._ctrl_held = False
         
         # 鼠标状态
         self.mouse_pos = (0, 0)
@@ -48,6 +127,12 @@ class InteractionController:
         # 选择状态
         self.selected_objects = []
         self.hover_object = None
+        # 悬停检测每帧最多一次：本帧是否有鼠标移动、上次检测时的屏幕位置
+        self._hover_dirty = False
+        self._last_hover_pos = None
+        
+        # 点选用的SoA坐标数组，按世界状态版本懒构建：(版本标记, 世界状态, 智能体数组, 资源数组)
+        self._pick_cache = (None, None, None, None)
         
         # 快捷键映射
         self.keybindings = {
@@ -82,105 +167,114 @@ class InteractionController:
             'social_connections': False
         }
         
+        # 按键 -> 预绑定参数的动作函数，按键时直接调用，不再逐次解析动作元组
+        self._key_actions = self._compile_keybindings()
+        
+        # 事件类型 -> 处理函数（签名统一为 (event, world_state)，返回结果标志位或None）
+        self._event_handlers = {
+            pygame.KEYDOWN: self._handle_keydown,
+            pygame.KEYUP: self._handle_keyup,
+            pygame.MOUSEBUTTONDOWN: self._handle_mouse_button_down,
+            pygame.MOUSEBUTTONUP: self._handle_mouse_button_up,
+            pygame.MOUSEMOTION: self._handle_mouse_motion,
+            pygame.MOUSEWHEEL: self._handle_mouse_wheel,
+        }
+        
         logger.info("InteractionController initialized")
     
     def handle_events(self, events: List[pygame.event.Event], world_state: Dict) -> Dict:
         """处理事件列表"""
         
-        interaction_result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False,
-            'quit_requested': False
-        }
-        
-        for event in events:
-            if event.type == pygame.QUIT:
-                interaction_result['quit_requested'] = True
-            
-            elif event.type == pygame.KEYDOWN:
-                result = self._handle_keydown(event, world_state)
-                self._merge_results(interaction_result, result)
-            
-            elif event.type == pygame.KEYUP:
-                self._handle_keyup(event)
-            
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                result = self._handle_mouse_button_down(event, world_state)
-                self._merge_results(interaction_result, result)
-            
-            elif event.type == pygame.MOUSEBUTTONUP:
-                result = self._handle_mouse_button_up(event, world_state)
-                self._merge_results(interaction_result, result)
-            
-            elif event.type == pygame.MOUSEMOTION:
-                result = self._handle_mouse_motion(event, world_state)
-                self._merge_results(interaction_result, result)
-            
-            elif event.type == pygame.MOUSEWHEEL:
-                result = self._handle_mouse_wheel(event, world_state)
-                self._merge_results(interaction_result, result)
+        # 本帧的键盘状态只向SDL查询一次，各处理函数共用
+        key_state = pygame.key.get_pressed()
+        self._key_state = key_state
+        self._ctrl_held = key_state[pygame.K_LCTRL] or key_state[pygame.K_RCTRL]
+        
+        # 按事件类型查表分发，未注册的事件类型直接跳过；连续的鼠标移动先合并
+        flags = 0
+        handlers = self._event_handlers
+        for event in _coalesce_motion(events):
+            handler = handlers.get(event.type)
+            if handler is not None:
+                flags |= handler(event, world_state) or 0
+            elif event.type == pygame.QUIT:
+                flags |= _FLAG_QUIT
+        
+        # 本帧的所有鼠标移动合并为一次悬停检测，使用最后的鼠标位置
+        if self._hover_dirty:
+            self._hover_dirty = False
+            self._update_hover(world_state)
         
         # 处理持续按键
-        continuous_result = self._handle_continuous_input(world_state)
-        self._merge_results(interaction_result, continuous_result)
+        flags |= self._handle_continuous_input(world_state)
         
-        return interaction_result
+        return {
+            'scale_changed': bool(flags & _FLAG_SCALE),
+            'camera_moved': bool(flags & _FLAG_CAMERA),
+            'selection_changed': bool(flags & _FLAG_SELECTION),
+            'display_options_changed': bool(flags & _FLAG_DISPLAY),
+            'quit_requested': bool(flags & _FLAG_QUIT)
+        }
     
-    def _handle_keydown(self, event: pygame.event.Event, world_state: Dict) -> Dict:
+    def _handle_keydown(self, event: pygame.event.Event, world_state: Dict) -> int:
         """处理按键按下"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
-        
         self.keys_pressed.add(event.key)
         self.last_key_times[event.key] = pygame.time.get_ticks()
         
         # 检查快捷键
-        if event.key in self.keybindings:
-            action_type, action_data = self.keybindings[event.key]
-            
-            if action_type == 'switch_scale':
-                if self.control_modes['scale_switching']:
-                    success = self.scale_manager.set_scale(action_data, animate=True)
-                    if success:
-                        result['scale_changed'] = True
-                        logger.info(f"Scale switched to {action_data.value} via keyboard")
-            
-            elif action_type == 'camera':
-                if self.control_modes['camera']:
-                    success = self._handle_camera_action(action_data, world_state)
-                    if success:
-                        result['camera_moved'] = True
-            
-            elif action_type == 'toggle':
-                success = self._handle_display_toggle(action_data)
-                if success:
-                    result['display_options_changed'] = True
-            
-            elif action_type == 'debug':
-                self._handle_debug_action(action_data, world_state)
-        
-        return result
+        action = self._key_actions.get(event.key)
+        if action is None:
+            return 0
+        return action(world_state)
+    
+    def _compile_keybindings(self) -> Dict[int, Callable[[Dict], int]]:
+        """
+        将 keybindings 中的 (动作类型, 动作参数) 编译为按键 -> 动作函数
+        
+        修改 keybindings 后需重新调用本方法更新 _key_actions。
+        """
+        action_methods = {
+            'switch_scale': self._key_switch_scale,
+            'camera': self._key_camera_action,
+            'toggle': self._key_display_toggle,
+            'debug': self._key_debug_action,
+        }
+        return {
+            key: partial(action_methods[action_type], action_data)
+            for key, (action_type, action_data) in self.keybindings.items()
+        }
+    
+    def _key_switch_scale(self, scale: ScaleLevel, world_state: Dict) -> int:
+        """快捷键：切换尺度"""
+        if self.control_modes['scale_switching'] and self.scale_manager.set_scale(scale, animate=True):
+            logger.info(f"Scale switched to {scale.value} via keyboard")
+            return _FLAG_SCALE
+        return 0
+    
+    def _key_camera_action(self, action: str, world_state: Dict) -> int:
+        """快捷键：相机动作"""
+        if self.control_modes['camera'] and self._handle_camera_action(action, world_state):
+            return _FLAG_CAMERA
+        return 0
+    
+    def _key_display_toggle(self, option: str, world_state: Dict) -> int:
+        """快捷键：切换显示选项"""
+        return _FLAG_DISPLAY if self._handle_display_toggle(option) else 0
     
-    def _handle_keyup(self, event: pygame.event.Event):
-        """处理按键释放"""
+    def _key_debug_action(self, action: str, world_state: Dict) -> int:
+        """快捷键：调试动作（不产生交互结果）"""
+        self._handle_debug_action(action, world_state)
+        return 0
+    
+    def _handle_keyup(self, event: pygame.event.Event, world_state: Dict) -> None:
+        """处理按键释放（不产生交互结果）"""
         self.keys_pressed.discard(event.key)
     
-    def _handle_mouse_button_down(self, event: pygame.event.Event, world_state: Dict) -> Dict:
+    def _handle_mouse_button_down(self, event: pygame.event.Event, world_state: Dict) -> int:
         """处理鼠标按下"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
+        result = 0
         
         # 安全地设置鼠标按钮状态
         if 1 <= event.button <= len(self.mouse_buttons):
@@ -193,43 +287,35 @@ class InteractionController:
                 selected_obj = self._find_object_at_position(event.pos, world_state)
                 if selected_obj:
                     if selected_obj not in self.selected_objects:
-                        if not (pygame.key.get_pressed()[pygame.K_LCTRL] or 
-                               pygame.key.get_pressed()[pygame.K_RCTRL]):
+                        if not self._ctrl_held:
                             self.selected_objects.clear()
                         self.selected_objects.append(selected_obj)
-                        result['selection_changed'] = True
+                        result |= _FLAG_SELECTION
                         logger.debug(f"Object selected: {type(selected_obj).__name__}")
                 else:
-                    if not (pygame.key.get_pressed()[pygame.K_LCTRL] or 
-                           pygame.key.get_pressed()[pygame.K_RCTRL]):
+                    if not self._ctrl_held:
                         if self.selected_objects:
                             self.selected_objects.clear()
-                            result['selection_changed'] = True
+                            result |= _FLAG_SELECTION
             
             # 开始拖拽
             self.mouse_drag_start = event.pos
         
         elif event.button == 2:  # 中键 - 居中相机
             if self.control_modes['camera']:
-                screen_pos = Vector2D(event.pos[0], event.pos[1])
-                world_pos = self.camera_system.main_camera.screen_to_world(screen_pos)
-                self.camera_system.main_camera.move_to(world_pos)
-                result['camera_moved'] = True
+                camera = self.camera_system.main_camera
+                camera.move_to(Vector2D(*camera.screen_to_world_xy(event.pos[0], event.pos[1])))
+                result |= _FLAG_CAMERA
         
         elif event.button == 3:  # 右键 - 上下文菜单
             self._show_context_menu(event.pos, world_state)
         
         return result
     
-    def _handle_mouse_button_up(self, event: pygame.event.Event, world_state: Dict) -> Dict:
+    def _handle_mouse_button_up(self, event: pygame.event.Event, world_state: Dict) -> int:
         """处理鼠标释放"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
+        result = 0
         
         # 安全地设置鼠标按钮状态
         if 1 <= event.button <= len(self.mouse_buttons):
@@ -238,82 +324,80 @@ class InteractionController:
         if event.button == 1:  # 左键释放
             if self.is_dragging:
                 self.is_dragging = False
+                # 拖拽期间跳过了悬停检测，结束时按当前位置补做一次
+                self._hover_dirty = True
                 # 处理拖拽结束
                 if self.mouse_drag_start:
-                    drag_distance = ((event.pos[0] - self.mouse_drag_start[0])**2 + 
-                                   (event.pos[1] - self.mouse_drag_start[1])**2)**0.5
+                    dx = event.pos[0] - self.mouse_drag_start[0]
+                    dy = event.pos[1] - self.mouse_drag_start[1]
                     
-                    if drag_distance > 5:  # 最小拖拽距离
+                    if dx * dx + dy * dy > _BOX_SELECT_MIN_DIST_SQ:  # 最小拖拽距离
                         # 区域选择
                         selected_objects = self._find_objects_in_rect(
                             self.mouse_drag_start, event.pos, world_state
                         )
                         if selected_objects:
                             self.selected_objects = selected_objects
-                            result['selection_changed'] = True
+                            result |= _FLAG_SELECTION
             
             self.mouse_drag_start = None
         
         return result
     
-    def _handle_mouse_motion(self, event: pygame.event.Event, world_state: Dict) -> Dict:
+    def _handle_mouse_motion(self, event: pygame.event.Event, world_state: Dict) -> int:
         """处理鼠标移动"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
-        
         self.mouse_pos = event.pos
         
-        # 更新悬停对象
-        new_hover = self._find_object_at_position(event.pos, world_state)
-        if new_hover != self.hover_object:
-            self.hover_object = new_hover
-        
-        # 处理拖拽移动相机
-        if self.mouse_buttons[0] and self.mouse_drag_start:  # 左键拖拽
-            drag_distance = ((event.pos[0] - self.mouse_drag_start[0])**2 + 
-                           (event.pos[1] - self.mouse_drag_start[1])**2)**0.5
+        # 拖拽相机时悬停检测没有意义，直接按本次位移移动相机后返回
+        if self.is_dragging:
+            if not self.control_modes['camera']:
+                return 0
+            camera = self.camera_system.main_camera
+            dx, dy = event.rel  # 合并后的事件携带本段移动的累计位移
             
-            if drag_distance > 10 and not self.is_dragging:
+            # 转换到世界坐标偏移
+            zoom = camera.zoom
+            camera.move_by_xy(-dx / zoom, -dy / zoom, smooth=False)
+            return _FLAG_CAMERA
+        
+        # 左键按下但尚未超过拖拽阈值：检查是否开始拖拽
+        if self.mouse_buttons[0] and self.mouse_drag_start:
+            dx = event.pos[0] - self.mouse_drag_start[0]
+            dy = event.pos[1] - self.mouse_drag_start[1]
+            if dx * dx + dy * dy > _DRAG_START_DIST_SQ:
                 self.is_dragging = True
-            
-            if self.is_dragging and self.control_modes['camera']:
-                # 拖拽移动相机
-                camera = self.camera_system.main_camera
-                
-                dx = event.pos[0] - self.mouse_pos[0] if hasattr(self, '_last_mouse_pos') else 0
-                dy = event.pos[1] - self.mouse_pos[1] if hasattr(self, '_last_mouse_pos') else 0
-                
-                # 转换到世界坐标偏移
-                world_offset = Vector2D(-dx / camera.zoom, -dy / camera.zoom)
-                camera.move_by(world_offset, smooth=False)
-                result['camera_moved'] = True
-        
-        self._last_mouse_pos = event.pos
-        return result
+                return 0
+        
+        # 悬停对象在本帧事件处理完后统一更新
+        self._hover_dirty = True
+        return 0
     
-    def _handle_mouse_wheel(self, event: pygame.event.Event, world_state: Dict) -> Dict:
+    def _update_hover(self, world_state: Dict):
+        """按当前鼠标位置更新悬停对象，移动不超过阈值时沿用上次结果"""
+        pos = self.mouse_pos
+        last = self._last_hover_pos
+        if last is not None:
+            dx = pos[0] - last[0]
+            dy = pos[1] - last[1]
+            if dx * dx + dy * dy < _HOVER_EPS_SQ:
+                return
+        
+        self._last_hover_pos = pos
+        self.hover_object = self._find_object_at_position(pos, world_state)
+    
+    def _handle_mouse_wheel(self, event: pygame.event.Event, world_state: Dict) -> int:
         """处理鼠标滚轮"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
+        result = 0
         
         if self.control_modes['scale_switching']:
             # 缩放系数
             zoom_factor = 1.2 if event.y > 0 else 1/1.2
             
-            # 获取鼠标世界坐标（缩放中心）
+            # 获取鼠标世界坐标（缩放中心）；滚轮事件的x/y是滚动量，位置取最近的鼠标坐标
             camera = self.camera_system.main_camera
-            mouse_screen_pos = Vector2D(event.x, event.y)
-            mouse_world_pos = camera.screen_to_world(mouse_screen_pos)
+            mouse_world_x, mouse_world_y = camera.screen_to_world_xy(*self.mouse_pos)
             
             # 计算新缩放级别
             current_zoom = self.scale_manager.current_zoom
@@ -326,38 +410,33 @@ class InteractionController:
             # 调整相机位置，使鼠标位置保持不变
             actual_zoom_factor = self.scale_manager.current_zoom / current_zoom
             if abs(actual_zoom_factor - 1.0) > 0.001:
-                camera_to_mouse = mouse_world_pos - camera.position
-                offset = camera_to_mouse * (1 - 1/actual_zoom_factor)
-                camera.move_by(offset, smooth=False)
-                result['camera_moved'] = True
+                shift = 1 - 1/actual_zoom_factor
+                camera.move_by_xy((mouse_world_x - camera.position.x) * shift,
+                                  (mouse_world_y - camera.position.y) * shift, smooth=False)
+                result |= _FLAG_CAMERA
             
             # 检查是否发生了尺度切换
             if self.scale_manager.current_scale != old_scale:
-                result['scale_changed'] = True
+                result |= _FLAG_SCALE
                 logger.info(f"Scale auto-switched from {old_scale.value} to {self.scale_manager.current_scale.value}")
         
         return result
     
-    def _handle_continuous_input(self, world_state: Dict) -> Dict:
+    def _handle_continuous_input(self, world_state: Dict) -> int:
         """处理持续输入（如按住的按键）"""
         
-        result = {
-            'scale_changed': False,
-            'camera_moved': False,
-            'selection_changed': False,
-            'display_options_changed': False
-        }
+        result = 0
         
         if not self.control_modes['camera']:
             return result
         
         # WASD 相机移动
         camera_moved = self.camera_system.handle_keyboard_input(
-            pygame.key.get_pressed(), self.scale_manager
+            self._key_state, self.scale_manager
         )
         
         if camera_moved:
-            result['camera_moved'] = True
+            result |= _FLAG_CAMERA
         
         return result
     
@@ -434,30 +513,36 @@ class InteractionController:
             self.rendering_pipeline.reset_stats()
             logger.info("Statistics reset")
     
+    def _get_pick_arrays(self, world_state: Dict) -> Tuple[Tuple, Tuple]:
+        """
+        返回智能体和资源的点选坐标数组
+        
+        世界状态带有 'tick' 版本标记时按版本判断：世界未推进的帧（如暂停时）
+        即使世界状态字典重新构建也复用上次的数组；没有版本标记时按字典对象判断。
+        """
+        tick = world_state.get('tick')
+        cached_tick, cached_state, agent_pick, resource_pick = self._pick_cache
+        if (cached_tick == tick) if tick is not None else (cached_state is world_state):
+            return agent_pick, resource_pick
+        
+        agent_pick = _pick_arrays(world_state.get('agents', []))
+        resource_pick = _pick_arrays(world_state.get('resources', []))
+        self._pick_cache = (tick, world_state, agent_pick, resource_pick)
+        return agent_pick, resource_pick
+    
     def _find_object_at_position(self, screen_pos: Tuple[int, int], world_state: Dict):
-        """查找屏幕位置上的对象"""
+        """查找屏幕位置上的对象（智能体优先于资源）"""
         
-        camera = self.camera_system.main_camera
-        screen_vector = Vector2D(screen_pos[0], screen_pos[1])
-        world_pos = camera.screen_to_world(screen_vector)
+        world_x, world_y = self.camera_system.main_camera.screen_to_world_xy(screen_pos[0], screen_pos[1])
+        agent_pick, resource_pick = self._get_pick_arrays(world_state)
         
         # 检查智能体
-        agents = world_state.get('agents', [])
-        for agent in agents:
-            if hasattr(agent, 'position'):
-                distance = world_pos.distance_to(agent.position)
-                if distance <= 15:  # 选择半径
-                    return agent
+        agent = _first_within(agent_pick, world_x, world_y, _AGENT_PICK_RADIUS)
+        if agent is not None:
+            return agent
         
         # 检查资源
-        resources = world_state.get('resources', [])
-        for resource in resources:
-            if hasattr(resource, 'position'):
-                distance = world_pos.distance_to(resource.position)
-                if distance <= 10:  # 选择半径
-                    return resource
-        
-        return None
+        return _first_within(resource_pick, world_x, world_y, _RESOURCE_PICK_RADIUS)
     
     def _find_objects_in_rect(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int], 
                              world_state: Dict) -> List:
@@ -466,28 +551,19 @@ class InteractionController:
         camera = self.camera_system.main_camera
         
         # 转换到世界坐标
-        start_vector = Vector2D(start_pos[0], start_pos[1])
-        end_vector = Vector2D(end_pos[0], end_pos[1])
-        world_start = camera.screen_to_world(start_vector)
-        world_end = camera.screen_to_world(end_vector)
+        start_x, start_y = camera.screen_to_world_xy(start_pos[0], start_pos[1])
+        end_x, end_y = camera.screen_to_world_xy(end_pos[0], end_pos[1])
         
         # 创建边界矩形
-        min_x = min(world_start.x, world_end.x)
-        max_x = max(world_start.x, world_end.x)
-        min_y = min(world_start.y, world_end.y)
-        max_y = max(world_start.y, world_end.y)
-        
-        selected_objects = []
-        
-        # 检查智能体
-        agents = world_state.get('agents', [])
-        for agent in agents:
-            if hasattr(agent, 'position'):
-                pos = agent.position
-                if min_x <= pos.x <= max_x and min_y <= pos.y <= max_y:
-                    selected_objects.append(agent)
-        
-        return selected_objects
+        min_x = min(start_x, end_x)
+        max_x = max(start_x, end_x)
+        min_y = min(start_y, end_y)
+        max_y = max(start_y, end_y)
+        
+        # 检查智能体（整体比较坐标数组，保持原列表顺序）
+        (refs, xs, ys), _ = self._get_pick_arrays(world_state)
+        inside = np.flatnonzero((xs >= min_x) & (xs <= max_x) & (ys >= min_y) & (ys <= max_y))
+        return [refs[i] for i in inside.tolist()]
     
     def _show_context_menu(self, screen_pos: Tuple[int, int], world_state: Dict):
         """显示上下文菜单"""
@@ -502,14 +578,6 @@ class InteractionController:
             else:
                 logger.info(f"Object context menu for {type(obj).__name__}")
     
-    def _merge_results(self, target: Dict, source: Dict):
-        """合并结果字典"""
-        for key, value in source.items():
-            if key in target:
-                target[key] = target[key] or value
-            else:
-                target[key] = value
-    
     def get_control_state(self) -> Dict:
         """获取控制状态"""
         
@@ -533,6 +601,7 @@ class InteractionController:
         """清除选择"""
         self.selected_objects.clear()
         self.hover_object = None
+        self._last_hover_pos = None
     
     def get_selected_objects(self) -> List:
         """获取选中的对象"""
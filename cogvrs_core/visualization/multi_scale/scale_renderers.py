@@ -8,6 +8,7 @@ Author: Ben Hsu & Claude
 import math
 import time
 from typing import Dict, List, Tuple, Optional
+import numpy as np
 import pygame
 import logging
 
@@ -26,6 +27,8 @@ class BaseScaleRenderer:
         self.scale_level = scale_level
         self.lod_renderer = LODRenderer()
         self.render_cache = {}
+        # 预渲染的圆形精灵：(颜色, 半径, 描边颜色) -> Surface
+        self._sprite_cache: Dict[Tuple, pygame.Surface] = {}
         
     def render(self, screen: pygame.Surface, world_state: Dict, camera: Camera):
         """渲染当前尺度"""
@@ -37,6 +40,54 @@ class BaseScaleRenderer:
             return False
         
         return camera.is_visible(obj.position, getattr(obj, 'radius', 10))
+    
+    def _circle_sprite(self, color: Tuple, radius: int, outline: Optional[Tuple] = None) -> pygame.Surface:
+        """
+        返回预渲染的圆形精灵，首次使用时绘制一次并缓存
+        
+        智能体颜色来自固定的调色板、半径为常量，缓存条目数很少；每帧只做blit，
+        不再逐个光栅化圆形。精灵尺寸为 2*radius+1，绘制位置为 (x - radius, y - radius)。
+        """
+        key = (color, radius, outline)
+        sprite = self._sprite_cache.get(key)
+        if sprite is None:
+            size = radius * 2 + 1
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            if outline is not None:
+                pygame.draw.circle(sprite, outline, (radius, radius), radius, 1)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self._sprite_cache[key] = sprite
+        return sprite
+    
+    def _blit_circles(self, screen: pygame.Surface, screen_positions, color: Tuple, radius: int):
+        """以同一个缓存精灵批量绘制多个圆点"""
+        sprite = self._circle_sprite(color, radius)
+        screen.blits([(sprite, (x - radius, y - radius)) for x, y in screen_positions], False)
+    
+    def _visible_screen_positions(self, objects: List, camera: Camera, radius=None) -> List[Tuple]:
+        """
+        批量剔除并转换坐标，返回可见对象及其整数像素坐标 [(obj, (x, y)), ...]
+        
+        radius为None时使用各对象的radius属性（默认10），与 _should_render_object 一致。
+        """
+        count = len(objects)
+        if not count:
+            return []
+        
+        # 屏幕空间计算只需float32精度，结果最终取整用于绘制
+        xs = np.fromiter((obj.position.x for obj in objects), dtype=np.float32, count=count)
+        ys = np.fromiter((obj.position.y for obj in objects), dtype=np.float32, count=count)
+        if radius is None:
+            radius = np.fromiter((getattr(obj, 'radius', 10) for obj in objects), dtype=np.float32, count=count)
+        
+        visible = np.flatnonzero(camera.visible_mask_batch(xs, ys, radius))
+        screen_xs, screen_ys = camera.world_to_screen_px_batch(xs[visible], ys[visible])
+        return [
+            (objects[i], screen_pos)
+            for i, screen_pos in zip(visible.tolist(), zip(screen_xs.tolist(), screen_ys.tolist()))
+        ]
 
 
 class MicroRenderer(BaseScaleRenderer):
@@ -100,23 +151,23 @@ class MicroRenderer(BaseScaleRenderer):
         
         # 绘制垂直线
         for x in range(start_x, end_x, grid_size):
-            start_screen = camera.world_to_screen(Vector2D(x, visible_area.top))
-            end_screen = camera.world_to_screen(Vector2D(x, visible_area.bottom))
+            line_start_x, _ = camera.world_to_screen_xy(x, visible_area.top)
+            line_end_x, _ = camera.world_to_screen_xy(x, visible_area.bottom)
             
-            if 0 <= start_screen.x <= screen.get_width():
+            if 0 <= line_start_x <= screen.get_width():
                 pygame.draw.line(screen, grid_color, 
-                               (start_screen.x, 0), 
-                               (end_screen.x, screen.get_height()))
+                               (line_start_x, 0), 
+                               (line_end_x, screen.get_height()))
         
         # 绘制水平线
         for y in range(start_y, end_y, grid_size):
-            start_screen = camera.world_to_screen(Vector2D(visible_area.left, y))
-            end_screen = camera.world_to_screen(Vector2D(visible_area.right, y))
+            _, line_start_y = camera.world_to_screen_xy(visible_area.left, y)
+            _, line_end_y = camera.world_to_screen_xy(visible_area.right, y)
             
-            if 0 <= start_screen.y <= screen.get_height():
+            if 0 <= line_start_y <= screen.get_height():
                 pygame.draw.line(screen, grid_color,
-                               (0, start_screen.y),
-                               (screen.get_width(), end_screen.y))
+                               (0, line_start_y),
+                               (screen.get_width(), line_end_y))
     
     def _render_resources(self, screen: pygame.Surface, resources: List, camera: Camera):
         """渲染资源"""
@@ -125,7 +176,8 @@ class MicroRenderer(BaseScaleRenderer):
             if not self._should_render_object(resource, camera):
                 continue
             
-            screen_pos = camera.world_to_screen(resource.position)
+            position = resource.position
+            screen_x, screen_y = camera.world_to_screen_px(position.x, position.y)
             
             # 资源大小基于价值
             resource_value = getattr(resource, 'value', 10)
@@ -141,13 +193,13 @@ class MicroRenderer(BaseScaleRenderer):
                 color = (255, 165, 0)  # 橙色其他资源
             
             # 绘制资源
-            pygame.draw.circle(screen, color, (int(screen_pos.x), int(screen_pos.y)), radius)
+            pygame.draw.circle(screen, color, (screen_x, screen_y), radius)
             
             # 如果缩放足够大，显示资源值
             if camera.zoom > 1.5:
                 font = pygame.font.Font(None, 16)
                 value_text = font.render(str(int(resource_value)), True, (255, 255, 255))
-                text_pos = (int(screen_pos.x) + radius + 2, int(screen_pos.y) - 8)
+                text_pos = (screen_x + radius + 2, screen_y - 8)
                 screen.blit(value_text, text_pos)
     
     def _render_agent_trajectories(self, screen: pygame.Surface, agents: List, camera: Camera):
@@ -248,7 +300,7 @@ class MicroRenderer(BaseScaleRenderer):
             # 获取感知半径
             perception_radius = getattr(agent, 'perception_radius', 30)
             
-            screen_pos = camera.world_to_screen(agent.position)
+            screen_x, screen_y = camera.world_to_screen_px(agent.position.x, agent.position.y)
             screen_radius = int(perception_radius * camera.zoom)
             
             if screen_radius > 5:  # 只在半径足够大时绘制
@@ -257,31 +309,24 @@ class MicroRenderer(BaseScaleRenderer):
                 circle_surf = pygame.Surface((screen_radius * 2, screen_radius * 2), pygame.SRCALPHA)
                 pygame.draw.circle(circle_surf, perception_color, (screen_radius, screen_radius), screen_radius, 1)
                 
-                screen.blit(circle_surf, (int(screen_pos.x) - screen_radius, int(screen_pos.y) - screen_radius))
+                screen.blit(circle_surf, (screen_x - screen_radius, screen_y - screen_radius))
     
     def _render_agents(self, screen: pygame.Surface, agents: List, camera: Camera):
         """渲染智能体"""
         
-        for agent in agents:
-            if not self._should_render_object(agent, camera):
-                continue
-            
-            screen_pos = camera.world_to_screen(agent.position)
-            screen_pos_tuple = (int(screen_pos.x), int(screen_pos.y))
-            
+        # 一次性剔除不可见智能体并批量转换屏幕坐标
+        for agent, screen_pos_tuple in self._visible_screen_positions(agents, camera):
             # 简化的智能体渲染
             self._render_simple_agent(screen, agent, screen_pos_tuple)
     
     def _render_simple_agent(self, screen: pygame.Surface, agent, screen_pos: tuple):
         """简化的智能体渲染"""
         try:
-            # 基础圆形
+            # 基础圆形和白色边框（缓存精灵）
             radius = 8
             agent_color = self._get_agent_color(agent)
-            pygame.draw.circle(screen, agent_color, screen_pos, radius)
-            
-            # 边框
-            pygame.draw.circle(screen, (255, 255, 255), screen_pos, radius, 1)
+            screen.blit(self._circle_sprite(agent_color, radius, (255, 255, 255)),
+                        (screen_pos[0] - radius, screen_pos[1] - radius))
             
             # 健康条
             if hasattr(agent, 'health') and hasattr(agent, 'max_health'):
@@ -526,22 +571,15 @@ class MesoRenderer(BaseScaleRenderer):
                     value = getattr(resource, 'value', 10)
                 
                 if camera.is_visible(pos):
-                    screen_pos = camera.world_to_screen(pos)
                     pygame.draw.circle(screen, (0, 255, 0), 
-                                     (int(screen_pos.x), int(screen_pos.y)), 3)
+                                     camera.world_to_screen_px(pos.x, pos.y), 3)
             except:
                 continue
     
     def _render_simple_agent_clusters(self, screen: pygame.Surface, agents: List, camera: Camera):
         """简化智能体集群渲染"""
-        for agent in agents:
-            try:
-                if camera.is_visible(agent.position):
-                    screen_pos = camera.world_to_screen(agent.position)
-                    pygame.draw.circle(screen, (100, 150, 255), 
-                                     (int(screen_pos.x), int(screen_pos.y)), 6)
-            except:
-                continue
+        visible = self._visible_screen_positions(agents, camera, radius=0)
+        self._blit_circles(screen, [screen_pos for _, screen_pos in visible], (100, 150, 255), 6)
     
     def _render_fallback(self, screen: pygame.Surface, agents: List, resources: List, camera: Camera):
         """备用渲染方法"""
@@ -609,27 +647,26 @@ class MesoRenderer(BaseScaleRenderer):
             max_y = max(pos.y for pos in positions) + 20
             
             # 转换到屏幕坐标
-            top_left = camera.world_to_screen(Vector2D(min_x, min_y))
-            bottom_right = camera.world_to_screen(Vector2D(max_x, max_y))
+            left, top = camera.world_to_screen_xy(min_x, min_y)
+            right, bottom = camera.world_to_screen_xy(max_x, max_y)
             
-            width = int(bottom_right.x - top_left.x)
-            height = int(bottom_right.y - top_left.y)
+            width = int(right - left)
+            height = int(bottom - top)
             
             if width > 0 and height > 0:
                 # 绘制群组背景
                 group_color = group_colors[i % len(group_colors)]
                 group_surf = pygame.Surface((width, height), pygame.SRCALPHA)
                 pygame.draw.rect(group_surf, group_color, (0, 0, width, height))
-                screen.blit(group_surf, (int(top_left.x), int(top_left.y)))
+                screen.blit(group_surf, (int(left), int(top)))
                 
                 # 绘制群组边框
                 pygame.draw.rect(screen, group_color[:3], 
-                               (int(top_left.x), int(top_left.y), width, height), 2)
+                               (int(left), int(top), width, height), 2)
             
             # 渲染群组中的智能体（简化版）
             for agent in group:
-                screen_pos = camera.world_to_screen(agent.position)
-                screen_pos_tuple = (int(screen_pos.x), int(screen_pos.y))
+                screen_pos_tuple = camera.world_to_screen_px(agent.position.x, agent.position.y)
                 
                 # 使用中等LOD
                 lod_level = LODLevel.MEDIUM_DETAIL
@@ -638,11 +675,11 @@ class MesoRenderer(BaseScaleRenderer):
             # 显示群组信息
             center_x = sum(pos.x for pos in positions) / len(positions)
             center_y = sum(pos.y for pos in positions) / len(positions)
-            center_screen = camera.world_to_screen(Vector2D(center_x, center_y))
+            center_screen_x, center_screen_y = camera.world_to_screen_xy(center_x, center_y)
             
             font = pygame.font.Font(None, 24)
             group_text = font.render(f"Group {i+1} ({len(group)})", True, (255, 255, 255))
-            text_rect = group_text.get_rect(center=(int(center_screen.x), int(center_screen.y)))
+            text_rect = group_text.get_rect(center=(int(center_screen_x), int(center_screen_y)))
             screen.blit(group_text, text_rect)
     
     def _render_resource_density_heatmap(self, screen: pygame.Surface, resources: List, camera: Camera):
@@ -698,13 +735,13 @@ class MesoRenderer(BaseScaleRenderer):
                     # 计算屏幕位置
                     world_x = visible_area.left + x * grid_size
                     world_y = visible_area.top + y * grid_size
-                    screen_pos = camera.world_to_screen(Vector2D(world_x, world_y))
+                    screen_x, screen_y = camera.world_to_screen_px(world_x, world_y)
                     screen_size = int(grid_size * camera.zoom)
                     
                     # 绘制热图方块
                     heat_surf = pygame.Surface((screen_size, screen_size), pygame.SRCALPHA)
                     pygame.draw.rect(heat_surf, color, (0, 0, screen_size, screen_size))
-                    screen.blit(heat_surf, (int(screen_pos.x), int(screen_pos.y)))
+                    screen.blit(heat_surf, (screen_x, screen_y))
     
     def _render_resource_flows(self, screen: pygame.Surface, agents: List, resources: List, camera: Camera):
         """渲染资源流向"""
@@ -812,15 +849,9 @@ class MacroRenderer(BaseScaleRenderer):
         # 绘制世界背景
         pygame.draw.rect(screen, (30, 30, 50), (0, 0, screen.get_width(), screen.get_height()))
         
-        # 绘制智能体为小点
-        for agent in agents:
-            try:
-                if camera.is_visible(agent.position):
-                    screen_pos = camera.world_to_screen(agent.position)
-                    pygame.draw.circle(screen, (255, 255, 0), 
-                                     (int(screen_pos.x), int(screen_pos.y)), 2)
-            except:
-                continue
+        # 绘制智能体为小点（批量剔除和坐标转换）
+        visible = self._visible_screen_positions(agents, camera, radius=0)
+        self._blit_circles(screen, [screen_pos for _, screen_pos in visible], (255, 255, 0), 2)
     
     def _render_macro_fallback(self, screen: pygame.Surface):
         """宏观渲染备用方案"""
@@ -916,12 +947,12 @@ class MacroRenderer(BaseScaleRenderer):
                     terrain_color = (139, 90, 43)  # 山地
                 
                 # 转换到屏幕坐标
-                screen_pos = camera.world_to_screen(Vector2D(x, y))
+                screen_x, screen_y = camera.world_to_screen_px(x, y)
                 screen_size = int(terrain_size * camera.zoom)
                 
                 if screen_size > 2:
                     pygame.draw.rect(screen, terrain_color,
-                                   (int(screen_pos.x), int(screen_pos.y), screen_size, screen_size))
+                                   (screen_x, screen_y, screen_size, screen_size))
     
     def _render_tribes(self, screen: pygame.Surface, tribes: List, camera: Camera):
         """渲染部落"""
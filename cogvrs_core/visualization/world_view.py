@@ -54,6 +54,7 @@ class WorldRenderer:
         self.show_connections = config.get('show_connections', True)
         self.show_perception_radius = config.get('show_perception_radius', False)
         self.show_tribes = config.get('show_tribes', True)  # 默认显示部落
+        self.auto_flip = config.get('auto_flip', True)  # 嵌入其他界面时由调用方提交显示
         
         # 缩放和平移
         self.scale_x = self.screen_width / self.world_width
@@ -112,7 +113,8 @@ class WorldRenderer:
         self._draw_ui_info(world_state, agents, time_info)
         
         # 更新显示
-        pygame.display.flip()
+        if self.auto_flip:
+            pygame.display.flip()
     
     def _draw_tribes(self, world_state: Dict):
         """绘制部落领土和交互"""
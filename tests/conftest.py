@@ -0,0 +1,16 @@
+"""
+Cogvrs - Test Fixtures
+测试公共夹具
+
+Author: Ben Hsu & Claude
+"""
+
+import pytest
+
+from cogvrs_core.utils.event_logger import initialize_event_logger
+
+
+@pytest.fixture(autouse=True)
+def _quiet_event_logger():
+    """每个测试使用独立的全局事件记录器，并关闭自动保存，避免测试写出事件文件"""
+    yield initialize_event_logger({'auto_save': False})
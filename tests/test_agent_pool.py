@@ -0,0 +1,131 @@
+"""
+Cogvrs - Agent Pool Tests
+对象池复用：SimpleAgent.reset 与 clone 语义一致
+
+Author: Ben Hsu & Claude
+"""
+
+import numpy as np
+import pytest
+
+from cogvrs_core.agents.simple_agent import SimpleAgent, _TRANSIENT_ATTRS
+from cogvrs_core.core.physics_engine import Vector2D
+
+
+@pytest.fixture
+def parent():
+    np.random.seed(0)
+    agent = SimpleAgent({'world_size': [100, 100]}, Vector2D(50, 50))
+    agent.generation = 3
+    return agent
+
+
+@pytest.fixture
+def dead_agent():
+    """模拟一个经历过完整一生后死亡、进入对象池的智能体"""
+    agent = SimpleAgent({'world_size': [100, 100]}, Vector2D(10, 10))
+    agent.alive = False
+    agent.age = 320
+    agent.health = 0.0
+    agent.offspring_count = 4
+    agent.social_interactions = 60
+    agent.milestones['elder'] = True
+    agent.tribe_id = 'tribe_1'
+    agent.tribe_name = 'Old Tribe'
+    agent.tribe_color = (1, 2, 3)
+    agent.is_tribe_leader = True
+    agent.last_reproduction_time = 12.0
+    agent.brain.learning_history.append({'reward': 1.0})
+    agent.brain.successful_actions = 7
+    agent.brain.total_predictions = 9
+    agent.brain.last_inputs = np.ones(agent.brain.input_size)
+    return agent
+
+
+def _assert_same_weights(brain, reference):
+    assert len(brain.layers) == len(reference.layers)
+    for layer, ref_layer in zip(brain.layers, reference.layers):
+        np.testing.assert_array_equal(layer.weights, ref_layer.weights)
+        np.testing.assert_array_equal(layer.biases, ref_layer.biases)
+        assert layer.activation == ref_layer.activation
+
+
+def test_reset_matches_clone(parent, dead_agent):
+    """不变异时，复用的智能体与新克隆的子代状态一致"""
+    old_id = dead_agent.agent_id
+    old_memory = dead_agent.memory
+    old_behavior = dead_agent.behavior_system
+    
+    recycled = dead_agent.reset(parent, mutation_rate=0.0)
+    cloned = parent.clone(mutation_rate=0.0)
+    
+    assert recycled is dead_agent
+    
+    # 新身份
+    assert recycled.agent_id not in (old_id, parent.agent_id, cloned.agent_id)
+    assert recycled.generation == cloned.generation == parent.generation + 1
+    assert recycled.parent_ids == cloned.parent_ids == [parent.agent_id]
+    assert recycled.species == cloned.species
+    
+    # 生命周期状态从头开始
+    for attr in ('alive', 'age', 'health', 'max_health', 'max_energy', 'energy',
+                 'offspring_count', 'social_interactions', 'resources_consumed',
+                 'total_distance_traveled', 'technology_level', 'milestones',
+                 'mass', 'radius', 'env_move_mul', 'env_perc_mul'):
+        assert getattr(recycled, attr) == getattr(cloned, attr), attr
+    assert (recycled.velocity.x, recycled.velocity.y) == (0, 0)
+    
+    # 在父代附近出生
+    assert abs(recycled.position.x - parent.position.x) <= 2
+    assert abs(recycled.position.y - parent.position.y) <= 2
+    
+    # 上一生由其他系统附加的属性被清除
+    for attr in _TRANSIENT_ATTRS:
+        assert not hasattr(recycled, attr), attr
+        assert not hasattr(cloned, attr), attr
+    
+    # 大脑权重来自父代
+    _assert_same_weights(recycled.brain, parent.brain)
+    _assert_same_weights(cloned.brain, parent.brain)
+    
+    # 学习状态清空
+    for brain in (recycled.brain, cloned.brain):
+        assert brain.learning_history == []
+        assert brain.successful_actions == 0
+        assert brain.total_predictions == 0
+        assert brain.last_inputs is None
+        assert brain.last_outputs is None
+    
+    # 记忆和行为系统重新创建，行为偏好继承自父代
+    assert recycled.memory is not old_memory
+    assert recycled.behavior_system is not old_behavior
+    assert (recycled.behavior_system.behavior_preferences
+            == cloned.behavior_system.behavior_preferences
+            == parent.behavior_system.behavior_preferences)
+
+
+def test_reset_reuses_weight_arrays(parent, dead_agent):
+    """网络结构相同时就地复制权重，不重新分配数组"""
+    weight_arrays = [layer.weights for layer in dead_agent.brain.layers]
+    
+    dead_agent.reset(parent, mutation_rate=0.0)
+    
+    for layer, original in zip(dead_agent.brain.layers, weight_arrays):
+        assert layer.weights is original
+    for layer, parent_layer in zip(dead_agent.brain.layers, parent.brain.layers):
+        assert not np.shares_memory(layer.weights, parent_layer.weights)
+
+
+def test_reset_mutation_does_not_touch_parent(parent, dead_agent):
+    """变异只作用于复用的智能体，父代权重保持不变"""
+    parent_weights = [layer.weights.copy() for layer in parent.brain.layers]
+    
+    np.random.seed(1)
+    dead_agent.reset(parent, mutation_rate=1.0)
+    
+    for layer, original in zip(parent.brain.layers, parent_weights):
+        np.testing.assert_array_equal(layer.weights, original)
+    assert any(
+        not np.array_equal(layer.weights, original)
+        for layer, original in zip(dead_agent.brain.layers, parent_weights)
+    )
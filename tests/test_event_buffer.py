@@ -0,0 +1,127 @@
+"""
+Cogvrs - Event Buffer Tests
+结构化事件缓冲区：容量增长、上限裁剪和字典展开
+
+Author: Ben Hsu & Claude
+"""
+
+import pytest
+
+from cogvrs_core.visualization._event_buffer import (
+    DEATH_CAUSES, EVENT_AGENT_DEATH, EVENT_REPRODUCTION, EventBuffer
+)
+
+
+def _add_births(buffer, count, start=0):
+    for i in range(start, start + count):
+        buffer.add_reproduction(
+            ts=float(i), step=i, child_id=f'c{i}', parent_id=f'p{i}',
+            px=1.5, py=2.5, energy=80.0, health=90.0,
+            generation=2, parent_offspring=i
+        )
+
+
+def test_grows_without_limit():
+    buffer = EventBuffer(capacity=2)
+    _add_births(buffer, 5)
+    
+    assert len(buffer) == 5
+    assert [r['step'] for r in buffer.records()] == [0, 1, 2, 3, 4]
+
+
+def test_trims_oldest_quarter_at_limit():
+    buffer = EventBuffer(capacity=4, max_events=8)
+    _add_births(buffer, 8)
+    assert len(buffer) == 8
+    
+    # 达到上限后再写入：保留最新的3/4，再追加新记录
+    _add_births(buffer, 1, start=8)
+    
+    assert len(buffer) == 8 * 3 // 4 + 1
+    assert [r['step'] for r in buffer.records()] == [2, 3, 4, 5, 6, 7, 8]
+    
+    _add_births(buffer, 20, start=9)
+    assert len(buffer) <= 8
+    assert buffer.records()['step'][-1] == 28
+
+
+def test_count_and_filter_by_type():
+    buffer = EventBuffer()
+    _add_births(buffer, 3)
+    buffer.add_death(ts=9.0, step=9, agent_id='d1', px=0.0, py=0.0,
+                     energy=0.0, health=0.0, age=12.0, offspring=1, cause=3)
+    
+    assert buffer.count() == 4
+    assert buffer.count(EVENT_REPRODUCTION) == 3
+    assert buffer.count(EVENT_AGENT_DEATH) == 1
+    assert len(buffer.records(EVENT_AGENT_DEATH)) == 1
+
+
+def test_to_dicts_round_trip():
+    buffer = EventBuffer()
+    buffer.add_reproduction(ts=10.5, step=7, child_id='child01', parent_id='parent1',
+                            px=3.5, py=4.25, energy=60.0, health=75.0,
+                            generation=4, parent_offspring=2)
+    buffer.add_death(ts=11.0, step=8, agent_id='dead01', px=5.5, py=6.5,
+                     energy=0.5, health=0.25, age=42.5, offspring=3,
+                     cause=DEATH_CAUSES.index('Old age'), tribe_id='tribe_7')
+    buffer.add_death(ts=12.0, step=9, agent_id='dead02', px=0.0, py=0.0,
+                     energy=1.0, health=0.0, age=1.0, offspring=0, cause=0)
+    
+    birth, death, loner = buffer.to_dicts()
+    
+    assert birth == {
+        'timestamp': 10.5,
+        'step': 7,
+        'type': 'reproduction',
+        'description': '新智能体出生: child01',
+        'details': {
+            'parent_id': 'parent1',
+            'child_id': 'child01',
+            'child_position': (3.5, 4.25),
+            'child_energy': 60.0,
+            'child_health': 75.0,
+            'parent_offspring_count': 2,
+            'generation': 4
+        }
+    }
+    assert death == {
+        'timestamp': 11.0,
+        'step': 8,
+        'type': 'agent_death',
+        'description': '智能体死亡: dead01',
+        'details': {
+            'agent_id': 'dead01',
+            'age': 42.5,
+            'cause': 'Old age',
+            'final_health': 0.25,
+            'final_energy': 0.5,
+            'position': (5.5, 6.5),
+            'offspring_count': 3,
+            'tribe_id': 'tribe_7'
+        }
+    }
+    assert loner['details']['cause'] == 'Unknown'
+    assert loner['details']['tribe_id'] is None
+    
+    assert buffer.to_dicts(EVENT_AGENT_DEATH) == [death, loner]
+
+
+def test_copy_is_independent():
+    buffer = EventBuffer(capacity=2)
+    _add_births(buffer, 3)
+    clone = buffer.copy()
+    _add_births(buffer, 2, start=3)
+    
+    assert len(clone) == 3
+    assert len(buffer) == 5
+    assert [r['step'] for r in clone.records()] == [0, 1, 2]
+
+
+@pytest.mark.parametrize('max_events', [1, 3])
+def test_small_limits(max_events):
+    buffer = EventBuffer(max_events=max_events)
+    _add_births(buffer, 10)
+    
+    assert 1 <= len(buffer) <= max_events
+    assert buffer.records()['step'][-1] == 9
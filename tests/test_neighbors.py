@@ -0,0 +1,68 @@
+"""
+Cogvrs - Neighbor Grid Tests
+NeighborGrid.query 与暴力距离筛选结果一致（numba内核与NumPy回退实现）
+
+Author: Ben Hsu & Claude
+"""
+
+import numpy as np
+import pytest
+
+from cogvrs_core.visualization import _neighbors
+from cogvrs_core.visualization._neighbors import NeighborGrid
+
+
+@pytest.fixture(params=['numpy', 'numba'])
+def kernel(request, monkeypatch):
+    """分别在NumPy回退实现和numba网格内核下运行"""
+    if request.param == 'numba':
+        pytest.importorskip('numba')
+        assert _neighbors.NUMBA_AVAILABLE
+    else:
+        monkeypatch.setattr(_neighbors, 'NUMBA_AVAILABLE', False)
+    return request.param
+
+
+def _brute_force(positions, x, y, radius):
+    d2 = (positions[:, 0] - x) ** 2 + (positions[:, 1] - y) ** 2
+    return sorted(np.flatnonzero(d2 <= radius * radius).tolist())
+
+
+@pytest.mark.parametrize('cell_size', [5.0, 10.0, 37.0])
+def test_query_matches_brute_force(kernel, cell_size):
+    rng = np.random.default_rng(42)
+    positions = rng.uniform(0, 150, size=(400, 2))
+    grid = NeighborGrid(cell_size)
+    grid.rebuild(positions)
+    
+    queries = np.vstack([positions[:20], rng.uniform(-20, 170, size=(20, 2))])
+    for x, y in queries:
+        for radius in (0.5, 8.0, 25.0):
+            result = sorted(grid.query(float(x), float(y), radius).tolist())
+            assert result == _brute_force(positions, x, y, radius)
+
+
+def test_query_includes_boundary_and_self(kernel):
+    positions = np.array([[0.0, 0.0], [3.0, 4.0], [10.0, 0.0], [99.0, 99.0]])
+    grid = NeighborGrid(10.0)
+    grid.rebuild(positions)
+    
+    assert sorted(grid.query(0.0, 0.0, 5.0).tolist()) == [0, 1]
+    assert sorted(grid.query(0.0, 0.0, 10.0).tolist()) == [0, 1, 2]
+    assert grid.query(50.0, 50.0, 1.0).tolist() == []
+
+
+def test_empty_grid(kernel):
+    grid = NeighborGrid(10.0)
+    grid.rebuild(np.empty((0, 2)))
+    
+    assert len(grid.query(1.0, 1.0, 100.0)) == 0
+
+
+def test_rebuild_replaces_previous_positions(kernel):
+    grid = NeighborGrid(10.0)
+    grid.rebuild(np.array([[1.0, 1.0], [2.0, 2.0]]))
+    grid.rebuild(np.array([[80.0, 80.0]]))
+    
+    assert grid.query(1.0, 1.0, 5.0).tolist() == []
+    assert grid.query(80.0, 80.0, 1.0).tolist() == [0]